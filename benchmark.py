@@ -0,0 +1,431 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from polynomial import Polynomial, calculate_fx, compile_fx, newton_raphson
+from roots import solve_cubic, find_real_roots
+from utils import format_number
+
+# Corpus kinds and the seed used when none is given, so runs are reproducible
+CORPORA = ("well_conditioned", "repeated_roots", "extreme_magnitudes")
+DEFAULT_SEED = 20240501
+DEFAULT_SIZE = 2000
+
+def _from_roots(r1, r2, r3, scale=1.0):
+    """
+    Coefficients of scale * (x - r1)(x - r2)(x - r3).
+    """
+    return (scale,
+            -scale * (r1 + r2 + r3),
+            scale * (r1 * r2 + r1 * r3 + r2 * r3),
+            -scale * r1 * r2 * r3)
+
+def make_corpus(kind, size=DEFAULT_SIZE, seed=DEFAULT_SEED):
+    """
+    Build a reproducible corpus of cubic coefficients and evaluation points.
+
+    Args:
+        kind (str): "well_conditioned" (well separated real roots),
+                    "repeated_roots" (double and triple roots) or
+                    "extreme_magnitudes" (coefficients from 1e-150 to 1e150)
+        size (int): Number of cases
+        seed (int): Random seed
+
+    Returns:
+        list: List of (a, b, c, d, x) tuples
+    """
+    rng = random.Random(f"{kind}:{seed}")
+    cases = []
+    for _ in range(size):
+        if kind == "well_conditioned":
+            r1 = rng.uniform(-10, -4)
+            r2 = rng.uniform(-2, 2)
+            r3 = rng.uniform(4, 10)
+            coeffs = _from_roots(r1, r2, r3, rng.uniform(0.5, 5))
+            x = rng.uniform(-12, 12)
+        elif kind == "repeated_roots":
+            r = rng.uniform(-10, 10)
+            s = r if rng.random() < 0.3 else rng.uniform(-10, 10)
+            coeffs = _from_roots(r, r, s, rng.uniform(0.5, 5))
+            x = r + rng.uniform(-1, 1)
+        elif kind == "extreme_magnitudes":
+            coeffs = tuple(rng.choice((-1, 1)) * 10 ** rng.uniform(-150, 150) for _ in range(4))
+            x = rng.choice((-1, 1)) * 10 ** rng.uniform(-20, 20)
+        else:
+            raise ValueError(f"Unknown corpus kind: {kind}")
+        cases.append(coeffs + (x,))
+    return cases
+
+def _sympy_solve(a, b, c, d, x):
+    """
+    Call main.solve_equation_sympy (imported lazily because sympy is slow to load).
+    """
+    from main import solve_equation_sympy
+    return solve_equation_sympy(a, b, c, d)
+
+# Benchmarked functions, each taking one (a, b, c, d, x) case
+BENCHMARKS = {
+    "calculate_fx": lambda a, b, c, d, x: calculate_fx(a, b, c, d, x),
+    "newton_raphson": lambda a, b, c, d, x: newton_raphson(a, b, c, d, x, max_iter=100),
+    "solve_cubic": lambda a, b, c, d, x: solve_cubic(a, b, c, d),
+    "find_real_roots": lambda a, b, c, d, x: find_real_roots([a, b, c, d]),
+    "format_number": lambda a, b, c, d, x: format_number(x),
+    "solve_equation_sympy": _sympy_solve,
+}
+
+# sympy is orders of magnitude slower, so it only sees the first few cases
+CASE_LIMITS = {"solve_equation_sympy": 20}
+
+def _percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def measure(func, cases, repeat=3):
+    """
+    Time a function over a list of cases.
+
+    Every case is timed on its own so the latency distribution is kept; the
+    fastest of `repeat` passes is used per case to filter out scheduler noise.
+
+    Args:
+        func (function): Function called as func(a, b, c, d, x)
+        cases (list): List of (a, b, c, d, x) tuples
+        repeat (int): Number of passes over the cases
+
+    Returns:
+        dict: calls, throughput (calls per second), p50_us and p99_us latencies
+    """
+    timer = time.perf_counter_ns
+    best = [float('inf')] * len(cases)
+    for _ in range(repeat):
+        for i, case in enumerate(cases):
+            start = timer()
+            try:
+                func(*case)
+            except (ArithmeticError, ValueError):
+                # Overflow on extreme inputs still counts as a completed call
+                pass
+            elapsed = timer() - start
+            if elapsed < best[i]:
+                best[i] = elapsed
+    latencies = sorted(best)
+    total = sum(latencies)
+    return {
+        "calls": len(cases),
+        "throughput": len(cases) / (total / 1e9) if total else float('inf'),
+        "p50_us": _percentile(latencies, 0.50) / 1000,
+        "p99_us": _percentile(latencies, 0.99) / 1000,
+    }
+
+def run(names=None, corpora=CORPORA, size=DEFAULT_SIZE, seed=DEFAULT_SEED, repeat=3):
+    """
+    Run the benchmark suite.
+
+    Args:
+        names (list, optional): Benchmarks to run (default: all of BENCHMARKS)
+        corpora (tuple): Corpus kinds to run every benchmark on
+        size (int): Cases per corpus
+        seed (int): Random seed for the corpora
+        repeat (int): Passes per measurement
+
+    Returns:
+        dict: Run metadata and a "results" mapping of "benchmark/corpus" to measurements
+    """
+    results = {}
+    for kind in corpora:
+        cases = make_corpus(kind, size, seed)
+        for name in names or BENCHMARKS:
+            limit = CASE_LIMITS.get(name)
+            if name == "solve_equation_sympy":
+                try:
+                    import sympy  # noqa: F401
+                except ImportError:
+                    continue
+            results[f"{name}/{kind}"] = measure(BENCHMARKS[name], cases[:limit], repeat)
+    return {
+        "python": platform.python_version(),
+        "size": size,
+        "seed": seed,
+        "results": results,
+    }
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Find benchmarks whose latency regressed beyond a threshold.
+
+    Args:
+        baseline (dict): Output of run() used as the reference
+        current (dict): Output of run() to check
+        threshold (float): Allowed relative slowdown of p50 or p99 (0.10 = 10%)
+
+    Returns:
+        list: (benchmark, metric, baseline value, current value) for every regression
+    """
+    regressions = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        for metric in ("p50_us", "p99_us"):
+            if after[metric] > before[metric] * (1 + threshold):
+                regressions.append((name, metric, before[metric], after[metric]))
+    return regressions
+
+def measure_evaluators(size=200, points=1000, seed=DEFAULT_SEED):
+    """
+    Compare the per-call cost of calculate_fx with compiled evaluators.
+
+    Every cubic of a well-conditioned corpus is evaluated at the same points
+    through calculate_fx, through a Polynomial object and through compile_fx
+    evaluators (plain and with fused derivative) built once per cubic. The
+    loop overhead is the same for all of them, so the differences are the
+    per-call savings.
+
+    Args:
+        size (int): Number of cubics
+        points (int): Evaluations per cubic
+        seed (int): Random seed for the corpus and the points
+
+    Returns:
+        dict: calculate_fx_ns, polynomial_ns, compiled_ns and compiled_derivative_ns per call,
+              compile_us per cubic, speedup and break_even_calls (evaluations
+              after which compiling has paid for itself)
+    """
+    timer = time.perf_counter_ns
+    rng = random.Random(seed)
+    xs = [rng.uniform(-12, 12) for _ in range(points)]
+    totals = {"calculate_fx": 0, "polynomial": 0, "compiled": 0, "compiled_derivative": 0, "compile": 0}
+    for a, b, c, d, _ in make_corpus("well_conditioned", size, seed):
+        start = timer()
+        for x in xs:
+            calculate_fx(a, b, c, d, x)
+        totals["calculate_fx"] += timer() - start
+
+        p = Polynomial((a, b, c, d))
+        start = timer()
+        for x in xs:
+            p(x)
+        totals["polynomial"] += timer() - start
+
+        start = timer()
+        f = compile_fx(a, b, c, d)
+        fused = compile_fx(a, b, c, d, derivative=True)
+        totals["compile"] += (timer() - start) / 2
+
+        start = timer()
+        for x in xs:
+            f(x)
+        totals["compiled"] += timer() - start
+
+        start = timer()
+        for x in xs:
+            fused(x)
+        totals["compiled_derivative"] += timer() - start
+
+    calls = size * points
+    plain_ns = totals["calculate_fx"] / calls
+    compiled_ns = totals["compiled"] / calls
+    saving = plain_ns - compiled_ns
+    return {
+        "calculate_fx_ns": plain_ns,
+        "polynomial_ns": totals["polynomial"] / calls,
+        "compiled_ns": compiled_ns,
+        "compiled_derivative_ns": totals["compiled_derivative"] / calls,
+        "compile_us": totals["compile"] / size / 1000,
+        "speedup": plain_ns / compiled_ns if compiled_ns else float('inf'),
+        "break_even_calls": totals["compile"] / size / saving if saving > 0 else None,
+    }
+
+# Run in a fresh interpreter by measure_startup; prints the loaded modules and peak RSS as JSON
+_STARTUP_PROBE = """
+import json, sys
+rss = None
+try:
+    # Peak RSS of this process image (ru_maxrss on Linux would include the forking parent)
+    with open("/proc/self/status") as status:
+        rss = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            rss //= 1024
+    except ImportError:
+        pass
+print(json.dumps({"rss_kb": rss, "modules": sorted(sys.modules)}))
+"""
+
+def measure_startup(module="main", statement=""):
+    """
+    Measure the cold-start cost of importing a module in a fresh interpreter.
+
+    Uses `python -X importtime` for the import time and the peak resident set
+    size from /proc or the resource module (not available on Windows).
+
+    Args:
+        module (str): Module to import
+        statement (str): Extra code to run after the import (e.g. one evaluation)
+
+    Returns:
+        dict: import_us (cumulative import time of the module in microseconds),
+              rss_kb (peak RSS in KiB, or None) and modules (set of loaded module names)
+    """
+    code = f"import {module}\n{statement}\n{_STARTUP_PROBE}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    import_us = None
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            import_us = int(parts[1])
+    probe = json.loads(proc.stdout.splitlines()[-1])
+    return {"import_us": import_us, "rss_kb": probe["rss_kb"], "modules": set(probe["modules"])}
+
+def _no_op(*args):
+    """
+    Does nothing; measure_memory subtracts its cost from every measurement.
+    """
+
+def _trace_calls(func, args, calls):
+    """
+    Call a function repeatedly under tracemalloc.
+
+    Returns:
+        tuple: (largest single-call peak, overall peak, retained) in bytes
+    """
+    func(*args)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        call_peak = peak = 0
+        for _ in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func(*args)
+            top = tracemalloc.get_traced_memory()[1]
+            call_peak = max(call_peak, top - before)
+            peak = max(peak, top - start)
+        retained = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return call_peak, peak, retained
+
+def measure_memory(func, args=(), calls=1000):
+    """
+    Measure the memory a function allocates with tracemalloc.
+
+    The function is called once before tracing starts, so caches and lazily
+    created objects are not counted, then `calls` times under tracemalloc.
+    The overhead of the measuring loop itself (taken from a function that
+    does nothing) is subtracted.
+
+    Args:
+        func (function): Function to measure
+        args (tuple): Arguments of every call
+        calls (int): Number of traced calls
+
+    Returns:
+        dict: call_bytes (most memory a single call allocated on top of what it
+              started with, whether freed before returning or not), peak_bytes
+              (highest traced memory over all calls, which grows when calls keep
+              memory alive) and retained_bytes (still allocated after the last call)
+    """
+    overhead = _trace_calls(_no_op, (), calls)
+    measured = _trace_calls(func, args, calls)
+    call_bytes, peak_bytes, retained_bytes = (max(0, value - base) for value, base in zip(measured, overhead))
+    return {"call_bytes": call_bytes, "peak_bytes": peak_bytes, "retained_bytes": retained_bytes}
+
+def print_report(report):
+    """
+    Print a benchmark report as a table.
+
+    Args:
+        report (dict): Output of run()
+    """
+    print(f"{'benchmark':<40} {'calls/s':>12} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for name, result in report["results"].items():
+        print(f"{name:<40} {result['throughput']:>12.0f} {result['p50_us']:>10.2f} {result['p99_us']:>10.2f}")
+
+def main(argv=None):
+    """
+    Command line interface: "run" measures and optionally saves a JSON baseline,
+    "compare" checks a run against a baseline and exits with 1 on regressions
+    "evaluator" compares calculate_fx with compiled evaluators and "startup"
+    reports the import time and memory of a module.
+    """
+    parser = argparse.ArgumentParser(description="LTC Calculator benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    run_parser.add_argument("--corpus", nargs="+", choices=CORPORA, default=CORPORA, help="corpora to use")
+    run_parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="cases per corpus")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="corpus random seed")
+    run_parser.add_argument("--output", metavar="FILE", help="save the results as a JSON baseline")
+
+    evaluator_parser = commands.add_parser("evaluator", help="compare calculate_fx with compiled evaluators")
+    evaluator_parser.add_argument("--size", type=int, default=200, help="number of cubics")
+    evaluator_parser.add_argument("--points", type=int, default=1000, help="evaluations per cubic")
+
+    startup_parser = commands.add_parser("startup", help="measure the cold-start cost of a module")
+    startup_parser.add_argument("module", nargs="?", default="main", help="module to import (default: main)")
+
+    compare_parser = commands.add_parser("compare", help="compare two saved runs")
+    compare_parser.add_argument("baseline", help="baseline JSON file")
+    compare_parser.add_argument("current", help="JSON file to check against the baseline")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed relative slowdown (default: 0.10)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run(args.only, tuple(args.corpus), args.size, args.seed)
+        print_report(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    if args.command == "evaluator":
+        result = measure_evaluators(args.size, args.points)
+        print(f"calculate_fx:                 {result['calculate_fx_ns']:8.1f} ns/call")
+        print(f"Polynomial.__call__:          {result['polynomial_ns']:8.1f} ns/call")
+        print(f"compiled:                     {result['compiled_ns']:8.1f} ns/call ({result['speedup']:.2f}x)")
+        print(f"compiled with derivative:     {result['compiled_derivative_ns']:8.1f} ns/call")
+        print(f"compile:                      {result['compile_us']:8.1f} us per cubic")
+        if result["break_even_calls"] is not None:
+            print(f"break-even after {result['break_even_calls']:.0f} calls")
+        return 0
+
+    if args.command == "startup":
+        startup = measure_startup(args.module)
+        rss = f"{startup['rss_kb'] / 1024:.1f} MiB" if startup["rss_kb"] is not None else "n/a"
+        print(f"import {args.module}: {startup['import_us'] / 1000:.1f} ms, peak RSS {rss}, "
+              f"{len(startup['modules'])} modules loaded")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for name, metric, before, after in regressions:
+        # A baseline time of zero (below the timer resolution) has no relative change
+        change = f"{after / before - 1:+.0%}" if before else "up from zero"
+        print(f"REGRESSION {name} {metric}: {before:.2f} -> {after:.2f} us ({change})")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import json
+import math
+import os
+from collections import OrderedDict
+
+from roots import solve_cubic
+
+class SolveCache:
+    """
+    Memoizing LRU cache for cubic solves
+
+    Coefficients are normalized so the leading non-zero coefficient is 1 (which
+    does not change the roots) and then rounded to the given relative
+    tolerance, so scaled copies of the same polynomial share one entry. The
+    least recently used entry is evicted once max_entries is reached.
+    """
+
+    def __init__(self, solver=solve_cubic, max_entries=1024, tolerance=1e-12, path=None):
+        """
+        Args:
+            solver (function): Function solver(a, b, c, d) returning a list of roots
+            max_entries (int): Maximum number of cached polynomials
+            tolerance (float): Relative rounding step for normalized coefficients (0 for exact keys)
+            path (str, optional): JSON file used to persist the cache; loaded if it exists
+        """
+        self.solver = solver
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, a, b, c, d):
+        """
+        Build the cache key for a set of coefficients.
+
+        Each normalized coefficient keeps its binary exponent and has its
+        mantissa rounded to the tolerance, so small coefficients are told
+        apart as finely as large ones.
+
+        Args:
+            a (float): Coefficient of x^3
+            b (float): Coefficient of x^2
+            c (float): Coefficient of x
+            d (float): Constant term
+
+        Returns:
+            tuple or None: Normalized (and rounded) coefficients, or None when a
+                           coefficient is not finite or overflows when normalized
+        """
+        coeffs = (a, b, c, d)
+        lead = next((v for v in coeffs if v != 0), 1)
+        try:
+            normalized = [v / lead for v in coeffs]
+        except OverflowError:
+            return None
+        if not all(math.isfinite(v) for v in coeffs + tuple(normalized)):
+            return None
+        if not self.tolerance:
+            return tuple(normalized)
+        key = []
+        for v in normalized:
+            mantissa, exponent = math.frexp(v)
+            key.append(math.ldexp(round(mantissa / self.tolerance) * self.tolerance, exponent))
+        return tuple(key)
+
+    def solve(self, a, b, c, d):
+        """
+        Solve a*x^3 + b*x^2 + c*x + d = 0, reusing a cached result when possible.
+
+        Coefficients that cannot be keyed bypass the cache, so the solver
+        reports them exactly as it does without a cache.
+
+        Args:
+            a (float): Coefficient of x^3
+            b (float): Coefficient of x^2
+            c (float): Coefficient of x
+            d (float): Constant term
+
+        Returns:
+            list: Roots as returned by the solver
+        """
+        key = self.key(a, b, c, d)
+        if key is None:
+            return self.solver(a, b, c, d)
+        roots = self._entries.get(key)
+        if roots is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return list(roots)
+
+        self.misses += 1
+        roots = self.solver(a, b, c, d)
+        self._store(key, list(roots))
+        return roots
+
+    def _store(self, key, roots):
+        """
+        Insert an entry, evicting the least recently used ones beyond max_entries.
+        """
+        self._entries[key] = roots
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Entry count, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def save(self, path=None):
+        """
+        Write the cache to a JSON file (atomically, through a temporary file).
+
+        Complex roots are stored as [real, imag] pairs.
+
+        Args:
+            path (str, optional): Target file (default: the path given at construction)
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given to save the cache to")
+        entries = [
+            [list(key), [[r.real, r.imag] if isinstance(r, complex) else r for r in roots]]
+            for key, roots in self._entries.items()
+        ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"tolerance": self.tolerance, "entries": entries}, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """
+        Load entries from a JSON file written by save().
+
+        Files written with a different tolerance are ignored, since their keys
+        were rounded to a different grid.
+
+        Args:
+            path (str, optional): Source file (default: the path given at construction)
+
+        Returns:
+            int: Number of entries loaded
+        """
+        path = path or self.path
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("tolerance") != self.tolerance:
+            return 0
+        for key, roots in data["entries"]:
+            self._store(tuple(key), [complex(*r) if isinstance(r, list) else r for r in roots])
+        return len(data["entries"])
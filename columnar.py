@@ -0,0 +1,367 @@
+import csv
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from polynomial import calculate_fx
+from roots import solve_cubic_batch
+from stream import read_rows
+from utils import optional_import
+
+# File layout: a fixed header, one 16-byte name per column, then every column as a
+# contiguous block of little-endian float64 values (8-byte aligned), in header order.
+MAGIC = b"LTCCOL01"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")   # magic, version, column count, row count
+_NAME_SIZE = 16
+
+INPUT_COLUMNS = ("a", "b", "c", "d", "x")
+EVALUATION_COLUMNS = ("fx",)
+SOLVE_COLUMNS = ("re1", "im1", "re2", "im2", "re3", "im3", "status")
+
+# Rows processed per vectorized step, so temporaries stay small for huge files
+DEFAULT_CHUNK_ROWS = 1 << 20
+
+_NATIVE = sys.byteorder == "little"
+
+class ColumnFile:
+    """
+    Memory-mapped columnar dataset of float64 columns.
+
+    Columns are exposed as memoryviews straight into the mapping, so reading
+    (and, for files opened for writing, filling) them copies nothing. On
+    big-endian hosts columns are returned as byte-swapped array('d') copies;
+    copies of a writable file's columns are swapped back into it on close.
+    """
+
+    def __init__(self, path, writable=False):
+        """
+        Args:
+            path (str): File to map
+            writable (bool): Map the file for writing
+        """
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        self._map = None
+        self._views = []
+        self._copies = []
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        """
+        Map the file and parse its header.
+        """
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{self.path} is not a column file") from None
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a column file")
+        magic, version, count, self.rows = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a column file")
+        if version != VERSION:
+            raise ValueError(f"{self.path} has unsupported version {version}")
+        names = []
+        for i in range(count):
+            start = _HEADER.size + i * _NAME_SIZE
+            names.append(bytes(self._map[start:start + _NAME_SIZE]).rstrip(b"\0").decode("ascii"))
+        self.names = tuple(names)
+        self._data_start = _HEADER.size + count * _NAME_SIZE
+        if len(self._map) < self._data_start + 8 * self.rows * count:
+            raise ValueError(f"{self.path} is truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name):
+        """
+        Get one column without copying.
+
+        Args:
+            name (str): Column name
+
+        Returns:
+            memoryview: float64 values (writable if the file was opened for writing),
+                        or an array('d') copy on big-endian hosts
+        """
+        if name not in self.names:
+            raise KeyError(f"{self.path} has no column {name!r} (columns: {', '.join(self.names)})")
+        start = self._data_start + 8 * self.rows * self.names.index(name)
+        raw = memoryview(self._map)[start:start + 8 * self.rows]
+        if not _NATIVE:
+            values = array('d', raw.tobytes())
+            values.byteswap()
+            raw.release()
+            if self.writable:
+                self._copies.append((start, values))
+            return values
+        view = raw.cast('d')
+        self._views.append(raw)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """
+        Release every column view, write back byte-swapped copies and unmap the file.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._map is not None:
+            for start, values in self._copies:
+                swapped = array('d', values)
+                swapped.byteswap()
+                self._map[start:start + 8 * len(swapped)] = swapped.tobytes()
+            self._copies = []
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+def create(path, names, rows):
+    """
+    Create a column file of the given shape and map it for writing.
+
+    Args:
+        path (str): File to create (overwritten if it exists)
+        names (iterable): Column names (ASCII, at most 16 bytes each)
+        rows (int): Number of rows
+
+    Returns:
+        ColumnFile: Writable file with every value initialized to 0.0
+    """
+    names = tuple(names)
+    encoded = [name.encode("ascii") for name in names]
+    if any(len(name) > _NAME_SIZE for name in encoded):
+        raise ValueError(f"column names are limited to {_NAME_SIZE} bytes")
+    header = _HEADER.pack(MAGIC, VERSION, len(names), rows) + b"".join(name.ljust(_NAME_SIZE, b"\0") for name in encoded)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + 8 * rows * len(names))
+    return ColumnFile(path, writable=True)
+
+def write_columns(path, columns):
+    """
+    Write a column file from in-memory sequences.
+
+    Args:
+        path (str): File to create
+        columns (dict): Column name -> sequence of numbers (all of the same length)
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    with create(path, columns, lengths.pop() if lengths else 0) as out:
+        for name, values in columns.items():
+            out.column(name)[:] = array('d', values)
+
+def read_columns(path):
+    """
+    Read a whole column file into memory.
+
+    Args:
+        path (str): Column file
+
+    Returns:
+        dict: Column name -> list of floats
+    """
+    with ColumnFile(path) as f:
+        return {name: list(f.column(name)) for name in f.names}
+
+def _chunks(rows, chunk_rows):
+    """
+    Split range(rows) into (start, stop) pairs.
+    """
+    return [(start, min(start + chunk_rows, rows)) for start in range(0, rows, chunk_rows)]
+
+def _evaluate_numpy(np, columns, fx, chunk_rows):
+    """
+    Horner evaluation with NumPy views of the mapped columns, written in place into fx.
+    The views only live inside this function, so the mappings can be closed afterwards.
+    """
+    A, B, C, D, X = (np.frombuffer(column, dtype=np.float64) for column in columns)
+    F = np.frombuffer(fx, dtype=np.float64)
+    with np.errstate(all='ignore'):
+        for start, stop in _chunks(len(F), chunk_rows):
+            xs = X[start:stop]
+            target = F[start:stop]
+            # ((a*x + b)*x + c)*x + d without temporaries
+            np.multiply(A[start:stop], xs, out=target)
+            target += B[start:stop]
+            target *= xs
+            target += C[start:stop]
+            target *= xs
+            target += D[start:stop]
+
+def evaluate_file(in_path, out_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Evaluate f(x) = ax^3 + bx^2 + cx + d for every row of a column file.
+
+    The a, b, c, d and x columns are read straight from the mapping and the
+    results are written straight into the mapped output column "fx", chunk
+    by chunk, with NumPy when it is installed.
+
+    Args:
+        in_path (str): Column file with a, b, c, d and x columns
+        out_path (str): Column file to create with the fx column
+        chunk_rows (int): Rows per vectorized step
+
+    Returns:
+        int: Number of rows evaluated
+    """
+    np = optional_import("numpy")
+    with ColumnFile(in_path) as src, create(out_path, EVALUATION_COLUMNS, src.rows) as out:
+        columns = [src.column(name) for name in INPUT_COLUMNS]
+        fx = out.column("fx")
+        if np is not None:
+            _evaluate_numpy(np, columns, fx, chunk_rows)
+        else:
+            a, b, c, d, x = columns
+            for i in range(src.rows):
+                fx[i] = calculate_fx(a[i], b[i], c[i], d[i], x[i])
+        return src.rows
+
+def _solve_numpy(np, columns, outputs, chunk_rows):
+    """
+    Batch solving with NumPy views of the mapped columns, written in place into the outputs.
+    """
+    coefficients = [np.frombuffer(column, dtype=np.float64) for column in columns]
+    results = [np.frombuffer(column, dtype=np.float64) for column in outputs]
+    for start, stop in _chunks(len(results[0]), chunk_rows):
+        roots, _, status = solve_cubic_batch(np.column_stack([column[start:stop] for column in coefficients]))
+        for k in range(3):
+            results[2 * k][start:stop] = roots[:, k].real
+            results[2 * k + 1][start:stop] = roots[:, k].imag
+        results[6][start:stop] = status
+
+def solve_file(in_path, out_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Solve a*x^3 + b*x^2 + c*x + d = 0 for every row of a column file.
+
+    Rows are solved in chunks with solve_cubic_batch. Each root is written as
+    a real and an imaginary column (NaN for unused slots), and the row status
+    (one of the roots.STATUS_* codes) as a float column.
+
+    Args:
+        in_path (str): Column file with a, b, c and d columns (x is ignored)
+        out_path (str): Column file to create with the SOLVE_COLUMNS
+        chunk_rows (int): Rows per batch
+
+    Returns:
+        int: Number of rows solved
+    """
+    np = optional_import("numpy")
+    with ColumnFile(in_path) as src, create(out_path, SOLVE_COLUMNS, src.rows) as out:
+        columns = [src.column(name) for name in INPUT_COLUMNS[:4]]
+        outputs = [out.column(name) for name in SOLVE_COLUMNS]
+        if np is not None:
+            _solve_numpy(np, columns, outputs, chunk_rows)
+            return src.rows
+        for start, stop in _chunks(src.rows, chunk_rows):
+            roots, _, status = solve_cubic_batch(list(zip(*(column[start:stop] for column in columns))))
+            for i, (row, code) in enumerate(zip(roots, status), start):
+                for k, root in enumerate(row):
+                    outputs[2 * k][i] = root.real
+                    outputs[2 * k + 1][i] = root.imag
+                outputs[6][i] = code
+        return src.rows
+
+def csv_to_columns(csv_path, out_path, fmt="csv"):
+    """
+    Convert a CSV (or JSONL) coefficient file to a column file.
+
+    The text file is read twice, once to count the rows and once to fill the
+    mapped columns, so memory use does not grow with its size. A missing x is
+    stored as NaN.
+
+    Args:
+        csv_path (str): Input file in the format read by stream.read_rows
+        out_path (str): Column file to create with the a, b, c, d and x columns
+        fmt (str): "csv" or "jsonl"
+
+    Returns:
+        int: Number of rows converted
+
+    Raises:
+        ValueError: On the first row that cannot be parsed
+    """
+    with open(csv_path, newline="") as f:
+        rows = sum(1 for _ in read_rows(f, fmt))
+    with open(csv_path, newline="") as f, create(out_path, INPUT_COLUMNS, rows) as out:
+        columns = [out.column(name) for name in INPUT_COLUMNS]
+        for i, (line_no, fields) in enumerate(read_rows(f, fmt)):
+            if isinstance(fields, str):
+                raise ValueError(f"line {line_no}: {fields}")
+            for column, name in zip(columns, INPUT_COLUMNS):
+                raw = fields.get(name)
+                if raw is None or raw == "" or raw == "?":
+                    if name != "x":
+                        raise ValueError(f"line {line_no}: missing column '{name}'")
+                    column[i] = math.nan
+                    continue
+                try:
+                    column[i] = float(raw)
+                except (TypeError, ValueError):
+                    raise ValueError(f"line {line_no}: invalid number {raw!r} in column '{name}'")
+    return rows
+
+def columns_to_csv(path, out):
+    """
+    Write every column of a column file as CSV with a header row.
+
+    Args:
+        path (str): Column file
+        out (file): Text file object to write to
+
+    Returns:
+        int: Number of rows written
+    """
+    with ColumnFile(path) as f:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(f.names)
+        columns = [f.column(name) for name in f.names]
+        writer.writerows(zip(*columns))
+        return f.rows
+
+def main(argv=None):
+    """
+    Command line interface: convert between CSV and column files and evaluate or solve column files.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Memory-mapped columnar coefficient files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    from_csv = commands.add_parser("from-csv", help="convert a CSV/JSONL file to a column file")
+    from_csv.add_argument("input")
+    from_csv.add_argument("output")
+    from_csv.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    to_csv = commands.add_parser("to-csv", help="print a column file as CSV")
+    to_csv.add_argument("input")
+    for name, help_text in (("evaluate", "evaluate f(x) for every row"), ("solve", "solve f(x) = 0 for every row")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("input")
+        command.add_argument("output")
+
+    args = parser.parse_args(argv)
+    if args.command == "from-csv":
+        rows = csv_to_columns(args.input, args.output, args.format)
+    elif args.command == "to-csv":
+        rows = columns_to_csv(args.input, sys.stdout)
+    elif args.command == "evaluate":
+        rows = evaluate_file(args.input, args.output)
+    else:
+        rows = solve_file(args.input, args.output)
+    print(f"{rows} rows", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
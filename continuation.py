@@ -0,0 +1,214 @@
+import math
+
+from roots import find_all_roots
+
+# Largest number of corrector sweeps per step before the step is solved from scratch
+DEFAULT_MAX_ITER = 8
+# Roots closer than this (relative to max(1, |root|)) are reported as colliding
+COLLISION_TOL = 1e-6
+# Roots whose imaginary part is at most this (relative to max(1, |root|)) count as real
+REAL_TOL = 1e-10
+
+class SweepStep:
+    """
+    Roots of one polynomial of a sweep, in tracked order.
+
+    roots[i] continues roots[i] of the previous step. iterations counts the
+    corrector sweeps that were needed, restarted tells whether the step had
+    to be solved from scratch, and events lists what happened since the
+    previous step as (kind, indices) pairs: ("collision", (i, j)) when two
+    roots meet, ("complex", (i,)) when a real root leaves the real axis and
+    ("real", (i,)) when a complex root lands on it.
+    """
+
+    __slots__ = ('roots', 'iterations', 'restarted', 'events')
+
+    def __init__(self, roots, iterations, restarted, events):
+        self.roots = roots
+        self.iterations = iterations
+        self.restarted = restarted
+        self.events = events
+
+    def __repr__(self):
+        return (f"SweepStep(roots={self.roots!r}, iterations={self.iterations}, "
+                f"restarted={self.restarted}, events={self.events!r})")
+
+def _is_real(root):
+    """
+    Whether a root counts as real.
+    """
+    return abs(root.imag) <= REAL_TOL * max(1.0, abs(root))
+
+def _snap(roots):
+    """
+    Put roots that count as real exactly on the real axis, so they stay there.
+    """
+    return [complex(root.real, 0.0) if _is_real(root) else root for root in roots]
+
+def _correct(p, roots, tol, max_iter):
+    """
+    Aberth-Ehrlich sweeps from predicted roots.
+
+    A root is done when its residual is small relative to the size of the
+    terms (|p(z)| <= tol * sum |a_i| |z|^i) or its last step was at most tol
+    relative to |z|. Thanks to the cubic convergence of the iteration, a good
+    prediction needs one or two sweeps.
+
+    Returns:
+        tuple: (roots, sweeps with at least one update, True if every root converged)
+    """
+    n = len(roots)
+    roots = list(roots)
+    absolute = [abs(coeff) for coeff in p]
+    active = [True] * n
+    sweeps = 0
+    while any(active):
+        if sweeps == max_iter:
+            return roots, sweeps, False
+        updated = False
+        for i in range(n):
+            if not active[i]:
+                continue
+            z = roots[i]
+            fx = 0j
+            fpx = 0j
+            size = 0.0
+            r = abs(z)
+            for coeff, magnitude in zip(p, absolute):
+                fpx = fpx * z + fx
+                fx = fx * z + coeff
+                size = size * r + magnitude
+            if abs(fx) <= tol * size:
+                active[i] = False
+                continue
+            if fpx == 0:
+                return roots, sweeps + 1, False
+            repulsion = 0j
+            for j, other in enumerate(roots):
+                if j != i:
+                    if other == z:
+                        return roots, sweeps + 1, False
+                    repulsion += 1 / (z - other)
+            ratio = fx / fpx
+            denominator = 1 - ratio * repulsion
+            if denominator == 0:
+                return roots, sweeps + 1, False
+            step = ratio / denominator
+            roots[i] = z - step
+            updated = True
+            if abs(step) <= tol * abs(roots[i]):
+                active[i] = False
+        if updated:
+            sweeps += 1
+    if not all(math.isfinite(root.real) and math.isfinite(root.imag) for root in roots):
+        return roots, sweeps, False
+    return roots, sweeps, True
+
+def _match(predicted, found):
+    """
+    Reorder found roots so each one follows the nearest predicted root (greedy by distance).
+    """
+    pairs = sorted((abs(p - f), i, j) for i, p in enumerate(predicted) for j, f in enumerate(found))
+    matched = [None] * len(predicted)
+    used = set()
+    for _, i, j in pairs:
+        if matched[i] is None and j not in used:
+            matched[i] = found[j]
+            used.add(j)
+    return matched
+
+def _colliding(roots):
+    """
+    Index pairs of roots that are closer than COLLISION_TOL.
+    """
+    return {(i, j) for i in range(len(roots)) for j in range(i + 1, len(roots))
+            if abs(roots[i] - roots[j]) <= COLLISION_TOL * max(1.0, abs(roots[i]))}
+
+def track_roots(trajectory, tol=1e-14, max_iter=DEFAULT_MAX_ITER, extrapolate=True):
+    """
+    Follow every root of a family of polynomials continuously along a coefficient trajectory
+
+    The first polynomial is solved from scratch with find_all_roots. Every
+    later one is solved by predictor-corrector continuation: the previous
+    roots (extrapolated linearly from the last two steps, which assumes
+    evenly spaced steps) are refined with Aberth-Ehrlich sweeps, so each root
+    keeps its identity and a step typically costs one or two sweeps. When
+    the corrector does not converge, for example because two real roots met
+    and turned into a complex pair between steps, the step is solved from
+    scratch and the new roots are matched to the predicted ones.
+
+    Args:
+        trajectory (iterable): Coefficient lists of the same degree, highest degree first
+        tol (float): Relative residual or step size at which a root is accepted
+        max_iter (int): Corrector sweeps per step before solving from scratch
+        extrapolate (bool): Predict from the last two steps instead of the last one
+
+    Yields:
+        SweepStep: The tracked roots of each polynomial
+
+    Raises:
+        ValueError: If the degree changes along the trajectory or a coefficient is not finite
+    """
+    previous = before = None
+    degree = None
+    colliding = set()
+    for coeffs in trajectory:
+        p = [float(coeff) for coeff in coeffs]
+        if degree is None:
+            degree = len(p) - 1
+            if degree < 1 or p[0] == 0:
+                raise ValueError("The polynomials of a sweep need a non-zero leading coefficient and degree >= 1")
+        elif len(p) - 1 != degree or p[0] == 0:
+            raise ValueError("The degree must stay the same along a sweep")
+        if not all(math.isfinite(coeff) for coeff in p):
+            raise ValueError("Coefficients must be finite")
+
+        events = []
+        if previous is None:
+            roots, iterations, restarted = find_all_roots(p)[0], 0, True
+        else:
+            if extrapolate and before is not None:
+                predicted = [2 * z - w for z, w in zip(previous, before)]
+            else:
+                predicted = list(previous)
+            roots, iterations, converged = _correct(p, _snap(predicted), tol, max_iter)
+            restarted = not converged
+            if restarted:
+                roots = _match(predicted, find_all_roots(p)[0])
+        roots = _snap(roots)
+
+        if previous is not None:
+            for i, (old, new) in enumerate(zip(previous, roots)):
+                if _is_real(old) and not _is_real(new):
+                    events.append(("complex", (i,)))
+                elif not _is_real(old) and _is_real(new):
+                    events.append(("real", (i,)))
+        now_colliding = _colliding(roots)
+        events += [("collision", pair) for pair in sorted(now_colliding - colliding)]
+        colliding = now_colliding
+
+        before, previous = previous, roots
+        yield SweepStep(roots, iterations, restarted, events)
+
+def sweep_coefficient(coeffs, index, values, **kwargs):
+    """
+    Track the roots while one coefficient runs through a sequence of values
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        index (int): Position of the coefficient to vary (e.g. 3 for d)
+        values (iterable): Values the coefficient takes, in order
+        **kwargs: Passed on to track_roots
+
+    Yields:
+        SweepStep: The tracked roots for each value
+    """
+    base = list(coeffs)
+
+    def trajectory():
+        for value in values:
+            row = list(base)
+            row[index] = value
+            yield row
+
+    return track_roots(trajectory(), **kwargs)
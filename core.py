@@ -0,0 +1,309 @@
+# Lean core for memory-constrained targets such as the TI-84 Python Edition:
+# evaluation and real root finding of f(x) = ax^3 + bx^2 + cx + d with no
+# imports at all. The loops keep their state in local floats (no closures,
+# tuples, lists or strings are created per iteration), so a call allocates
+# little more than the floats it returns. The tracemalloc budgets in
+# test_core.py keep it that way.
+
+# Relative tolerance under which a quadratic discriminant counts as zero, so
+# a double root is not lost to rounding (the same test as roots.solve_quadratic)
+DISCRIMINANT_TOL = 1e-12
+
+# Rounding error of the cubic discriminant q^2/4 + p^3/27 relative to its two
+# terms, as in roots.py: only a discriminant this close to zero means a double root
+DISCRIMINANT_ULPS = 4 * 2.0 ** -52
+
+# Format specs for 0 to 9 decimal places, built once instead of per call
+_SPECS = tuple(".%df" % places for places in range(10))
+
+def evaluate(a, b, c, d, x):
+    """
+    Evaluate f(x) = ax^3 + bx^2 + cx + d with Horner's scheme.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        x (float): Input value
+
+    Returns:
+        float: f(x)
+    """
+    return ((a * x + b) * x + c) * x + d
+
+def slope(a, b, c, d, x):
+    """
+    Evaluate the derivative f'(x) = 3ax^2 + 2bx + c.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term (unused, kept so both functions take the same arguments)
+        x (float): Input value
+
+    Returns:
+        float: f'(x)
+    """
+    return (3 * a * x + 2 * b) * x + c
+
+def newton(a, b, c, d, x0, tol=1e-12, max_iter=100):
+    """
+    Find a root of f(x) = ax^3 + bx^2 + cx + d by Newton's method from x0.
+
+    f and f' are evaluated inline in one Horner pass per step. A root is
+    accepted when |f(x)| is at most tol relative to the size of the terms at
+    x, or when the step is at most tol relative to |x|.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        x0 (float): Initial guess
+        tol (float): Relative tolerance
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        float or None: The root, or None if the iteration hit a zero derivative or did not converge
+    """
+    x = x0
+    iteration = 0
+    while iteration < max_iter:
+        iteration += 1
+        fpx = 3 * a * x + 2 * b
+        fx = (a * x + b) * x + c
+        fpx = fpx * x + c
+        fx = fx * x + d
+        r = x if x >= 0 else -x
+        size = ((abs(a) * r + abs(b)) * r + abs(c)) * r + abs(d)
+        if fx == 0 or abs(fx) <= tol * size:
+            return x
+        if fpx == 0:
+            return None
+        step = fx / fpx
+        x -= step
+        if abs(step) <= tol * abs(x):
+            return x
+    return None
+
+def _bracketed(a, b, c, d, lo, hi, tol, max_iter):
+    """
+    Safeguarded Newton iteration for the root of the cubic inside [lo, hi],
+    where f(lo) and f(hi) have opposite signs: steps that would leave the
+    bracket are replaced by bisection.
+    """
+    increasing = evaluate(a, b, c, d, hi) > 0
+    x = 0.5 * (lo + hi)
+    iteration = 0
+    while iteration < max_iter:
+        iteration += 1
+        fpx = 3 * a * x + 2 * b
+        fx = (a * x + b) * x + c
+        fpx = fpx * x + c
+        fx = fx * x + d
+        if fx == 0:
+            return x
+        if (fx > 0) == increasing:
+            hi = x
+        else:
+            lo = x
+        if fpx != 0:
+            candidate = x - fx / fpx
+            if lo < candidate < hi:
+                step = candidate - x
+                x = candidate
+                if abs(step) <= tol * abs(x):
+                    return x
+                continue
+        x = 0.5 * (lo + hi)
+        if x == lo or x == hi:
+            return x
+    return x
+
+def real_root(a, b, c, d, tol=1e-15, max_iter=200):
+    """
+    Find one real root of f(x) = ax^3 + bx^2 + cx + d, with guaranteed convergence.
+
+    A cubic always has a real root inside its Cauchy bound
+    R = 1 + max(|b|, |c|, |d|) / |a|, where f(-R) and f(R) have opposite signs,
+    so the root is found by Newton iteration safeguarded by bisection
+    inside [-R, R]. Quadratics and linear equations are solved directly.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        tol (float): Relative step size at which the root is accepted
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        float or None: A real root (the smallest one for quadratics), or None if there is none
+    """
+    if a == 0:
+        if b == 0:
+            return -d / c if c != 0 else None
+        disc = c * c - 4 * b * d
+        if disc < 0 and -disc > DISCRIMINANT_TOL * max(c * c, abs(4 * b * d)):
+            return None
+        root = disc ** 0.5 if disc > 0 else 0.0
+        return min((-c - root) / (2 * b), (-c + root) / (2 * b))
+    if d == 0:
+        return 0.0
+    bound = 1 + max(abs(b), abs(c), abs(d)) / abs(a)
+    return _bracketed(a, b, c, d, -bound, bound, tol, max_iter)
+
+def _polish(a, b, c, d, x):
+    """
+    One Newton step on the cubic, kept only if it reduces the residual.
+    """
+    fpx = 3 * a * x + 2 * b
+    fx = (a * x + b) * x + c
+    fpx = fpx * x + c
+    fx = fx * x + d
+    if fx == 0 or fpx == 0:
+        return x
+    candidate = x - fx / fpx
+    if abs(evaluate(a, b, c, d, candidate)) < abs(fx):
+        return candidate
+    return x
+
+def real_roots(a, b, c, d, tol=1e-15, max_iter=200):
+    """
+    Find every real root of f(x) = ax^3 + bx^2 + cx + d.
+
+    A triple root is detected from the depressed cubic and returned three
+    times. Otherwise one root is found with real_root (or, next to a double
+    root, taken as the simple root, as in roots.solve_cubic), the cubic is
+    deflated to a quadratic (in the direction that is stable for that root)
+    and the quadratic's roots (polished with one Newton step on the cubic)
+    complete the list. The quadratic's discriminant counts as zero only
+    within rounding, so a double root is returned twice while a narrow
+    complex pair is not reported as real roots.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        tol (float): Relative step size at which the first root is accepted
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        list: Real roots in ascending order (empty if there are none)
+    """
+    if a == 0:
+        if b == 0:
+            return [-d / c] if c != 0 else []
+        first, qa, qb, qc = None, b, c, d
+    else:
+        # Depressed form t^3 + pt + q with x = t - shift
+        shift = b / (3 * a)
+        p = c / a - b / a * shift
+        q = (2 * shift * shift - c / a) * shift + d / a
+        if (abs(p) <= DISCRIMINANT_TOL * (abs(c / a) + abs(b / a * shift))
+                and abs(q) <= DISCRIMINANT_TOL * (abs(2 * shift * shift * shift) + abs(c / a * shift) + abs(d / a))):
+            return [-shift, -shift, -shift]
+        half_q = q / 2
+        cube = p * p * p / 27
+        disc = half_q * half_q + cube
+        double = abs(disc) <= DISCRIMINANT_ULPS * (half_q * half_q + abs(cube))
+        if double:
+            # Deflate by the simple root, which is found accurately
+            first = _polish(a, b, c, d, 3 * q / p - shift)
+        else:
+            first = real_root(a, b, c, d, tol, max_iter)
+        # Division by (x - first): from the constant term when first is at least
+        # the geometric mean of the other two roots (|first|^2 >= |d / (a first)|),
+        # from the leading term otherwise, so a huge root does not swamp small ones
+        qa = a
+        if first != 0 and abs(a * first * first * first) >= abs(d):
+            qc = -d / first
+            qb = (qc - c) / first
+        else:
+            qb = b + a * first
+            qc = c + qb * first
+    disc = qb * qb - 4 * qa * qc
+    if disc < 0 and -disc > DISCRIMINANT_TOL * max(qb * qb, abs(4 * qa * qc)):
+        return [first] if first is not None else []
+    root = disc ** 0.5 if disc > 0 else 0.0
+    # Stable quadratic formula: no cancellation between -qb and the square root
+    q = -0.5 * (qb + root) if qb >= 0 else -0.5 * (qb - root)
+    if q == 0:
+        x1 = x2 = 0.0
+    else:
+        x1 = q / qa
+        x2 = qc / q
+    if first is not None:
+        x1 = _polish(a, b, c, d, x1)
+        x2 = _polish(a, b, c, d, x2)
+    if x1 > x2:
+        x1, x2 = x2, x1
+    if first is None:
+        return [x1, x2]
+    if first <= x1:
+        return [first, x1, x2]
+    if first <= x2:
+        return [x1, first, x2]
+    return [x1, x2, first]
+
+def format_value(value, decimal_places=4):
+    """
+    Format a number like utils.format_number with a single formatting operation.
+
+    Args:
+        value (float): The number to format
+        decimal_places (int): Number of decimal places to display
+
+    Returns:
+        str: Formatted number string
+    """
+    if value is None:
+        return "None"
+    rounded = round(value)
+    if abs(value - rounded) < 1e-10:
+        return "%d" % rounded
+    spec = _SPECS[decimal_places] if 0 <= decimal_places < len(_SPECS) else ".%df" % decimal_places
+    text = format(value, spec)
+    end = len(text)
+    while text[end - 1] == "0":
+        end -= 1
+    if text[end - 1] == ".":
+        end -= 1
+    return text if end == len(text) else text[:end]
+
+def main():
+    """
+    Minimal interactive calculator built on the core functions only.
+    """
+    print("Cubic Polynomial Calculator (core)")
+    values = []
+    for name in ("A", "B", "C", "D"):
+        while True:
+            try:
+                values.append(float(input("Enter the value of " + name + ": ")))
+                break
+            except ValueError:
+                print("Please enter a valid number")
+    a, b, c, d = values
+    while True:
+        text = input("Enter the value of X (or ? to find the roots): ")
+        if text == "?":
+            roots = real_roots(a, b, c, d)
+            if not roots:
+                print("The polynomial has no real roots.")
+            for root in roots:
+                print("x = " + format_value(root))
+            return
+        try:
+            x = float(text)
+        except ValueError:
+            print("Please enter a number or ?")
+            continue
+        print("The value of f(x) is: " + format_value(evaluate(a, b, c, d, x)))
+        return
+
+if __name__ == "__main__":
+    main()
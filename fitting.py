@@ -0,0 +1,244 @@
+import math
+
+from polynomial import Polynomial
+from utils import optional_import
+
+class PolynomialFit:
+    """
+    Incremental least-squares polynomial fit.
+
+    The fit keeps only the upper triangular factor R of a QR decomposition of
+    the design matrix [1, t, t^2, ..., t^degree | y] with t = (x - center) / scale,
+    so its memory is O(degree^2) no matter how many samples are folded in.
+    Samples are added with Givens rotations and removed again with hyperbolic
+    rotations (QR downdating), so the normal equations are never formed.
+
+    With a forgetting factor below 1 (or a window length) older samples fade
+    out exponentially, which gives a windowed fit of a stream without storing
+    the samples.
+    """
+
+    __slots__ = ('degree', 'center', 'scale', 'forgetting', 'count', 'r')
+
+    def __init__(self, degree=3, center=0.0, scale=1.0, forgetting=1.0, window=None):
+        """
+        Args:
+            degree (int): Degree of the fitted polynomial
+            center (float): Shift of x before fitting (the middle of the data range works best)
+            scale (float): Scale of x before fitting (half the data range works best)
+            forgetting (float): Weight factor in (0, 1] applied to all earlier samples on every new one
+            window (int, optional): Effective window length; sets forgetting = 1 - 1/window
+        """
+        if degree < 0:
+            raise ValueError("Degree must be non-negative")
+        if scale == 0:
+            raise ValueError("Scale must be non-zero")
+        if window is not None:
+            if window < 1:
+                raise ValueError("Window must be at least 1")
+            forgetting = 1 - 1 / window
+        if not 0 < forgetting <= 1:
+            raise ValueError("Forgetting factor must be in (0, 1]")
+        self.degree = degree
+        self.center = float(center)
+        self.scale = float(scale)
+        self.forgetting = forgetting
+        self.count = 0
+        size = degree + 2
+        self.r = [[0.0] * size for _ in range(size)]
+
+    def _row(self, x, y, weight):
+        """
+        Weighted design matrix row [1, t, ..., t^degree, y] for one sample.
+        """
+        if weight < 0:
+            raise ValueError("Weight must be non-negative")
+        w = math.sqrt(weight)
+        t = (x - self.center) / self.scale
+        row = []
+        power = w
+        for _ in range(self.degree + 1):
+            row.append(power)
+            power *= t
+        row.append(w * y)
+        return row
+
+    def _forget(self, factor):
+        """
+        Scale every stored sample by a weight factor.
+        """
+        root = math.sqrt(factor)
+        for row in self.r:
+            for j in range(len(row)):
+                row[j] *= root
+
+    def add(self, x, y, weight=1.0):
+        """
+        Fold one sample into the fit.
+
+        Args:
+            x (float): Sample position
+            y (float): Sample value
+            weight (float): Sample weight
+        """
+        if self.forgetting < 1:
+            self._forget(self.forgetting)
+        z = self._row(x, y, weight)
+        r = self.r
+        for k in range(len(z)):
+            zk = z[k]
+            if zk == 0:
+                continue
+            rk = r[k]
+            rkk = rk[k]
+            norm = math.hypot(rkk, zk)
+            c, s = rkk / norm, zk / norm
+            rk[k] = norm
+            for j in range(k + 1, len(z)):
+                rkj = rk[j]
+                rk[j] = c * rkj + s * z[j]
+                z[j] = c * z[j] - s * rkj
+        self.count += 1
+
+    def remove(self, x, y, weight=1.0):
+        """
+        Remove a sample that was added before (e.g. the oldest one of a sliding window).
+
+        With a forgetting factor below 1 the weight must be the weight the sample
+        has now, i.e. its original weight times forgetting^(samples added since).
+
+        Args:
+            x (float): Sample position
+            y (float): Sample value
+            weight (float): Sample weight
+
+        Raises:
+            ValueError: If removing the sample would leave a fit that no data supports
+        """
+        z = self._row(x, y, weight)
+        r = self.r
+        for k in range(len(z)):
+            zk = z[k]
+            if zk == 0:
+                continue
+            rk = r[k]
+            rkk = rk[k]
+            if abs(zk) >= abs(rkk):
+                raise ValueError("Sample cannot be removed: it is not part of the fit")
+            rho = math.sqrt((rkk - zk) * (rkk + zk))
+            c, s = rho / rkk, zk / rkk
+            rk[k] = rho
+            for j in range(k + 1, len(z)):
+                rk[j] = (rk[j] - s * z[j]) / c
+                z[j] = c * z[j] - s * rk[j]
+        self.count -= 1
+
+    def update(self, xs, ys, weights=None):
+        """
+        Fold many samples into the fit.
+
+        With NumPy the samples are merged as one block (a QR factorization of R
+        stacked on the block); without it they are added one at a time.
+
+        Args:
+            xs (iterable): Sample positions
+            ys (iterable): Sample values
+            weights (iterable, optional): Sample weights (default: all 1)
+        """
+        np = optional_import("numpy")
+        if np is None:
+            if weights is None:
+                for x, y in zip(xs, ys):
+                    self.add(x, y)
+            else:
+                for x, y, w in zip(xs, ys, weights):
+                    self.add(x, y, w)
+            return
+
+        x = np.asarray(xs, dtype=np.float64).ravel()
+        y = np.asarray(ys, dtype=np.float64).ravel()
+        if x.shape != y.shape:
+            raise ValueError(f"xs has {x.size} values but ys has {y.size}")
+        if not x.size:
+            return
+        w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        if (w < 0).any():
+            raise ValueError("Weight must be non-negative")
+        n = x.size
+        if self.forgetting < 1:
+            # The sample added last keeps its weight; each earlier one fades by one more factor
+            w = w * self.forgetting ** np.arange(n - 1, -1, -1, dtype=np.float64)
+            self._forget(self.forgetting ** n)
+
+        root = np.sqrt(w)
+        block = np.empty((n, self.degree + 2))
+        block[:, :-1] = np.vander((x - self.center) / self.scale, self.degree + 1, increasing=True)
+        block[:, :-1] *= root[:, None]
+        block[:, -1] = root * y
+        stacked = np.vstack((np.array(self.r), block))
+        r = np.linalg.qr(stacked, mode='r')[:self.degree + 2]
+        # Keep the diagonal non-negative, as Givens rotations do
+        r *= np.where(np.diag(r) < 0, -1.0, 1.0)[:, None]
+        self.r = r.tolist()
+        self.count += n
+
+    def polynomial(self):
+        """
+        Solve for the fitted polynomial.
+
+        Returns:
+            Polynomial: Least-squares polynomial in x
+
+        Raises:
+            ValueError: If the samples do not determine a polynomial of this degree
+        """
+        r = self.r
+        m = self.degree + 1
+        # Back substitution on R c = Q^T y
+        coeffs = [0.0] * m
+        for k in range(m - 1, -1, -1):
+            if abs(r[k][k]) <= 1e-14 * max(abs(r[i][i]) for i in range(m)):
+                raise ValueError("Not enough distinct samples to fit a polynomial of this degree")
+            total = r[k][m]
+            for j in range(k + 1, m):
+                total -= r[k][j] * coeffs[j]
+            coeffs[k] = total / r[k][k]
+
+        # The fit is in t = (x - center) / scale; substitute back to get a polynomial in x
+        fit = Polynomial(reversed(coeffs))
+        if self.center == 0 and self.scale == 1:
+            return fit
+        return fit.compose(Polynomial([1 / self.scale, -self.center / self.scale]))
+
+    def residual(self):
+        """
+        Weighted residual sum of squares of the current fit.
+
+        Returns:
+            float: Sum of w * (y - p(x))^2 over the samples in the fit
+        """
+        return self.r[-1][-1] ** 2
+
+def fit_polynomial(xs, ys, degree=3, weights=None):
+    """
+    Fit a least-squares polynomial to (x, y) samples.
+
+    The samples are centered and scaled to [-1, 1] before the QR fit, which
+    keeps high-degree fits well conditioned.
+
+    Args:
+        xs (list): Sample positions
+        ys (list): Sample values
+        degree (int): Degree of the fitted polynomial
+        weights (list, optional): Sample weights
+
+    Returns:
+        Polynomial: Least-squares polynomial in x
+    """
+    xs = list(xs)
+    if not xs:
+        raise ValueError("No samples to fit")
+    lo, hi = min(xs), max(xs)
+    fit = PolynomialFit(degree, center=(lo + hi) / 2, scale=(hi - lo) / 2 or 1.0)
+    fit.update(xs, ys, weights)
+    return fit.polynomial()
@@ -0,0 +1,273 @@
+import math
+from bisect import bisect_left
+
+from polynomial import Polynomial
+from roots import find_real_roots
+from utils import optional_import
+
+DEFAULT_TOLERANCE = 1e-15
+DEFAULT_MAX_ITER = 100
+
+class InverseEvaluator:
+    """
+    Answers "at which x does f(x) = y" for many y against one fixed polynomial.
+
+    The real line is split once at the critical points of f (the real roots
+    of f') into segments on which f is strictly monotone. A query y is
+    answered on every segment whose value range contains it by safeguarded
+    Newton iteration inside a bracket: a step that would leave the bracket is
+    replaced by bisection, so every query converges. Optional interpolation
+    tables of (f(x), x) samples per segment narrow the starting bracket and
+    give an interpolated first guess, so most queries need two or three
+    Newton steps.
+    """
+
+    def __init__(self, coeffs, table_size=0, tol=DEFAULT_TOLERANCE, max_iter=DEFAULT_MAX_ITER):
+        """
+        Args:
+            coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+            table_size (int): Samples per segment in the interpolation tables (0 for none)
+            tol (float): Relative step size at which a solution is accepted
+            max_iter (int): Maximum iterations per query
+
+        Raises:
+            ValueError: If the polynomial is constant or a coefficient is not finite
+        """
+        self.f = Polynomial(coeffs)
+        if self.f.degree < 1:
+            raise ValueError("A constant polynomial has no inverse")
+        if not all(math.isfinite(coeff) for coeff in self.f.coeffs):
+            raise ValueError("Coefficients must be finite")
+        self.tol = tol
+        self.max_iter = max_iter
+        self.iterations = 0
+        self.queries = 0
+
+        coeffs = list(self.f.coeffs)
+        self._lead = coeffs[0]
+        # Largest non-constant lower coefficient, for the root bound of f - y
+        self._lower = max((abs(coeff) for coeff in coeffs[1:-1]), default=0.0)
+        self._constant = coeffs[-1]
+        self.critical_points = sorted(set(find_real_roots(list(self.f.derivative().coeffs))))
+
+        # Sign of f at -inf and +inf
+        degree = self.f.degree
+        right = math.copysign(math.inf, self._lead)
+        left = right if degree % 2 == 0 else -right
+        edges = [-math.inf] + self.critical_points + [math.inf]
+        values = [left] + [self.f(x) for x in self.critical_points] + [right]
+        # Segments as (x_lo, x_hi, f(x_lo), f(x_hi), increasing)
+        self.segments = [(edges[i], edges[i + 1], values[i], values[i + 1], values[i + 1] > values[i])
+                         for i in range(len(edges) - 1)]
+
+        self.tables = None
+        if table_size:
+            if table_size < 2:
+                raise ValueError("Interpolation tables need at least 2 samples")
+            self.tables = [self._table(segment, table_size) for segment in self.segments]
+
+    def _bound(self, y):
+        """
+        Cauchy bound on the magnitude of every root of f - y.
+        """
+        return 1 + max(self._lower, abs(self._constant - y)) / abs(self._lead)
+
+    def _table(self, segment, size):
+        """
+        (f(x) ascending, x) samples over a segment; unbounded segments are
+        sampled out to the root bound of f.
+        """
+        x_lo, x_hi, _, _, increasing = segment
+        reach = self._bound(0.0) + max((abs(x) for x in self.critical_points), default=0.0)
+        lo = x_lo if math.isfinite(x_lo) else -reach
+        hi = x_hi if math.isfinite(x_hi) else reach
+        step = (hi - lo) / (size - 1)
+        xs = [lo + i * step for i in range(size - 1)] + [hi]
+        if not increasing:
+            xs.reverse()
+        return [self.f(x) for x in xs], xs
+
+    def _contains(self, i, y):
+        """
+        Whether f takes the value y on segment i (a value at a shared critical
+        point belongs to the segment on its left only).
+        """
+        _, _, f_lo, f_hi, increasing = self.segments[i]
+        if i > 0 and y == f_lo:
+            return False
+        return f_lo <= y <= f_hi if increasing else f_hi <= y <= f_lo
+
+    def _bracket(self, i, y):
+        """
+        Finite bracket [lo, hi] containing the solution of f(x) = y on segment i,
+        and a first guess inside it.
+        """
+        x_lo, x_hi, _, _, increasing = self.segments[i]
+        bound = self._bound(y)
+        lo = x_lo if math.isfinite(x_lo) else -bound
+        hi = x_hi if math.isfinite(x_hi) else bound
+        if self.tables is not None:
+            ys, xs = self.tables[i]
+            k = bisect_left(ys, y)
+            if 0 < k < len(ys):
+                a, b = sorted((xs[k - 1], xs[k]))
+                lo, hi = max(lo, a), min(hi, b)
+                if ys[k] != ys[k - 1]:
+                    # Inverse linear interpolation between the neighbouring samples
+                    guess = xs[k - 1] + (y - ys[k - 1]) * (xs[k] - xs[k - 1]) / (ys[k] - ys[k - 1])
+                    if lo <= guess <= hi:
+                        return lo, hi, guess
+            elif k == 0:
+                # Below the table: the bracket ends at the table's first sample
+                lo, hi = (lo, max(lo, xs[0])) if increasing else (min(hi, xs[0]), hi)
+            else:
+                lo, hi = (min(hi, xs[-1]), hi) if increasing else (lo, max(lo, xs[-1]))
+        return lo, hi, (lo + hi) / 2
+
+    def _solve_segment(self, i, y):
+        """
+        Safeguarded Newton iteration for f(x) = y on segment i.
+
+        Once the Newton steps contract, a step is accepted as final when the
+        predicted error of the new iterate, |f''/(2f')| * step^2, is below tol
+        relative to it, which saves the evaluation that would only confirm
+        convergence.
+        """
+        x_lo, x_hi, f_lo, f_hi, increasing = self.segments[i]
+        # Values at critical points are hit exactly (and would converge only linearly)
+        if y == f_lo:
+            return x_lo
+        if y == f_hi:
+            return x_hi
+        lo, hi, x = self._bracket(i, y)
+        coeffs = self.f.coeffs
+        # Last Newton step size (0 until there is one)
+        previous = 0.0
+        for iteration in range(1, self.max_iter + 1):
+            fx = coeffs[0]
+            fpx = fppx = 0.0
+            for coeff in coeffs[1:]:
+                fppx = fppx * x + fpx
+                fpx = fpx * x + fx
+                fx = fx * x + coeff
+            residual = fx - y
+            if residual == 0:
+                break
+            if (residual > 0) == increasing:
+                hi = x
+            else:
+                lo = x
+            candidate = x - residual / fpx if fpx else math.nan
+            if lo < candidate < hi:
+                step = abs(candidate - x)
+                x = candidate
+                if step <= self.tol * abs(x) or (step < previous and abs(fppx / fpx) * step * step <= self.tol * abs(x)):
+                    break
+                previous = step
+            else:
+                previous = 0.0
+                x = (lo + hi) / 2
+                if x in (lo, hi):
+                    break
+        self.iterations += iteration
+        return x
+
+    def solve(self, y):
+        """
+        Find every x with f(x) = y.
+
+        Args:
+            y (float): Target value
+
+        Returns:
+            list: Solutions in ascending order, one per monotone segment that reaches y
+        """
+        self.queries += 1
+        return [self._solve_segment(i, y) for i in range(len(self.segments)) if self._contains(i, y)]
+
+    def solve_batch(self, ys):
+        """
+        Find every x with f(x) = y for many targets.
+
+        The iteration is vectorized across queries with NumPy when it is
+        installed (falling back to one query at a time otherwise).
+
+        Args:
+            ys (iterable): Target values
+
+        Returns:
+            list: One ascending list of solutions per target
+        """
+        np = optional_import("numpy")
+        if np is None:
+            return [self.solve(y) for y in ys]
+        targets = np.asarray(ys, dtype=np.float64).ravel()
+        results = [[] for _ in range(len(targets))]
+        for i, segment in enumerate(self.segments):
+            for index, x in self._solve_segment_batch(np, i, targets):
+                results[index].append(x)
+        self.queries += len(targets)
+        return results
+
+    def _solve_segment_batch(self, np, i, targets):
+        """
+        Vectorized safeguarded Newton iteration on segment i for the targets it reaches.
+
+        Returns:
+            list: (target index, solution) pairs
+        """
+        _, _, f_lo, f_hi, increasing = self.segments[i]
+        low, high = (f_lo, f_hi) if increasing else (f_hi, f_lo)
+        inside = (targets >= low) & (targets <= high)
+        if i > 0:
+            inside &= targets != f_lo
+        pairs = []
+        for value, x_edge in ((f_lo, self.segments[i][0]), (f_hi, self.segments[i][1])):
+            # Values at critical points are hit exactly
+            if math.isfinite(x_edge):
+                exact = inside & (targets == value)
+                pairs += [(k, x_edge) for k in np.flatnonzero(exact).tolist()]
+                inside &= ~exact
+        index = np.flatnonzero(inside)
+        if not len(index):
+            return pairs
+        brackets = [self._bracket(i, y) for y in targets[index].tolist()]
+        lo, hi, x = (np.array(column) for column in zip(*brackets))
+        y = targets[index]
+        solution = np.empty(len(index))
+        previous = np.zeros(len(index))
+        active = np.arange(len(index))
+        coeffs = list(self.f.coeffs)
+        with np.errstate(all='ignore'):
+            for _ in range(self.max_iter):
+                if not len(active):
+                    break
+                self.iterations += len(active)
+                xa = x[active]
+                fx = np.full(len(active), coeffs[0])
+                fpx = np.zeros(len(active))
+                fppx = np.zeros(len(active))
+                for coeff in coeffs[1:]:
+                    fppx = fppx * xa + fpx
+                    fpx = fpx * xa + fx
+                    fx = fx * xa + coeff
+                residual = fx - y[active]
+                above = (residual > 0) == increasing
+                lo_a = np.where(above, lo[active], xa)
+                hi_a = np.where(above, xa, hi[active])
+                candidate = xa - residual / fpx
+                newton = (candidate > lo_a) & (candidate < hi_a)
+                step = np.abs(candidate - xa)
+                converged = newton & ((step <= self.tol * np.abs(candidate))
+                                      | ((step < previous[active])
+                                         & (np.abs(fppx / fpx) * step * step <= self.tol * np.abs(candidate))))
+                previous[active] = np.where(newton, step, 0.0)
+                candidate = np.where(newton, candidate, (lo_a + hi_a) / 2)
+                stuck = ~newton & ((candidate == lo_a) | (candidate == hi_a))
+                done = (residual == 0) | converged | stuck
+                candidate = np.where(residual == 0, xa, candidate)
+                lo[active], hi[active], x[active] = lo_a, hi_a, candidate
+                solution[active[done]] = candidate[done]
+                active = active[~done]
+            solution[active] = x[active]
+        return pairs + list(zip(index.tolist(), solution.tolist()))
@@ -1,6 +1,14 @@
-from sympy import symbols, Eq, solve
-from utils import clear_console, format_number, polynomial_to_string, validate_input, float_validator
+import sys
+from cache import SolveCache
+from metrics import instrument
+from polynomial import Polynomial, calculate_fx
+from report import ReportRenderer
+from roots import solve_cubic
+from stream import add_arguments, run_batch
+from symbolic import DEFAULT_TIMEOUT, SOURCE_EXACT, solve_bounded, solve_polynomial_sympy
+from utils import clear_console, format_number, format_root, polynomial_to_string, validate_input, float_validator
 
+@instrument(failure=lambda solutions: None if solutions else "no_solutions")
 def solve_equation_sympy(a, b, c, d):
     """
     Solve the cubic equation ax^3 + bx^2 + cx + d = 0 using sympy
@@ -14,17 +22,55 @@ def solve_equation_sympy(a, b, c, d):
     Returns:
         list: List of solutions
     """
-    # Define the symbol X to be discovered by the sympy library
-    x = symbols('x')
+    return solve_polynomial_sympy((a, b, c, d))
+
+# Repeated queries reuse earlier solutions (exact keys for the symbolic solver)
+numeric_cache = SolveCache(solve_cubic)
+exact_cache = SolveCache(solve_equation_sympy, max_entries=128, tolerance=0)
+
+def solve_equation(a, b, c, d, exact=False):
+    """
+    Solve the cubic equation ax^3 + bx^2 + cx + d = 0
+    
+    Uses the fast closed-form numeric solver by default. The sympy solver is
+    only used when exact symbolic solutions are requested. Results are memoized
+    in numeric_cache and exact_cache.
+    
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        exact (bool): Return exact sympy expressions instead of floats
+    
+    Returns:
+        list: List of solutions (floats/complex numbers, or sympy expressions when exact)
+    """
+    if exact:
+        return exact_cache.solve(a, b, c, d)
+    return numeric_cache.solve(a, b, c, d)
+
+def solve_equation_bounded(a, b, c, d, timeout=DEFAULT_TIMEOUT):
+    """
+    Solve the cubic equation ax^3 + bx^2 + cx + d = 0 exactly within a time limit
+    
+    The sympy solve runs in a separate process that is killed when the time
+    limit expires, in which case the fast numeric solver answers instead.
     
-    # Create the equation ax^3 + bx^2 + cx + d = 0
-    equation = Eq(a * x**3 + b * x**2 + c * x + d, 0)
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        timeout (float): Seconds the symbolic solve may take
     
-    # Solve the equation
-    solutions = solve(equation, x)
-    return solutions
+    Returns:
+        tuple: (solutions, source) where source is "exact" for sympy expressions
+               and "numeric" for floats/complex numbers from the fallback
+    """
+    return solve_bounded((a, b, c, d), timeout, fallback=lambda coeffs: numeric_cache.solve(*coeffs))
 
-def calculate_value(a, b, c, d, x):
+def calculate_value(a, b, c, d, x, renderer=None):
     """
     Calculate and display the polynomial value at a given point
     
@@ -34,38 +80,36 @@ def calculate_value(a, b, c, d, x):
         c (float): Coefficient of x
         d (float): Constant term
         x (float): The x value
+        renderer (ReportRenderer, optional): Collects the report instead of writing
+                                             it at once, e.g. to buffer many
+                                             evaluations or choose the verbosity
         
     Returns:
         float: The calculated value
     """
     # Calculate the formula: f(x)
-    f_x = a * x**3 + b * x**2 + c * x + d
-
-    # Print the entire formula
-    print(f"The formula is: f(x) = {format_number(a)}x^3 + {format_number(b)}x^2 + {format_number(c)}x + {format_number(d)}")
+    f_x = calculate_fx(a, b, c, d, x)
 
-    # Explain the calculation step by step
-    print(f"Calculating step by step:")
-    print(f"{format_number(a)} * ({format_number(x)}^3) = {format_number(a * x**3)}")
-    print(f"+ {format_number(b)} * ({format_number(x)}^2) = {format_number(b * x**2)}")
-    print(f"+ {format_number(c)} * {format_number(x)} = {format_number(c * x)}")
-    print(f"+ {format_number(d)} = {format_number(d)}")
+    # Show the formula, the step-by-step breakdown and the result in one write
+    if renderer is None:
+        with ReportRenderer() as renderer:
+            return renderer.add(a, b, c, d, x, f_x)
+    return renderer.add(a, b, c, d, x, f_x)
 
-    # Show the result of the calculation
-    print(f"The value of f(x) is: {format_number(f_x)}")
-    
-    return f_x
-
-def main():
+def main(exact=False, timeout=None):
     """
-    Main function to run the polynomial calculator with sympy
+    Main function to run the polynomial calculator
+    
+    Args:
+        exact (bool): Find exact symbolic solutions with sympy instead of numeric ones
+        timeout (float, optional): Seconds an exact solve may take before numeric solutions are shown instead
     """
     clear_console()
     
     print("Symbolic Cubic Polynomial Calculator")
     print("===================================")
     print("This program calculates f(x) = ax^3 + bx^2 + cx + d")
-    print("or finds exact symbolic solutions to f(x) = 0")
+    print("or finds the solutions to f(x) = 0")
     print()
 
     # Load the variables A, B, C, D and X from user input
@@ -83,23 +127,38 @@ def main():
                              "Please enter a number or ? for root finding")
 
     if x_input == '?':
-        # Solve the equation symbolically
-        solutions = solve_equation_sympy(a, b, c, d)
+        # Solve the equation (symbolically only when exact mode is requested)
+        if exact and timeout is not None:
+            solutions, source = solve_equation_bounded(a, b, c, d, timeout)
+            if source != SOURCE_EXACT:
+                print(f"The exact solve did not finish within {timeout} s, showing numeric solutions.")
+                exact = False
+        else:
+            try:
+                solutions = solve_equation(a, b, c, d, exact=exact)
+            except ValueError as e:
+                print(f"The equation cannot be solved: {e}")
+                return
         
         if solutions:
             print(f"The values of X that make f(x) = 0 are:")
             for i, sol in enumerate(solutions, 1):
-                print(f"  x{i} = {sol}")
+                print(f"  x{i} = {sol if exact else format_root(sol)}")
                 
-            # If solutions are numerical, verify them
-            try:
-                print("\nVerification:")
-                for i, sol in enumerate(solutions, 1):
+            # Verify the real solutions
+            print("\nVerification:")
+            skipped = False
+            f = Polynomial(coeffs)
+            for i, sol in enumerate(solutions, 1):
+                try:
                     sol_float = float(sol)
-                    f_x = a * sol_float**3 + b * sol_float**2 + c * sol_float + d
-                    print(f"  f(x{i}) = f({format_number(sol_float)}) = {format_number(f_x)}")
-            except:
-                # If some solutions are complex or symbolic expressions, skip verification
+                except TypeError:
+                    # Complex solutions or symbolic expressions are not verified
+                    skipped = True
+                    continue
+                f_x = f(sol_float)
+                print(f"  f(x{i}) = f({format_number(sol_float)}) = {format_number(f_x)}")
+            if skipped:
                 print("\nSome solutions are complex or symbolic expressions.")
         else:
             print("No solutions found for the equation.")
@@ -109,5 +168,17 @@ def main():
         calculate_value(a, b, c, d, x)
 
 if __name__ == "__main__":
-    main()
+    # argparse is only needed when running as a script, not when imported
+    import argparse
+    parser = argparse.ArgumentParser(description="Symbolic Cubic Polynomial Calculator")
+    # Batch mode always solves numerically, so --exact cannot be combined with --batch
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--exact", action="store_true", help="find exact symbolic solutions with sympy")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds an exact solve may take before numeric solutions are shown (0 for no limit)")
+    add_arguments(parser, modes)
+    args = parser.parse_args()
+    if args.batch is not None:
+        sys.exit(run_batch(args))
+    main(exact=args.exact, timeout=args.timeout or None)
 
@@ -0,0 +1,211 @@
+import atexit
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Instrumentation is opt-in: set LTC_METRICS=1 before the calculator modules are
+# imported. When it is off, instrument() returns functions unchanged, so the hot
+# paths pay nothing. LTC_METRICS_FILE names a .json or .prom file that receives a
+# snapshot when the process exits.
+ENABLED = os.environ.get("LTC_METRICS", "").lower() in ("1", "true", "yes", "on")
+EXPORT_FILE = os.environ.get("LTC_METRICS_FILE")
+
+# Upper bounds in seconds of the latency histogram buckets (the last one catches everything)
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, float('inf'))
+
+_lock = threading.Lock()
+_metrics = {}
+
+def _new_entry():
+    """
+    Empty metrics for one instrumented function.
+    """
+    return {
+        "calls": 0,
+        "latency_buckets": [0] * len(LATENCY_BUCKETS),
+        "latency_sum": 0.0,
+        "iterations": 0,
+        "max_iterations": 0,
+        "failures": {},
+    }
+
+def record(name, seconds, iterations=None, failure=None):
+    """
+    Record one call of an instrumented function.
+
+    Args:
+        name (str): Metric name of the function
+        seconds (float): Latency of the call
+        iterations (int, optional): Iterations the call needed
+        failure (str, optional): Failure reason, if the call failed
+    """
+    with _lock:
+        entry = _metrics.get(name)
+        if entry is None:
+            entry = _metrics[name] = _new_entry()
+        entry["calls"] += 1
+        entry["latency_buckets"][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        entry["latency_sum"] += seconds
+        if iterations is not None:
+            entry["iterations"] += iterations
+            if iterations > entry["max_iterations"]:
+                entry["max_iterations"] = iterations
+        if failure is not None:
+            entry["failures"][failure] = entry["failures"].get(failure, 0) + 1
+
+def wrap(func, name=None, iterations=None, failure=None):
+    """
+    Wrap a function so every call is recorded, whether instrumentation is enabled or not.
+
+    Args:
+        func (function): Function to wrap
+        name (str, optional): Metric name (default: the function's name)
+        iterations (function, optional): Extracts the iteration count from a result
+        failure (function, optional): Returns a failure reason for a result, or None
+
+    Returns:
+        function: The recording wrapper
+    """
+    name = name or func.__name__
+    timer = time.perf_counter
+
+    def instrumented(*args, **kwargs):
+        start = timer()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            record(name, timer() - start, failure=type(e).__name__)
+            raise
+        elapsed = timer() - start
+        record(name, elapsed,
+               iterations(result) if iterations is not None else None,
+               failure(result) if failure is not None else None)
+        return result
+
+    instrumented.__name__ = func.__name__
+    instrumented.__qualname__ = func.__qualname__
+    instrumented.__doc__ = func.__doc__
+    instrumented.__module__ = func.__module__
+    instrumented.__wrapped__ = func
+    return instrumented
+
+def instrument(name=None, iterations=None, failure=None):
+    """
+    Decorator that records calls, latency, iterations and failures when LTC_METRICS is set.
+
+    Args:
+        name (str, optional): Metric name (default: the function's name)
+        iterations (function, optional): Extracts the iteration count from a result
+        failure (function, optional): Returns a failure reason for a result, or None
+
+    Returns:
+        function: Decorator returning the function itself when instrumentation is off
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+        return wrap(func, name, iterations, failure)
+    return decorator
+
+def snapshot():
+    """
+    Copy of the metrics recorded so far.
+
+    Returns:
+        dict: Per-function calls, latency histogram (bucket bounds and counts),
+              latency sum, total and maximum iterations and failures by reason
+    """
+    with _lock:
+        return {
+            name: dict(entry, latency_buckets=list(entry["latency_buckets"]), failures=dict(entry["failures"]))
+            for name, entry in _metrics.items()
+        }
+
+def reset():
+    """
+    Drop all recorded metrics.
+    """
+    with _lock:
+        _metrics.clear()
+
+def to_json(data=None):
+    """
+    Export a snapshot as JSON.
+
+    Args:
+        data (dict, optional): Output of snapshot() (default: the current metrics)
+
+    Returns:
+        str: JSON document with the bucket bounds and per-function metrics
+    """
+    import json
+    data = snapshot() if data is None else data
+    bounds = [bound if bound != float('inf') else "+Inf" for bound in LATENCY_BUCKETS]
+    return json.dumps({"latency_buckets_seconds": bounds, "functions": data}, indent=2, sort_keys=True)
+
+def _format_bound(bound):
+    """
+    Prometheus text for a histogram bucket bound.
+    """
+    return "+Inf" if bound == float('inf') else repr(bound)
+
+def to_prometheus(data=None, prefix="ltc"):
+    """
+    Export a snapshot in the Prometheus text exposition format.
+
+    Args:
+        data (dict, optional): Output of snapshot() (default: the current metrics)
+        prefix (str): Metric name prefix
+
+    Returns:
+        str: Counters for calls, iterations and failures and a latency histogram per function
+    """
+    data = snapshot() if data is None else data
+    lines = [
+        f"# HELP {prefix}_calls_total Number of calls of an instrumented function",
+        f"# TYPE {prefix}_calls_total counter",
+    ]
+    lines += [f'{prefix}_calls_total{{function="{name}"}} {entry["calls"]}' for name, entry in sorted(data.items())]
+
+    lines += [
+        f"# HELP {prefix}_iterations_total Iterations run by an instrumented function",
+        f"# TYPE {prefix}_iterations_total counter",
+    ]
+    lines += [f'{prefix}_iterations_total{{function="{name}"}} {entry["iterations"]}'
+              for name, entry in sorted(data.items()) if entry["iterations"]]
+
+    lines += [
+        f"# HELP {prefix}_failures_total Failed calls of an instrumented function by reason",
+        f"# TYPE {prefix}_failures_total counter",
+    ]
+    for name, entry in sorted(data.items()):
+        for reason, count in sorted(entry["failures"].items()):
+            lines.append(f'{prefix}_failures_total{{function="{name}",reason="{reason}"}} {count}')
+
+    lines += [
+        f"# HELP {prefix}_latency_seconds Latency of an instrumented function",
+        f"# TYPE {prefix}_latency_seconds histogram",
+    ]
+    for name, entry in sorted(data.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, entry["latency_buckets"]):
+            cumulative += count
+            lines.append(f'{prefix}_latency_seconds_bucket{{function="{name}",le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{prefix}_latency_seconds_sum{{function="{name}"}} {entry["latency_sum"]!r}')
+        lines.append(f'{prefix}_latency_seconds_count{{function="{name}"}} {entry["calls"]}')
+    return "\n".join(lines) + "\n"
+
+def export(path):
+    """
+    Write the current metrics to a file, as Prometheus text for .prom files and JSON otherwise.
+
+    Args:
+        path (str): Output file
+    """
+    text = to_prometheus() if path.endswith(".prom") else to_json()
+    with open(path, "w") as f:
+        f.write(text)
+
+if ENABLED and EXPORT_FILE:
+    atexit.register(export, EXPORT_FILE)
@@ -0,0 +1,219 @@
+import os
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from polynomial import calculate_fx_batch
+from roots import solve_cubic_batch
+from utils import optional_import
+
+# Number of rows handed to a worker at a time
+DEFAULT_CHUNK_SIZE = 65536
+
+def _chunks(n, chunk_size):
+    """
+    Split range(n) into (start, stop) pairs of at most chunk_size items.
+    """
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+def _create_block(nbytes):
+    """
+    Create a shared memory block (shared memory cannot be zero-sized).
+    """
+    return shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+def _run_chunks(func, chunks, workers, *args):
+    """
+    Run func(*args, start, stop) for every chunk on a process pool and wait for all of them.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, *args, start, stop) for start, stop in chunks]
+        for future in futures:
+            # Re-raise the first worker error in the caller
+            future.result()
+
+def _drop_views(error):
+    """
+    Clear the locals of the frames an exception passed through, so arrays they
+    held over a shared memory block do not keep it from closing (close() would
+    raise BufferError and hide the original error).
+    """
+    traceback.clear_frames(error.__traceback__)
+
+def _evaluate_chunk(in_name, out_name, a, b, c, d, start, stop):
+    """
+    Worker: evaluate one chunk of x values from shared memory into the shared output.
+    """
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    xs_view = shm_in.buf.cast('d')
+    out_view = shm_out.buf.cast('d')
+    xs = xs_view[start:stop]
+    out = out_view[start:stop]
+    try:
+        calculate_fx_batch(a, b, c, d, xs, out=out)
+    except BaseException as error:
+        _drop_views(error)
+        raise
+    finally:
+        # Every exported view must be released before the blocks can be closed
+        for view in (xs, out, xs_view, out_view):
+            view.release()
+        shm_in.close()
+        shm_out.close()
+
+def evaluate_parallel(a, b, c, d, xs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Evaluate a cubic polynomial at many points on a process pool
+
+    The x values are copied once into shared memory and every worker reads its
+    chunk from there and writes its results straight into a shared output
+    block, so no lists are pickled between processes and the results keep the
+    input order. Inputs that fit in a single chunk are evaluated in-process.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        xs (iterable): Input values
+        workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_size (int): Number of x values per worker task
+
+    Returns:
+        numpy.ndarray or array: Results in input order (array('d') without NumPy)
+    """
+    np = optional_import("numpy")
+    workers = workers or os.cpu_count() or 1
+    values = xs if np is not None and isinstance(xs, np.ndarray) else array('d', xs)
+    n = len(values)
+    if workers == 1 or n <= chunk_size:
+        return calculate_fx_batch(a, b, c, d, values)
+
+    shm_in = _create_block(n * 8)
+    shm_out = _create_block(n * 8)
+    try:
+        in_view = shm_in.buf.cast('d')
+        if np is not None:
+            np.asarray(in_view)[:n] = values
+        else:
+            in_view[:n] = values
+        in_view.release()
+
+        _run_chunks(_evaluate_chunk, _chunks(n, chunk_size), workers,
+                    shm_in.name, shm_out.name, a, b, c, d)
+
+        out_view = shm_out.buf.cast('d')
+        result = np.array(out_view[:n]) if np is not None else array('d', out_view[:n])
+        out_view.release()
+        return result
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+
+def _solve_chunk(in_name, roots_name, mask_name, status_name, n, start, stop):
+    """
+    Worker: solve one chunk of coefficient rows from shared memory into the shared outputs.
+    Without NumPy the same byte layout is written through plain memoryviews.
+    """
+    np = optional_import("numpy")
+    blocks = [shared_memory.SharedMemory(name=name) for name in (in_name, roots_name, mask_name, status_name)]
+    shm_in, shm_roots, shm_mask, shm_status = blocks
+    try:
+        if np is not None:
+            table = np.ndarray((n, 4), dtype=np.float64, buffer=shm_in.buf)
+            roots_out = np.ndarray((n, 3), dtype=np.complex128, buffer=shm_roots.buf)
+            mask_out = np.ndarray((n, 3), dtype=np.bool_, buffer=shm_mask.buf)
+            status_out = np.ndarray(n, dtype=np.int8, buffer=shm_status.buf)
+            try:
+                found, real_mask, status = solve_cubic_batch(table[start:stop])
+                roots_out[start:stop] = found
+                mask_out[start:stop] = real_mask
+                status_out[start:stop] = status
+            except BaseException as error:
+                _drop_views(error)
+                raise
+            finally:
+                # Every view must be gone before the blocks can be closed
+                del table, roots_out, mask_out, status_out
+        else:
+            table = shm_in.buf.cast('d')
+            roots_out = shm_roots.buf.cast('d')
+            mask_out = shm_mask.buf.cast('B')
+            status_out = shm_status.buf.cast('b')
+            try:
+                rows = [table[4 * i:4 * i + 4].tolist() for i in range(start, stop)]
+                found, real_mask, status = solve_cubic_batch(rows)
+                for i, row in enumerate(range(start, stop)):
+                    for j in range(3):
+                        # complex128 layout: real and imaginary parts interleaved
+                        roots_out[6 * row + 2 * j] = found[i][j].real
+                        roots_out[6 * row + 2 * j + 1] = found[i][j].imag
+                        mask_out[3 * row + j] = int(real_mask[i][j])
+                    status_out[row] = status[i]
+            finally:
+                for view in (table, roots_out, mask_out, status_out):
+                    view.release()
+    finally:
+        for shm in blocks:
+            shm.close()
+
+def solve_cubic_parallel(coeffs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Solve many cubic equations on a process pool
+
+    Same results as roots.solve_cubic_batch, with the coefficient table and the
+    output arrays shared between processes through shared memory. Tables that
+    fit in a single chunk are solved in-process.
+
+    Args:
+        coeffs (array-like): N x 4 table of (a, b, c, d) rows
+        workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_size (int): Number of rows per worker task
+
+    Returns:
+        tuple: (roots, real_mask, status) as returned by solve_cubic_batch, in input order
+    """
+    np = optional_import("numpy")
+    workers = workers or os.cpu_count() or 1
+    if np is not None:
+        table = np.ascontiguousarray(coeffs, dtype=np.float64).reshape(-1, 4)
+    else:
+        table = array('d', (float(v) for row in coeffs for v in row))
+    n = len(table) if np is not None else len(table) // 4
+    if workers == 1 or n <= chunk_size:
+        return solve_cubic_batch(table if np is not None else [table[4 * i:4 * i + 4] for i in range(n)])
+
+    blocks = [_create_block(n * 32), _create_block(n * 48), _create_block(n * 3), _create_block(n)]
+    shm_in, shm_roots, shm_mask, shm_status = blocks
+    try:
+        in_view = shm_in.buf.cast('d')
+        if np is not None:
+            np.asarray(in_view)[:4 * n] = table.ravel()
+        else:
+            in_view[:4 * n] = table
+        in_view.release()
+
+        _run_chunks(_solve_chunk, _chunks(n, chunk_size), workers,
+                    shm_in.name, shm_roots.name, shm_mask.name, shm_status.name, n)
+
+        if np is not None:
+            found = np.ndarray((n, 3), dtype=np.complex128, buffer=shm_roots.buf).copy()
+            real_mask = np.ndarray((n, 3), dtype=np.bool_, buffer=shm_mask.buf).copy()
+            status = np.ndarray(n, dtype=np.int8, buffer=shm_status.buf).copy()
+            return found, real_mask, status
+
+        parts = shm_roots.buf.cast('d')
+        found = [[complex(parts[6 * i + 2 * j], parts[6 * i + 2 * j + 1]) for j in range(3)] for i in range(n)]
+        parts.release()
+        real_mask = [[bool(shm_mask.buf[3 * i + j]) for j in range(3)] for i in range(n)]
+        codes = shm_status.buf.cast('b')
+        status = codes.tolist()[:n]
+        codes.release()
+        return found, real_mask, status
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
@@ -1,6 +1,312 @@
-from utils import format_number, is_near_zero, polynomial_to_string, validate_input, float_validator
+import math
+from array import array
+
+from metrics import instrument
+from report import ReportRenderer, STEPS
+from roots import find_all_roots, find_real_roots, iterate_root
+from utils import format_number, is_near_zero, polynomial_to_string, validate_input, float_validator, optional_import
+
+# NumPy is optional: the TI-84 Python Edition does not ship it, so every
+# batch routine below also has a pure-Python fallback. It is imported on
+# first use through optional_import.
+
+# Operand length above which polynomial multiplication switches to Karatsuba
+KARATSUBA_THRESHOLD = 32
+
+def _schoolbook_multiply(p, q):
+    """
+    Convolve two coefficient sequences directly in O(len(p) * len(q)).
+    """
+    result = [0.0] * (len(p) + len(q) - 1)
+    for i, pc in enumerate(p):
+        if pc == 0:
+            continue
+        for j, qc in enumerate(q):
+            result[i + j] += pc * qc
+    return result
+
+def _karatsuba_multiply(p, q):
+    """
+    Convolve two coefficient sequences of equal length with Karatsuba's algorithm.
+    """
+    n = len(p)
+    if n <= KARATSUBA_THRESHOLD:
+        return _schoolbook_multiply(p, q)
+    
+    m = n // 2
+    p0, p1 = p[:m], p[m:]
+    q0, q1 = q[:m], q[m:]
+    z0 = _karatsuba_multiply(p0, q0)
+    z2 = _karatsuba_multiply(p1, q1)
+    
+    # (p0 + p1)(q0 + q1) - z0 - z2 gives the middle term with one multiplication
+    p_sum = [v + (p0[i] if i < m else 0.0) for i, v in enumerate(p1)]
+    q_sum = [v + (q0[i] if i < m else 0.0) for i, v in enumerate(q1)]
+    z1 = _karatsuba_multiply(p_sum, q_sum)
+    for i, v in enumerate(z0):
+        z1[i] -= v
+    for i, v in enumerate(z2):
+        z1[i] -= v
+    
+    result = [0.0] * (2 * n - 1)
+    for i, v in enumerate(z0):
+        result[i] += v
+    for i, v in enumerate(z1):
+        result[i + m] += v
+    for i, v in enumerate(z2):
+        result[i + 2 * m] += v
+    return result
+
+def _as_float_array(xs):
+    """
+    View the input values as a contiguous float64 NumPy array without copying when possible.
+    """
+    np = optional_import("numpy")
+    if isinstance(xs, (bytes, bytearray)):
+        return np.frombuffer(xs, dtype=np.float64)
+    if not hasattr(xs, '__len__') and not isinstance(xs, (memoryview, np.ndarray)):
+        return np.fromiter(xs, dtype=np.float64)
+    return np.ascontiguousarray(xs, dtype=np.float64)
+
+def _horner_batch(coeffs, xs, out=None):
+    """
+    Evaluate the polynomial with the given coefficients (highest degree first)
+    at many points; shared by Polynomial.evaluate_batch and calculate_fx_batch.
+    """
+    np = optional_import("numpy")
+    if np is not None:
+        x = _as_float_array(xs)
+        target = out if out is not None else np.empty_like(x)
+        o = np.asarray(target)
+        if o.shape != x.shape:
+            raise ValueError(f"out has shape {o.shape}, expected {x.shape}")
+        if np.may_share_memory(o, x):
+            x = x.copy()
+        # Evaluate in place so the sweep allocates nothing beyond the output
+        if len(coeffs) == 1:
+            o.fill(coeffs[0])
+        else:
+            np.multiply(x, coeffs[0], out=o)
+            o += coeffs[1]
+        for i in range(2, len(coeffs)):
+            o *= x
+            o += coeffs[i]
+        if o is not target and not np.may_share_memory(o, target):
+            # out is not a buffer (e.g. a list), so np.asarray filled a copy
+            target[:] = o.tolist()
+        return target
+    
+    if out is None:
+        out = array('d', xs)
+        xs = out
+    elif not hasattr(xs, '__len__'):
+        xs = array('d', xs)
+    if len(xs) != len(out):
+        raise ValueError(f"out has length {len(out)}, expected {len(xs)}")
+    for i, x in enumerate(xs):
+        result = coeffs[0]
+        for j in range(1, len(coeffs)):
+            result = result * x + coeffs[j]
+        out[i] = result
+    return out
+
+class Polynomial:
+    """
+    Polynomial of arbitrary degree with its coefficients stored in a compact
+    array('d') buffer, highest degree first (the same order as
+    polynomial_to_string): Polynomial([a, b, c, d]) is a*x^3 + b*x^2 + c*x + d.
+    """
+    
+    __slots__ = ('coeffs',)
+    
+    def __init__(self, coeffs):
+        """
+        Args:
+            coeffs (iterable): Coefficients, highest degree first. Leading zeros are dropped.
+        """
+        buffer = array('d', coeffs)
+        if buffer and buffer[0] != 0:
+            self.coeffs = buffer
+            return
+        start = 0
+        while start < len(buffer) - 1 and buffer[start] == 0:
+            start += 1
+        self.coeffs = buffer[start:] if buffer else array('d', [0.0])
+    
+    @property
+    def degree(self):
+        """
+        int: Degree of the polynomial (0 for constants, including the zero polynomial)
+        """
+        return len(self.coeffs) - 1
+    
+    def __call__(self, x):
+        """
+        Evaluate the polynomial at x with Horner's scheme.
+        
+        Args:
+            x (float): Input value (complex values and NumPy arrays also work)
+            
+        Returns:
+            float: Value of the polynomial at x
+        """
+        coeffs = self.coeffs
+        result = coeffs[0]
+        for i in range(1, len(coeffs)):
+            result = result * x + coeffs[i]
+        return result
+    
+    def evaluate_batch(self, xs, out=None):
+        """
+        Evaluate the polynomial at many points with Horner's scheme.
+        
+        Uses NumPy when it is installed and falls back to a pure-Python loop over
+        an array('d') buffer otherwise.
+        
+        Args:
+            xs (iterable): Input values (list, array('d'), memoryview, bytes of float64, NumPy array or any iterable)
+            out (buffer, optional): Preallocated output buffer (or list) of the same length as xs
+            
+        Returns:
+            numpy.ndarray or array: Results in one contiguous buffer (out itself when given)
+        """
+        return _horner_batch(self.coeffs, xs, out)
+    
+    def compile(self, derivative=False):
+        """
+        Build a function specialized to this polynomial for repeated evaluation.
+        
+        The coefficients are baked into generated Horner code as constants, so a
+        call does no coefficient lookups, loops or powers. Compiling costs far
+        more than one evaluation; it pays off when the same polynomial is
+        evaluated many times.
+        
+        Args:
+            derivative (bool): Return (f(x), f'(x)) from one fused Horner pass instead of f(x)
+            
+        Returns:
+            function: f(x) (or f(x) -> (value, derivative)) with a batch(xs, out=None)
+                      attribute for evaluating many points and the coeffs it was built from
+        """
+        constants = [repr(coeff) if math.isfinite(coeff) else f"float('{coeff}')" for coeff in self.coeffs]
+        if derivative:
+            if len(constants) == 1:
+                body = [f"return {constants[0]}, 0.0"]
+            else:
+                body = [f"fx = {constants[0]} * x + {constants[1]}", f"fpx = {constants[0]}"]
+                for constant in constants[2:]:
+                    body.append("fpx = fpx * x + fx")
+                    body.append(f"fx = fx * x + {constant}")
+                body.append("return fx, fpx")
+        else:
+            expression = constants[0]
+            for constant in constants[1:]:
+                expression = f"({expression}) * x + {constant}"
+            body = [f"return {expression}"]
+        source = "def evaluate(x):\n" + "".join(f"    {line}\n" for line in body)
+        namespace = {}
+        exec(compile(source, "<compiled polynomial>", "exec"), namespace)
+        function = namespace["evaluate"]
+        function.coeffs = self.coeffs
+        function.batch = self.evaluate_batch
+        return function
+    
+    def derivative(self):
+        """
+        Get the derivative of the polynomial.
+        
+        Returns:
+            Polynomial: The derivative
+        """
+        degree = self.degree
+        if degree == 0:
+            return Polynomial([0.0])
+        return Polynomial([coeff * (degree - i) for i, coeff in enumerate(self.coeffs[:-1])])
+    
+    def compose(self, other):
+        """
+        Compose two polynomials: the result evaluates self(other(x)).
+        
+        Args:
+            other (Polynomial): Inner polynomial
+            
+        Returns:
+            Polynomial: The composition
+        """
+        result = Polynomial([self.coeffs[0]])
+        for coeff in self.coeffs[1:]:
+            result = result * other + coeff
+        return result
+    
+    def real_roots(self):
+        """
+        Find every real root (see roots.find_real_roots).
+        
+        Returns:
+            list: Real roots in ascending order, repeated by multiplicity
+        """
+        return find_real_roots(self.coeffs)
+    
+    def roots(self):
+        """
+        Find every real and complex root with its error bound (see roots.find_all_roots).
+        
+        Returns:
+            tuple: (roots, bounds) sorted by real then imaginary part
+        """
+        return find_all_roots(self.coeffs)
+    
+    def __add__(self, other):
+        if not isinstance(other, Polynomial):
+            other = Polynomial([other])
+        p, q = self.coeffs, other.coeffs
+        if len(p) < len(q):
+            p, q = q, p
+        result = array('d', p)
+        offset = len(p) - len(q)
+        for i, coeff in enumerate(q):
+            result[offset + i] += coeff
+        return Polynomial(result)
+    
+    __radd__ = __add__
+    
+    def __neg__(self):
+        return Polynomial([-coeff for coeff in self.coeffs])
+    
+    def __sub__(self, other):
+        return self + (-other)
+    
+    def __rsub__(self, other):
+        return (-self) + other
+    
+    def __mul__(self, other):
+        if not isinstance(other, Polynomial):
+            return Polynomial([coeff * other for coeff in self.coeffs])
+        p, q = self.coeffs.tolist(), other.coeffs.tolist()
+        if min(len(p), len(q)) <= KARATSUBA_THRESHOLD:
+            return Polynomial(_schoolbook_multiply(p, q))
+        # Karatsuba needs equal lengths; zero padding is cut off again afterwards
+        n = max(len(p), len(q))
+        product = _karatsuba_multiply(p + [0.0] * (n - len(p)), q + [0.0] * (n - len(q)))
+        return Polynomial(product[:len(p) + len(q) - 1])
+    
+    __rmul__ = __mul__
+    
+    def __eq__(self, other):
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        return self.coeffs == other.coeffs
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"Polynomial({self.coeffs.tolist()})"
+    
+    def __str__(self):
+        return polynomial_to_string(self.coeffs)
 
 # Function to calculate the formula f(x)
+@instrument()
 def calculate_fx(a, b, c, d, x):
     """
     Calculate the value of a cubic polynomial: a*x^3 + b*x^2 + c*x + d
@@ -15,43 +321,71 @@ def calculate_fx(a, b, c, d, x):
     Returns:
         float: Result of the polynomial evaluation
     """
-    return a * x**3 + b * x**2 + c * x + d
+    # Horner form of Polynomial((a, b, c, d))(x), inlined because this is the per-call hot path
+    return ((a * x + b) * x + c) * x + d
+
+def compile_fx(a, b, c, d, derivative=False):
+    """
+    Build a function specialized to the cubic a*x^3 + b*x^2 + c*x + d (see Polynomial.compile)
+    
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        derivative (bool): Return (f(x), f'(x)) instead of f(x)
+        
+    Returns:
+        function: Specialized evaluator with a batch(xs, out=None) attribute
+    """
+    return Polynomial((a, b, c, d)).compile(derivative)
+
+# Function to evaluate the formula f(x) for many values of x at once
+def calculate_fx_batch(a, b, c, d, xs, out=None):
+    """
+    Evaluate a cubic polynomial at many points using Horner's scheme: ((a*x + b)*x + c)*x + d
+    
+    Uses NumPy when it is installed and falls back to a pure-Python loop over
+    an array('d') buffer otherwise.
+    
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        xs (iterable): Input values (list, array('d'), memoryview, bytes of float64, NumPy array or any iterable)
+        out (buffer, optional): Preallocated output buffer (or list) of the same length as xs
+        
+    Returns:
+        numpy.ndarray or array: Results in one contiguous buffer (out itself when given)
+    """
+    return _horner_batch((a, b, c, d), xs, out)
 
 # Function to find the roots of a cubic equation using the Newton-Raphson method
-def newton_raphson(a, b, c, d, x0, tol=1e-6, max_iter=1000):
+@instrument(failure=lambda root: "not_converged" if root is None else None)
+def newton_raphson(a, b, c, d, x0, tol=1e-12, max_iter=1000, method="newton"):
     """
     Find a root of the cubic polynomial a*x^3 + b*x^2 + c*x + d using Newton-Raphson method
     
+    Thin wrapper over roots.iterate_root, which evaluates f, f' and f'' in one
+    pass and can also take Halley or Laguerre steps.
+    
     Args:
         a (float): Coefficient of x^3
         b (float): Coefficient of x^2
         c (float): Coefficient of x
         d (float): Constant term
         x0 (float): Initial guess for the root
-        tol (float): Tolerance for convergence
+        tol (float): Tolerance for convergence, relative to the size of the polynomial's terms at x
         max_iter (int): Maximum number of iterations
+        method (str): "newton", "halley" or "laguerre"
         
     Returns:
         float or None: Approximated root if found, None otherwise
     """
-    def f(x):
-        return a * x**3 + b * x**2 + c * x + d
-    
-    def f_prime(x):
-        return 3 * a * x**2 + 2 * b * x + c
-    
-    x = x0
-    for _ in range(max_iter):
-        fx = f(x)
-        if abs(fx) < tol:
-            return x
-        fpx = f_prime(x)
-        if fpx == 0:
-            break
-        x = x - fx / fpx
-    return None
+    return iterate_root((a, b, c, d), x0, method, tol, max_iter=max_iter)[0]
 
-def calculate_and_display_result(a, b, c, d, x):
+def calculate_and_display_result(a, b, c, d, x, renderer=None):
     """
     Calculate and display the result of evaluating the polynomial
     
@@ -61,6 +395,9 @@ def calculate_and_display_result(a, b, c, d, x):
         c (float): Coefficient of x
         d (float): Constant term
         x (float): Input value
+        renderer (ReportRenderer, optional): Collects the report instead of writing
+                                             it at once, e.g. to buffer many
+                                             evaluations or choose the verbosity
         
     Returns:
         float: Result of the calculation
@@ -68,25 +405,30 @@ def calculate_and_display_result(a, b, c, d, x):
     # Calculate the formula f(x)
     f_x = calculate_fx(a, b, c, d, x)
     
-    # Display the complete formula
-    print(f"The formula is: f(x) = {format_number(a)}x^3 + {format_number(b)}x^2 + {format_number(c)}x + {format_number(d)}")
-    
-    # Explain the calculation step by step
-    print("**************************")
-    print(f"{format_number(a)} * ({format_number(x)}^3) = {format_number(a * x**3)}")
-    print(f"+ {format_number(b)} * ({format_number(x)}^2) = {format_number(b * x**2)}")
-    print(f"+ {format_number(c)} * {format_number(x)} = {format_number(c * x)}")
-    print(f"+ {format_number(d)} = {format_number(d)}")
-    print(" ")
-    
-    # Show the result of the calculation
-    print(f"The value of f(x) is: {format_number(f_x)}")
+    # Display the formula, the step-by-step breakdown and the result in one write
+    if renderer is None:
+        with default_renderer() as renderer:
+            return renderer.add(a, b, c, d, x, f_x)
+    return renderer.add(a, b, c, d, x, f_x)
+
+def default_renderer(out=None, verbosity=STEPS, fmt="text"):
+    """
+    Report renderer with the layout of calculate_and_display_result
     
-    return f_x
+    Args:
+        out (file, optional): Text file object to write to (default: sys.stdout)
+        verbosity (int or str): QUIET, RESULT or STEPS
+        fmt (str): "text" or "jsonl"
+        
+    Returns:
+        ReportRenderer: The renderer
+    """
+    return ReportRenderer(out, verbosity, fmt, step_header="**************************", step_footer=" ")
 
+@instrument(failure=lambda root: "no_real_roots" if root is None else None)
 def find_root(a, b, c, d):
     """
-    Find a root of the cubic polynomial
+    Find the real roots of the cubic polynomial
     
     Args:
         a (float): Coefficient of x^3
@@ -95,23 +437,25 @@ def find_root(a, b, c, d):
         d (float): Constant term
         
     Returns:
-        float or None: Found root or None if not found
+        float or None: The smallest real root, or None if there is none
     """
-    # Try to find a root of the cubic equation
-    x0 = 0  # Initial point for the Newton-Raphson method
-    root = newton_raphson(a, b, c, d, x0)
+    # Find every real root using root bounds and Sturm isolation instead of a fixed starting point
+    roots = find_real_roots([a, b, c, d])
     
-    if root is not None:
-        print(f"The value of X that makes f(x) = 0 is: {format_number(root)}")
+    if roots:
+        if len(roots) == 1:
+            print(f"The value of X that makes f(x) = 0 is: {format_number(roots[0])}")
+        else:
+            print(f"The values of X that make f(x) = 0 are: {', '.join(format_number(root) for root in roots)}")
         
-        # Verify the result
-        fx_at_root = calculate_fx(a, b, c, d, root)
-        print(f"Verification: f({format_number(root)}) = {format_number(fx_at_root)}")
+        # Verify the results
+        for root in roots:
+            fx_at_root = calculate_fx(a, b, c, d, root)
+            print(f"Verification: f({format_number(root)}) = {format_number(fx_at_root)}")
     else:
-        print("It was not possible to find a root with the starting point x=0.")
-        print("Try again with a different starting value or use a different method.")
+        print("The polynomial has no real roots.")
     
-    return root
+    return roots[0] if roots else None
 
 def main():
     """
@@ -133,15 +477,33 @@ def main():
     coeffs = [a, b, c, d]
     print(f"Your polynomial: f(x) = {polynomial_to_string(coeffs)}")
     
-    x_input = validate_input("Enter the value of X (or ? to find the value that zeros): ", 
-                            lambda x: x == '?' or float_validator(x),
-                            "Please enter a number or ? for root finding")
+    x_input = validate_input("Enter the value of X (or ? to find the value that zeros, t for a table): ", 
+                            lambda x: x in ('?', 't') or float_validator(x),
+                            "Please enter a number, ? for root finding or t for a table")
 
     if x_input == '?':
         find_root(a, b, c, d)
+    elif x_input == 't':
+        # Imported here because table itself imports this module
+        import sys
+        from table import tabulate, write_table
+        x_min = float(validate_input("Table start: ", float_validator, "Please enter a valid number"))
+        x_max = float(validate_input("Table end: ", lambda x: float_validator(x) and float(x) > x_min,
+                                     "Please enter a number larger than the start"))
+        write_table(sys.stdout, tabulate(coeffs, x_min, x_max, adaptive=True))
     else:
         x = float(x_input)
         calculate_and_display_result(a, b, c, d, x)
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+    # Imported here because stream itself imports this module
+    from stream import add_arguments, run_batch
+    
+    parser = argparse.ArgumentParser(description="Cubic Polynomial Calculator")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.batch is not None:
+        sys.exit(run_batch(args))
     main()
\ No newline at end of file
@@ -0,0 +1,535 @@
+import math
+from fractions import Fraction
+
+from roots import find_all_roots, solve_cubic, solve_cubic_batch, STATUS_INVALID
+from utils import optional_import
+
+# Largest certified relative error |root - true root| / |root| accepted by a tier
+DEFAULT_TOLERANCE = 1e-10
+# Working precisions (decimal digits) tried in turn by the mpmath tier
+MP_PRECISIONS = (32, 64, 128)
+# Newton steps with exact residuals tried per root by the exact tier
+EXACT_STEPS = 8
+
+# Tiers in escalation order; rows no tier can certify are counted as UNVERIFIED
+TIER_FLOAT = "float64"
+TIER_EXACT = "exact"
+TIER_MPMATH = "mpmath"
+UNVERIFIED = "unverified"
+TIERS = (TIER_FLOAT, TIER_EXACT, TIER_MPMATH, UNVERIFIED)
+
+# Unit roundoff of IEEE double precision and Veltkamp's splitting constant 2^27 + 1
+_EPSILON = 2.0 ** -53
+_SPLITTER = 134217729.0
+
+def _gamma(k):
+    """
+    The usual rounding error factor k*u / (1 - k*u) of k floating-point operations.
+    """
+    return k * _EPSILON / (1 - k * _EPSILON)
+
+def _two_sum(a, b):
+    """
+    Knuth's TwoSum: s + e == a + b exactly, with s = fl(a + b).
+    """
+    s = a + b
+    z = s - a
+    return s, (a - (s - z)) + (b - z)
+
+def _two_product(a, b):
+    """
+    Dekker's TwoProduct: p + e == a * b exactly, with p = fl(a * b).
+    """
+    p = a * b
+    c = _SPLITTER * a
+    a_hi = c - (c - a)
+    a_lo = a - a_hi
+    c = _SPLITTER * b
+    b_hi = c - (c - b)
+    b_lo = b - b_hi
+    return p, a_lo * b_lo - (((p - a_hi * b_hi) - a_lo * b_hi) - a_hi * b_lo)
+
+def compensated_horner(coeffs, x):
+    """
+    Evaluate a polynomial at a real point with the compensated Horner scheme.
+
+    The rounding error of every Horner step is captured with error-free
+    transformations and added back at the end, so the result is as accurate
+    as if it were computed in twice the working precision. The returned bound
+    is the a posteriori bound of Langlois and Louvet:
+    |value - p(x)| <= (u|value| + (gamma(4n+2) * e + 2u^2|value|)) / (1 - 2(n+1)u),
+    where e is the Horner evaluation of the absolute error terms at |x|.
+
+    Args:
+        coeffs (list): Coefficients as floats, highest degree first
+        x (float): Point to evaluate at
+
+    Returns:
+        tuple: (value, bound) with |value - p(x)| <= bound (inf if an
+               intermediate result overflowed)
+    """
+    n = len(coeffs) - 1
+    s = coeffs[0]
+    correction = 0.0
+    errors = 0.0
+    r = abs(x)
+    for coeff in coeffs[1:]:
+        product, pi = _two_product(s, x)
+        s, sigma = _two_sum(product, coeff)
+        correction = correction * x + (pi + sigma)
+        errors = errors * r + (abs(pi) + abs(sigma))
+    value = s + correction
+    if not (math.isfinite(value) and math.isfinite(errors)):
+        return value, float('inf')
+    size = abs(value)
+    bound = (_EPSILON * size + (_gamma(4 * n + 2) * errors + 2 * _EPSILON ** 2 * size)) / (1 - 2 * (n + 1) * _EPSILON)
+    return value, bound
+
+def _residual_bound(p, z):
+    """
+    Upper bound of |p(z)| for a float polynomial: compensated Horner on the real
+    axis, plain complex Horner with its a priori rounding bound elsewhere.
+    """
+    if not isinstance(z, complex) or z.imag == 0:
+        value, bound = compensated_horner(p, z.real if isinstance(z, complex) else z)
+        return abs(value) + bound
+    n = len(p) - 1
+    value = 0j
+    size = 0.0
+    r = abs(z)
+    for coeff in p:
+        value = value * z + coeff
+        size = size * r + abs(coeff)
+    return (abs(value) + _gamma(4 * n + 2) * size) / (1 - 2 * (n + 1) * _EPSILON)
+
+def _inclusion_radii(lead, roots, residuals, padding):
+    """
+    Weierstrass radii n|W_i|, W_i = p(z_i) / (a_n * prod(z_i - z_j)), from upper
+    bounds of |p(z_i)|, widened by a relative padding for the rounding of the product.
+    """
+    n = len(roots)
+    radii = []
+    for i, z in enumerate(roots):
+        denominator = abs(lead)
+        for j, other in enumerate(roots):
+            if j != i:
+                denominator *= abs(z - other)
+        radii.append(n * residuals[i] / denominator * (1 + padding) if denominator else float('inf'))
+    return radii
+
+def _certified_errors(roots, radii):
+    """
+    Error bound of every root from its inclusion disc.
+
+    Each connected group of k overlapping discs contains exactly k roots, so a
+    true root lies within max(|z_i - z_j| + r_j) over the group of z_i. This
+    certifies clusters of nearly equal roots as well as isolated ones.
+    """
+    n = len(roots)
+    group = list(range(n))
+
+    def find(i):
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            if abs(roots[i] - roots[j]) <= radii[i] + radii[j]:
+                group[find(i)] = find(j)
+    members = {}
+    for i in range(n):
+        members.setdefault(find(i), []).append(i)
+    errors = []
+    for i in range(n):
+        errors.append(max(abs(roots[i] - roots[j]) + radii[j] for j in members[find(i)]))
+    return errors
+
+def _accepted(roots, errors, tol):
+    """
+    Whether every root is certified to the relative tolerance.
+    """
+    return all(error <= tol * abs(root) for root, error in zip(roots, errors))
+
+def _fraction(value):
+    """
+    Exact Fraction of a float or an mpmath mpf.
+    """
+    if isinstance(value, (int, float)):
+        return Fraction(value)
+    # man_exp holds the magnitude only; the sign is applied separately
+    mantissa, exponent = value.man_exp
+    magnitude = Fraction(mantissa) * Fraction(2) ** exponent
+    return -magnitude if value < 0 else magnitude
+
+def _exact_value(p, z):
+    """
+    Exact value of a polynomial with Fraction coefficients at a float, complex or
+    mpmath point, as a (real, imaginary) pair of Fractions.
+    """
+    if hasattr(z, "imag") and z.imag != 0:
+        zr, zi = _fraction(z.real), _fraction(z.imag)
+        vr = vi = Fraction(0)
+        for coeff in p:
+            vr, vi = vr * zr - vi * zi + coeff, vr * zi + vi * zr
+        return vr, vi
+    x = _fraction(z.real if hasattr(z, "imag") else z)
+    value = Fraction(0)
+    for coeff in p:
+        value = value * x + coeff
+    return value, Fraction(0)
+
+def _exact_residual(p, z):
+    """
+    Upper bound of |p(z)| from its exact value (only the final conversion to float rounds).
+    """
+    vr, vi = _exact_value(p, z)
+    size = math.hypot(float(vr), float(vi)) * (1 + 4 * _EPSILON)
+    # A non-zero residual that underflows must not certify the root as exact
+    return size if size or not (vr or vi) else 5e-324
+
+def _exact_derivative(p, order):
+    """
+    The derivative of the given order of a Fraction polynomial.
+    """
+    for _ in range(order):
+        n = len(p) - 1
+        p = [coeff * (n - i) for i, coeff in enumerate(p[:-1])]
+    return p
+
+def _exact_refine(p, z):
+    """
+    Newton steps whose residual is computed exactly, so the iteration keeps
+    improving a simple root until it no longer changes in floating point.
+    """
+    derivative = [float(coeff) for coeff in _exact_derivative(p, 1)]
+    for _ in range(EXACT_STEPS):
+        vr, vi = _exact_value(p, z)
+        if not vr and not vi:
+            break
+        slope = 0j
+        for coeff in derivative:
+            slope = slope * z + coeff
+        if slope == 0:
+            break
+        step = complex(float(vr), float(vi)) / slope
+        candidate = z - (step.real if not isinstance(z, complex) else step)
+        if candidate == z:
+            break
+        z = candidate
+    return z
+
+def _deflate(p, z):
+    """
+    Divide a Fraction polynomial exactly by (x - z), or by (x - z)(x - conj(z)) for non-real z.
+    """
+    if isinstance(z, complex) and z.imag != 0:
+        s = 2 * Fraction(z.real)
+        t = Fraction(z.real) ** 2 + Fraction(z.imag) ** 2
+        quotient = []
+        r1 = r2 = Fraction(0)
+        for coeff in p[:-2]:
+            q = coeff + r1
+            quotient.append(q)
+            r1, r2 = r2 + s * q, -t * q
+        return quotient
+    x = Fraction(z.real if isinstance(z, complex) else z)
+    quotient = [p[0]]
+    for coeff in p[1:-1]:
+        quotient.append(quotient[-1] * x + coeff)
+    return quotient
+
+def _exact_tier(p, roots, tol):
+    """
+    Re-check float roots with exact rational residuals.
+
+    Roots are first refined by Newton steps with exact residuals; k equal
+    approximations are refined as a root of the (k-1)th derivative, where a
+    k-fold root is simple. Roots that
+    are exact (residual exactly zero, with repeated roots found again after
+    deflation) are split off by exact division; the rest are certified with
+    inclusion discs computed from their exact residuals on the deflated polynomial.
+
+    Returns:
+        tuple: (roots, errors), or None if the roots cannot be certified
+    """
+    exact = [Fraction(coeff) for coeff in p]
+    pending = []
+    for z in sorted(set(roots), key=lambda z: (z.real, z.imag)):
+        count = roots.count(z)
+        pending += [_exact_refine(_exact_derivative(exact, count - 1), z)] * count
+    found = []
+    progress = True
+    while progress and pending:
+        progress = False
+        for i, z in enumerate(pending):
+            vr, vi = _exact_value(exact, z)
+            if vr or vi:
+                continue
+            exact = _deflate(exact, z)
+            del pending[i]
+            found.append(z)
+            if isinstance(z, complex) and z.imag != 0:
+                # The conjugate is a root too; drop its approximation
+                partner = min(range(len(pending)), key=lambda k: abs(pending[k] - z.conjugate()), default=None)
+                if partner is None:
+                    return None
+                del pending[partner]
+                found.append(z.conjugate())
+            progress = True
+            break
+    errors = [0.0] * len(found)
+    if pending:
+        residuals = [_exact_residual(exact, z) for z in pending]
+        radii = _inclusion_radii(float(exact[0]), pending, residuals, _gamma(4 * len(pending)))
+        pending_errors = _certified_errors(pending, radii)
+        if not _accepted(pending, pending_errors, tol):
+            return None
+        found += pending
+        errors += pending_errors
+    return found, errors
+
+def _mpmath_tier(mp, p, start, tol):
+    """
+    Refine the float roots by Weierstrass (Durand-Kerner) sweeps in mpmath at
+    increasing working precision until the inclusion discs certify every root.
+    Residuals at the refined roots are computed exactly, so clusters of nearly
+    equal roots, which the iteration only approaches linearly, still get tight
+    discs once the precision is high enough.
+
+    Returns:
+        tuple: (roots, errors), or None if no precision was enough
+    """
+    n = len(p) - 1
+    exact = [Fraction(coeff) for coeff in p]
+    for dps in MP_PRECISIONS:
+        with mp.workdps(dps):
+            lead = mp.mpf(p[0])
+            # Equal starting values would divide by zero, so every start is nudged apart
+            roots = [mp.mpc(z) + mp.mpf(2) ** -30 * (1 + abs(z)) * mp.mpc(0.4, 0.9) ** i
+                     for i, z in enumerate(start)]
+            for _ in range(4 * dps):
+                largest = 0
+                for i in range(n):
+                    denominator = lead
+                    for j in range(n):
+                        if j != i:
+                            denominator *= roots[i] - roots[j]
+                    if not denominator:
+                        continue
+                    step = mp.polyval(p, roots[i]) / denominator
+                    roots[i] -= step
+                    largest = max(largest, abs(step) / (abs(roots[i]) or 1))
+                if largest <= mp.eps:
+                    break
+            residuals = []
+            for z in roots:
+                vr, vi = _exact_value(exact, z)
+                residuals.append(abs(mp.mpc(mp.mpf(vr.numerator) / vr.denominator, mp.mpf(vi.numerator) / vi.denominator)))
+            radii = _inclusion_radii(lead, roots, residuals, 4 * n * mp.eps)
+            errors = _certified_errors(roots, radii)
+            if not _accepted(roots, errors, tol):
+                continue
+            # Rounding the roots to floats adds at most half an ulp each
+            values = [complex(z) for z in roots]
+            return values, [float(error) + _EPSILON * abs(z) for z, error in zip(values, errors)]
+    return None
+
+def _present(roots, errors):
+    """
+    Roots within their error bound of the real axis become floats; real roots come
+    first in ascending order, then complex ones by real part.
+    """
+    pairs = []
+    for root, error in zip(roots, errors):
+        if isinstance(root, complex) and abs(root.imag) <= error:
+            root = root.real
+        pairs.append((root, error))
+    pairs.sort(key=lambda pair: (isinstance(pair[0], complex), pair[0].real, -pair[0].imag))
+    return [root for root, _ in pairs], [error for _, error in pairs]
+
+def _prepare(coeffs):
+    """
+    Trim leading zeros, scale by a power of two (exactly) and split off zero roots.
+
+    Returns:
+        tuple: (polynomial without zero roots, number of zero roots)
+    """
+    p = [float(coeff) for coeff in coeffs]
+    if not all(math.isfinite(coeff) for coeff in p):
+        raise ValueError("Coefficients must be finite")
+    while p and p[0] == 0:
+        p.pop(0)
+    zeros = 0
+    while len(p) > 1 and p[-1] == 0:
+        p.pop()
+        zeros += 1
+    if p:
+        exponent = math.frexp(max(abs(coeff) for coeff in p))[1]
+        scaled = [math.ldexp(coeff, -exponent) for coeff in p]
+        if all(math.ldexp(coeff, exponent) == original for coeff, original in zip(scaled, p)):
+            p = scaled
+    return p, zeros
+
+def _float_roots(p):
+    """
+    Float64 roots: the closed-form solvers up to cubics, Aberth iteration above.
+    """
+    if len(p) <= 4:
+        return solve_cubic(*([0.0] * (4 - len(p)) + p))
+    return find_all_roots(p)[0]
+
+class AdaptiveSolver:
+    """
+    Root solver that pays for extra precision only when float64 is not good enough.
+
+    Every polynomial is solved in float64 first and its roots are checked with
+    a rigorous error bound: compensated Horner residuals (exact rational ones
+    in the second tier) feed Weierstrass inclusion discs, which bound the
+    distance of every root to a true root. Only rows whose bound exceeds the
+    relative tolerance are escalated, first to exact rational residuals and
+    Newton refinement with fractions, then to mpmath at increasing precision
+    when it is installed. The counts attribute records which tier certified
+    each row.
+    """
+
+    def __init__(self, tol=DEFAULT_TOLERANCE, use_mpmath=True):
+        """
+        Args:
+            tol (float): Largest certified relative error of a root
+            use_mpmath (bool): Use mpmath as the last tier if it is installed
+        """
+        self.tol = tol
+        self.mpmath = optional_import("mpmath") if use_mpmath else None
+        self.counts = dict.fromkeys(TIERS, 0)
+
+    def _escalate(self, p, roots, errors):
+        """
+        Certify float roots or solve again in higher precision.
+
+        Returns:
+            tuple: (roots, errors, tier)
+        """
+        if errors is not None and _accepted(roots, errors, self.tol):
+            return roots, errors, TIER_FLOAT
+        result = _exact_tier(p, roots, self.tol)
+        if result is not None:
+            return result[0], result[1], TIER_EXACT
+        if self.mpmath is not None:
+            result = _mpmath_tier(self.mpmath, p, roots, self.tol)
+            if result is not None:
+                return result[0], result[1], TIER_MPMATH
+        return roots, errors or [float('inf')] * len(roots), UNVERIFIED
+
+    def _solve_prepared(self, p, zeros, roots=None):
+        """
+        Solve a prepared polynomial, optionally starting from float roots computed elsewhere.
+        """
+        errors = None
+        if len(p) > 1:
+            roots = _float_roots(p) if roots is None else roots
+            residuals = [_residual_bound(p, z) for z in roots]
+            radii = _inclusion_radii(p[0], roots, residuals, _gamma(4 * len(roots)))
+            errors = _certified_errors(roots, radii)
+            roots, errors, tier = self._escalate(p, roots, errors)
+        else:
+            roots, errors, tier = [], [], TIER_FLOAT
+        self.counts[tier] += 1
+        roots, errors = _present(roots + [0.0] * zeros, errors + [0.0] * zeros)
+        return roots, errors, tier
+
+    def solve(self, coeffs):
+        """
+        Find all roots of a polynomial with certified accuracy.
+
+        Args:
+            coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+
+        Returns:
+            tuple: (roots, errors, tier) where roots lists real roots as floats
+                   (ascending) and then complex ones, errors are the matching
+                   certified bounds of |root - true root| (inf when unverified)
+                   and tier names the tier that certified them
+
+        Raises:
+            ValueError: If a coefficient is not finite
+        """
+        p, zeros = _prepare(coeffs)
+        return self._solve_prepared(p, zeros)
+
+    def solve_batch(self, rows):
+        """
+        Solve many polynomials, escalating only the rows that fail the float64 check.
+
+        Cubic rows get their float64 roots from one solve_cubic_batch call.
+
+        Args:
+            rows (list): Coefficient lists, highest degree first
+
+        Returns:
+            tuple: (roots, errors, tiers) lists with one entry per row, as returned by solve
+
+        Raises:
+            ValueError: If a row has a coefficient that is not finite
+        """
+        rows = [[float(coeff) for coeff in row] for row in rows]
+        starts = [None] * len(rows)
+        cubic = [i for i, row in enumerate(rows) if len(row) == 4]
+        if cubic:
+            batch_roots, real_mask, status = solve_cubic_batch([rows[i] for i in cubic])
+            for i, found, mask, code in zip(cubic, batch_roots, real_mask, status):
+                if code == STATUS_INVALID:
+                    raise ValueError(f"row {i}: coefficients must be finite")
+                starts[i] = [complex(z).real if real else complex(z) for z, real in zip(found, mask)
+                             if not math.isnan(complex(z).real)]
+
+        all_roots, all_errors, tiers = [], [], []
+        for i, row in enumerate(rows):
+            try:
+                p, zeros = _prepare(row)
+            except ValueError:
+                raise ValueError(f"row {i}: coefficients must be finite")
+            # Batch roots are only reused when no zero roots or leading zeros were split off
+            start = starts[i] if zeros == 0 and starts[i] is not None and len(starts[i]) == len(p) - 1 else None
+            roots, errors, tier = self._solve_prepared(p, zeros, start)
+            all_roots.append(roots)
+            all_errors.append(errors)
+            tiers.append(tier)
+        return all_roots, all_errors, tiers
+
+    def stats(self):
+        """
+        Summary of the tier counters.
+
+        Returns:
+            dict: Rows solved, rows certified by each tier (and UNVERIFIED ones),
+                  rows escalated past float64 and the escalation rate
+        """
+        rows = sum(self.counts.values())
+        escalated = rows - self.counts[TIER_FLOAT]
+        return dict(self.counts, rows=rows, escalated=escalated, escalation_rate=escalated / rows if rows else 0.0)
+
+    def reset(self):
+        """
+        Zero the tier counters.
+        """
+        self.counts = dict.fromkeys(TIERS, 0)
+
+_default_solver = None
+
+def solve_adaptive(coeffs, tol=DEFAULT_TOLERANCE):
+    """
+    Find all roots of a polynomial with certified accuracy, using one shared AdaptiveSolver per tolerance.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        tol (float): Largest certified relative error of a root
+
+    Returns:
+        tuple: (roots, errors, tier) as returned by AdaptiveSolver.solve
+    """
+    global _default_solver
+    if _default_solver is None or _default_solver.tol != tol:
+        _default_solver = AdaptiveSolver(tol)
+    return _default_solver.solve(coeffs)
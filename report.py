@@ -0,0 +1,127 @@
+import json
+import sys
+
+from utils import format_number
+
+# Verbosity levels of a ReportRenderer
+QUIET = 0      # Nothing is written; callers only use the returned values
+RESULT = 1     # One line per evaluation with f(x)
+STEPS = 2      # The formula, every term of the step-by-step breakdown and f(x)
+VERBOSITY = {"quiet": QUIET, "result": RESULT, "steps": STEPS}
+
+FORMATS = ("text", "jsonl")
+
+# Evaluations collected before the buffered lines are written out
+DEFAULT_BUFFER_SIZE = 256
+
+class ReportRenderer:
+    """
+    Collects evaluation reports and writes them to a file in buffered chunks.
+
+    Computing f(x) is left to the caller; the renderer only turns finished
+    evaluations into text (or JSON lines, which skip number formatting
+    altogether) and writes DEFAULT_BUFFER_SIZE of them with one write call.
+    Use it as a context manager, or call flush(), so the last chunk is written.
+    """
+
+    def __init__(self, out=None, verbosity=STEPS, fmt="text", dp=4, buffer_size=DEFAULT_BUFFER_SIZE,
+                 step_header="Calculating step by step:", step_footer=None):
+        """
+        Args:
+            out (file, optional): Text file object to write to (default: sys.stdout at write time)
+            verbosity (int or str): QUIET, RESULT or STEPS (or "quiet", "result", "steps")
+            fmt (str): "text" for human-readable lines or "jsonl" for one JSON object per evaluation
+            dp (int): Decimal places of text output
+            buffer_size (int): Evaluations collected before a write
+            step_header (str, optional): Text line written before the step-by-step terms
+            step_footer (str, optional): Text line written after the step-by-step terms
+        """
+        if isinstance(verbosity, str):
+            if verbosity not in VERBOSITY:
+                raise ValueError(f"Unknown verbosity {verbosity!r}, expected one of {', '.join(VERBOSITY)}")
+            verbosity = VERBOSITY[verbosity]
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+        self.out = out
+        self.verbosity = verbosity
+        self.fmt = fmt
+        self.dp = dp
+        self.buffer_size = buffer_size
+        self.step_header = step_header
+        self.step_footer = step_footer
+        self.count = 0
+        self._lines = []
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def _text(self, a, b, c, d, x, fx):
+        """
+        Human-readable lines for one evaluation.
+        """
+        if self.verbosity == RESULT:
+            return [f"f({format_number(x, self.dp)}) = {format_number(fx, self.dp)}\n"]
+        fa, fb, fc, fd, fx_text, result = (format_number(value, self.dp) for value in (a, b, c, d, x, fx))
+        lines = [f"The formula is: f(x) = {fa}x^3 + {fb}x^2 + {fc}x + {fd}\n"]
+        if self.step_header is not None:
+            lines.append(self.step_header + "\n")
+        lines += [
+            f"{fa} * ({fx_text}^3) = {format_number(a * x**3, self.dp)}\n",
+            f"+ {fb} * ({fx_text}^2) = {format_number(b * x**2, self.dp)}\n",
+            f"+ {fc} * {fx_text} = {format_number(c * x, self.dp)}\n",
+            f"+ {fd} = {fd}\n",
+        ]
+        if self.step_footer is not None:
+            lines.append(self.step_footer + "\n")
+        lines.append(f"The value of f(x) is: {result}\n")
+        return lines
+
+    def _json(self, a, b, c, d, x, fx):
+        """
+        One JSON line for one evaluation, with unformatted numbers.
+        """
+        record = {"a": a, "b": b, "c": c, "d": d, "x": x, "fx": fx}
+        if self.verbosity == STEPS:
+            record["terms"] = [a * x**3, b * x**2, c * x, d]
+        return [json.dumps(record) + "\n"]
+
+    def add(self, a, b, c, d, x, fx):
+        """
+        Report one evaluation of f(x) = ax^3 + bx^2 + cx + d.
+
+        Args:
+            a (float): Coefficient of x^3
+            b (float): Coefficient of x^2
+            c (float): Coefficient of x
+            d (float): Constant term
+            x (float): The x value
+            fx (float): The computed f(x)
+
+        Returns:
+            float: fx, so calls can be chained into computations
+        """
+        self.count += 1
+        if self.verbosity == QUIET:
+            return fx
+        if self.fmt == "jsonl":
+            self._lines += self._json(a, b, c, d, x, fx)
+        else:
+            self._lines += self._text(a, b, c, d, x, fx)
+        self._pending += 1
+        if self._pending >= self.buffer_size:
+            self.flush()
+        return fx
+
+    def flush(self):
+        """
+        Write every collected line with a single write call.
+        """
+        if self._lines:
+            out = self.out if self.out is not None else sys.stdout
+            out.write("".join(self._lines))
+            self._lines = []
+        self._pending = 0
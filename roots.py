@@ -0,0 +1,1137 @@
+import cmath
+import math
+from fractions import Fraction
+
+from metrics import instrument
+from utils import optional_import
+
+# Relative tolerance under which a discriminant is treated as exactly zero,
+# so repeated roots come back as repeated values instead of a tiny complex pair.
+DISCRIMINANT_TOL = 1e-12
+
+# Rounding error of the cubic discriminant q^2/4 + p^3/27 relative to its two
+# terms (a few ulps): only a discriminant this close to zero means a double root
+DISCRIMINANT_ULPS = 4 * 2.0 ** -52
+
+# Relative size (against the magnitudes that went into them) under which every
+# coefficient of a Sturm remainder is negligible, making the previous element a
+# candidate GCD; the candidate is only used if p and p' divided by it leave
+# residuals just as small. A complex pair x +- yi leaves a remainder of order
+# y^2, so only pairs narrower than about 1e-6 (relative) pass for a double root
+GCD_TOL = 1e-12
+
+# Relative size (against the magnitudes that went into it) under which a float
+# Sturm remainder coefficient has cancelled too far for its sign to be trusted
+_SIGN_TOL = 1e-6
+
+# Newton steps that refine the first root of a cubic before it is deflated
+DEFLATION_STEPS = 3
+# Relative distance to the nearest other root under which a root counts as
+# nearly repeated and is not used for deflation if a better separated one exists
+SEPARATION_TOL = 1e-3
+
+def _horner(a, b, c, d, x):
+    """
+    Evaluate a*x^3 + b*x^2 + c*x + d and its derivative in one Horner pass.
+    Works for both float and complex x.
+    """
+    fx = a * x + b
+    fpx = a
+    fpx = fpx * x + fx
+    fx = fx * x + c
+    fpx = fpx * x + fx
+    fx = fx * x + d
+    return fx, fpx
+
+def _polish(a, b, c, d, root):
+    """
+    Apply one Newton step to a root, keeping it only if the residual improves.
+    """
+    fx, fpx = _horner(a, b, c, d, root)
+    if fx == 0 or fpx == 0:
+        return root
+    candidate = root - fx / fpx
+    if isinstance(root, complex):
+        # Snap roots that Newton pushed onto the real axis
+        if candidate.imag == 0:
+            candidate = candidate.real
+    if abs(_horner(a, b, c, d, candidate)[0]) < abs(fx):
+        return candidate
+    return root
+
+def _sort_roots(roots):
+    """
+    Order roots with the real ones first (ascending), then complex ones by real part.
+    """
+    real = sorted(r for r in roots if not isinstance(r, complex))
+    cplx = sorted((r for r in roots if isinstance(r, complex)), key=lambda z: (z.real, -z.imag))
+    return real + cplx
+
+def solve_linear(c, d):
+    """
+    Solve c*x + d = 0
+
+    Args:
+        c (float): Coefficient of x
+        d (float): Constant term
+
+    Returns:
+        list: The single root, or an empty list when c is zero
+    """
+    if c == 0:
+        return []
+    return [-d / c]
+
+def solve_quadratic(b, c, d):
+    """
+    Solve b*x^2 + c*x + d = 0 with the cancellation-free quadratic formula
+
+    Args:
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+
+    Returns:
+        list: Real roots as floats (ascending) or a complex conjugate pair
+    """
+    if b == 0:
+        return solve_linear(c, d)
+
+    disc = c * c - 4 * b * d
+    if abs(disc) <= DISCRIMINANT_TOL * max(c * c, abs(4 * b * d)):
+        disc = 0.0
+
+    if disc < 0:
+        re = -c / (2 * b)
+        im = abs(math.sqrt(-disc) / (2 * b))
+        return [complex(re, im), complex(re, -im)]
+
+    q = -(c + math.copysign(math.sqrt(disc), c)) / 2
+    if q == 0:
+        # Only possible when c == 0 and d == 0: a double root at zero
+        return [0.0, 0.0]
+    return sorted([q / b, d / q])
+
+def _depressed(a, b, c, d):
+    """
+    Depressed form t^3 + p*t + q of a cubic (x = t - shift) and the tests for
+    a triple and a double root, for floats or NumPy arrays alike.
+
+    Returns:
+        tuple: (B, C, D, shift, p, q, disc, triple, double) where B, C, D are
+               the normalized coefficients and disc = q^2/4 + p^3/27
+    """
+    B, C, D = b / a, c / a, d / a
+    shift = B / 3
+    p = C - B * shift
+    q = (2 * shift * shift - C) * shift + D
+    half_q = q / 2
+    third_p = p / 3
+    cube = third_p * third_p * third_p
+    disc = half_q * half_q + cube
+    triple = ((abs(p) <= DISCRIMINANT_TOL * (abs(C) + abs(B * shift)))
+              & (abs(q) <= DISCRIMINANT_TOL * (abs(2 * shift * shift * shift) + abs(C * shift) + abs(D))))
+    # Only the rounding error of the discriminant itself counts, so close but
+    # distinct roots and narrow complex pairs are not merged into a double root
+    double = ~triple & (abs(disc) <= DISCRIMINANT_ULPS * (half_q * half_q + abs(cube)))
+    return B, C, D, shift, p, q, disc, triple, double
+
+def _deflation(B, C, D, root, backward):
+    """
+    Coefficients (beta, gamma) of x^2 + beta*x + gamma = (x^3 + Bx^2 + Cx + D) / (x - root).
+
+    Backward deflation (from the constant term) is stable when root is the
+    largest root in magnitude, forward deflation when it is the smallest.
+    """
+    if backward:
+        gamma = -D / root
+        return (gamma - C) / root, gamma
+    beta = B + root
+    return beta, C + beta * root
+
+def _first_root(estimates):
+    """
+    Index of the real root estimate to deflate by: the largest in magnitude,
+    unless it is nearly repeated and the smallest one is better separated
+    (Newton refinement of a nearly repeated root converges slowly).
+    """
+    real = sorted((i for i in range(3) if not isinstance(estimates[i], complex)), key=lambda i: abs(estimates[i]))
+
+    def separation(i):
+        gap = min(abs(estimates[i] - estimates[j]) for j in range(3) if j != i)
+        return gap / abs(estimates[i]) if estimates[i] != 0 else gap
+
+    largest, smallest = real[-1], real[0]
+    if separation(largest) < SEPARATION_TOL and separation(smallest) > separation(largest):
+        return smallest
+    return largest
+
+@instrument(failure=lambda roots: None if roots else "no_roots")
+def solve_cubic(a, b, c, d, polish=True):
+    """
+    Solve a*x^3 + b*x^2 + c*x + d = 0 numerically with closed-form formulas
+
+    A first real root is found with the trigonometric method (three real
+    roots) or Cardano's formula (one real root), taking the largest one in
+    magnitude, and refined with a few Newton steps. The cubic is then deflated
+    to a quadratic, backward when that root is the largest and forward when
+    it is the smallest, so small roots are not lost next to a huge one, and
+    the quadratic is solved with the cancellation-free formula. Each root then
+    gets one Newton polish step. When a is zero the quadratic (or linear)
+    equation is solved instead.
+
+    Args:
+        a (float): Coefficient of x^3
+        b (float): Coefficient of x^2
+        c (float): Coefficient of x
+        d (float): Constant term
+        polish (bool): Whether to refine each root with one Newton step
+
+    Returns:
+        list: All roots with multiplicity, real ones as floats (ascending)
+              followed by complex ones. Empty when the polynomial is constant.
+
+    Raises:
+        ValueError: If a coefficient is not finite or normalizing by a overflows
+    """
+    if not (math.isfinite(a) and math.isfinite(b) and math.isfinite(c) and math.isfinite(d)):
+        raise ValueError("Coefficients must be finite")
+    if a == 0:
+        return solve_quadratic(b, c, d)
+
+    if d == 0:
+        # Factor out x = 0 exactly instead of relying on cancellation
+        return _sort_roots([0.0] + solve_quadratic(a, b, c))
+
+    # Normalize and substitute x = t - B/3 to get t^3 + p*t + q = 0
+    B, C, D, shift, p, q, disc, triple, double = _depressed(a, b, c, d)
+    if not (math.isfinite(B) and math.isfinite(C) and math.isfinite(D)):
+        raise ValueError("Coefficients are too badly scaled to normalize")
+
+    if triple:
+        return [-shift, -shift, -shift]
+    if double:
+        # One simple root and one double root
+        simple = 3 * q / p
+        double_root = -3 * q / (2 * p)
+        t_roots = [simple, double_root, double_root]
+    elif disc < 0:
+        # Three distinct real roots (trigonometric method)
+        m = 2 * math.sqrt(-p / 3)
+        arg = 3 * q / (p * m)
+        theta = math.acos(max(-1.0, min(1.0, arg))) / 3
+        t_roots = [m * math.cos(theta - 2 * math.pi * k / 3) for k in range(3)]
+    else:
+        # One real root and a complex conjugate pair (Cardano)
+        u = -q / 2 - math.copysign(math.sqrt(disc), q)
+        u = math.copysign(abs(u) ** (1 / 3), u)
+        v = -p / 3 / u if u != 0 else 0.0
+        real = u + v
+        im = math.sqrt(3) / 2 * (u - v)
+        t_roots = [real, complex(-real / 2, abs(im)), complex(-real / 2, -abs(im))]
+
+    estimates = [t - shift for t in t_roots]
+    first = _first_root(estimates)
+    root = estimates[first]
+    for _ in range(DEFLATION_STEPS):
+        polished = _polish(a, b, c, d, root)
+        if polished == root:
+            break
+        root = polished
+    others = max(abs(estimates[i]) for i in range(3) if i != first)
+    beta, gamma = _deflation(B, C, D, root, root != 0 and abs(root) >= others)
+    rest = solve_quadratic(1.0, beta, gamma)
+    if polish:
+        rest = [_polish(a, b, c, d, r) for r in rest]
+    return _sort_roots([root] + rest)
+
+# Per-row status codes returned by solve_cubic_batch
+STATUS_OK = 0              # All roots found and verified by their residual
+STATUS_NOT_CONVERGED = 1   # Roots found but the residual check failed
+STATUS_DEGENERATE = 2      # Constant polynomial: no isolated roots
+STATUS_INVALID = 3         # Non-finite coefficients
+
+def _backward_error(a, b, c, d, root):
+    """
+    Residual of a root relative to the magnitude of the terms that produced it.
+    """
+    r = abs(root)
+    scale = ((abs(a) * r + abs(b)) * r + abs(c)) * r + abs(d)
+    fx = _horner(a, b, c, d, root)[0]
+    return abs(fx) / scale if scale else abs(fx)
+
+def _solve_cubic_batch_python(rows, tol):
+    """
+    Pure-Python fallback for solve_cubic_batch when NumPy is not installed.
+    """
+    nan = complex(float('nan'), float('nan'))
+    all_roots, real_mask, status = [], [], []
+    for a, b, c, d in rows:
+        a, b, c, d = float(a), float(b), float(c), float(d)
+        try:
+            found = solve_cubic(a, b, c, d)
+        except ValueError:
+            found, code = [], STATUS_INVALID
+        else:
+            if not found:
+                code = STATUS_DEGENERATE
+            elif all(_backward_error(a, b, c, d, r) <= tol for r in found):
+                code = STATUS_OK
+            else:
+                code = STATUS_NOT_CONVERGED
+        padding = 3 - len(found)
+        all_roots.append([complex(r) for r in found] + [nan] * padding)
+        real_mask.append([not isinstance(r, complex) for r in found] + [False] * padding)
+        status.append(code)
+    return all_roots, real_mask, status
+
+def _cubic_rows(a, b, c, d):
+    """
+    Vectorized solve_cubic for rows with non-zero leading and constant coefficients.
+    """
+    np = optional_import("numpy")
+    n = a.shape[0]
+    rows = np.arange(n)
+    B, C, D, shift, p, q, disc, triple, double = _depressed(a, b, c, d)
+    three = ~triple & ~double & (disc < 0)
+    one = ~(triple | double | three)
+
+    t = np.zeros((n, 3), dtype=complex)
+    real = np.ones((n, 3), dtype=bool)
+    with np.errstate(all='ignore'):
+        # One simple root and one double root
+        simple = 3 * q / p
+        dbl = -3 * q / (2 * p)
+        t[double] = np.stack([simple, dbl, dbl], axis=1)[double]
+
+        # Three distinct real roots (trigonometric method)
+        m = 2 * np.sqrt(-p / 3)
+        theta = np.arccos(np.clip(3 * q / (p * m), -1.0, 1.0)) / 3
+        k = np.arange(3) * (2 * math.pi / 3)
+        t[three] = (m[:, None] * np.cos(theta[:, None] - k))[three]
+
+        # One real root and a complex conjugate pair (Cardano)
+        u = np.cbrt(-q / 2 - np.copysign(np.sqrt(disc), q))
+        v = np.where(u != 0, -p / 3 / u, 0.0)
+        cardano = u + v
+        im = np.abs(math.sqrt(3) / 2 * (u - v))
+        pair = -cardano / 2 + 1j * im
+        t[one] = np.stack([cardano + 0j, pair, np.conj(pair)], axis=1)[one]
+    real[one, 1:] = False
+    estimates = t - shift[:, None]
+
+    # The root to deflate by, chosen as in _first_root
+    magnitude = np.abs(estimates)
+    largest = np.argmax(np.where(real, magnitude, -1.0), axis=1)
+    smallest = np.argmin(np.where(real, magnitude, np.inf), axis=1)
+    d01, d02, d12 = (np.abs(estimates[:, i] - estimates[:, j]) for i, j in ((0, 1), (0, 2), (1, 2)))
+    gap = np.column_stack([np.minimum(d01, d02), np.minimum(d01, d12), np.minimum(d02, d12)])
+    with np.errstate(all='ignore'):
+        separation = np.where(magnitude > 0, gap / magnitude, gap)
+    sep_largest, sep_smallest = separation[rows, largest], separation[rows, smallest]
+    first = np.where((sep_largest < SEPARATION_TOL) & (sep_smallest > sep_largest), smallest, largest)
+    root = estimates[rows, first].real
+
+    with np.errstate(all='ignore'):
+        # Newton steps on the rows that still improve
+        active = rows
+        for _ in range(DEFLATION_STEPS):
+            x = root[active]
+            coeffs = (a[active], b[active], c[active], d[active])
+            fx, fpx = _horner(*coeffs, x)
+            candidate = x - fx / fpx
+            better = (np.abs(_horner(*coeffs, candidate)[0]) < np.abs(fx)) & np.isfinite(candidate)
+            active = active[better]
+            if not len(active):
+                break
+            root[active] = candidate[better]
+
+        others = np.where(np.arange(3) == first[:, None], -1.0, magnitude).max(axis=1)
+        backward = (root != 0) & (np.abs(root) >= others)
+        beta_b, gamma_b = _deflation(B, C, D, root, True)
+        beta_f, gamma_f = _deflation(B, C, D, root, False)
+        beta = np.where(backward, beta_b, beta_f)
+        gamma = np.where(backward, gamma_b, gamma_f)
+    rest, rest_real = _quadratic_rows(np.ones(n), beta, gamma)
+
+    # One Newton polish step on the deflated roots, kept only where the residual improves
+    A, Bc, Cc, Dc = (col[:, None] for col in (a, b, c, d))
+    pair = rest[:, :2]
+    with np.errstate(all='ignore'):
+        fx, fpx = _horner(A, Bc, Cc, Dc, pair)
+        candidate = pair - fx / fpx
+        candidate = np.where(rest_real[:, :2], candidate.real + 0j, candidate)
+        better = np.abs(_horner(A, Bc, Cc, Dc, candidate)[0]) < np.abs(fx)
+        pair = np.where(better & np.isfinite(candidate), candidate, pair)
+    # Newton pushed onto the real axis, as _polish snaps complex roots
+    snapped = ~rest_real[:, :2] & (pair.imag == 0)
+
+    roots = np.column_stack([root + 0j, pair])
+    real_mask = np.column_stack([np.ones(n, dtype=bool), rest_real[:, :2] | snapped])
+    roots[triple] = -shift[triple, None] + 0j
+    real_mask[triple] = True
+    return roots, real_mask
+
+def _quadratic_rows(b, c, d):
+    """
+    Vectorized roots for rows with a zero cubic but non-zero quadratic coefficient.
+    """
+    np = optional_import("numpy")
+    n = b.shape[0]
+    disc = c * c - 4 * b * d
+    disc = np.where(np.abs(disc) <= DISCRIMINANT_TOL * np.maximum(c * c, np.abs(4 * b * d)), 0.0, disc)
+    roots = np.full((n, 3), complex(np.nan, np.nan))
+    real_mask = np.zeros((n, 3), dtype=bool)
+    with np.errstate(all='ignore'):
+        q = -(c + np.copysign(np.sqrt(np.abs(disc)), c)) / 2
+        r1 = q / b
+        r2 = np.where(q != 0, d / q, 0.0)
+        re = -c / (2 * b)
+        im = np.abs(np.sqrt(np.abs(disc)) / (2 * b))
+    is_real = disc >= 0
+    roots[:, 0] = np.where(is_real, np.minimum(r1, r2), re + 1j * im)
+    roots[:, 1] = np.where(is_real, np.maximum(r1, r2), re - 1j * im)
+    real_mask[:, :2] = is_real[:, None]
+    return roots, real_mask
+
+def solve_cubic_batch(coeffs, tol=1e-10):
+    """
+    Solve many cubic equations a*x^3 + b*x^2 + c*x + d = 0 at once
+
+    Every row is solved with the same algorithm as solve_cubic (closed-form
+    first root, refinement, deflation and a Newton polish of the deflated
+    roots), vectorized across rows with NumPy and falling back to solve_cubic
+    per row when NumPy is not installed. Nothing is printed.
+
+    Args:
+        coeffs (array-like): N x 4 table of (a, b, c, d) rows
+        tol (float): Largest relative residual for which a row counts as converged
+
+    Returns:
+        tuple: (roots, real_mask, status) where roots is an N x 3 complex array
+               (unused slots of quadratic/linear rows are NaN), real_mask is an
+               N x 3 boolean array marking real roots and status is an array of
+               STATUS_* codes per row. Without NumPy the three are nested lists
+               of the same shape and element types (complex, bool and int).
+    """
+    np = optional_import("numpy")
+    if np is None:
+        return _solve_cubic_batch_python(coeffs, tol)
+
+    table = np.asarray(coeffs, dtype=np.float64).reshape(-1, 4)
+    n = table.shape[0]
+    a, b, c, d = table.T
+
+    roots = np.full((n, 3), complex(np.nan, np.nan))
+    real_mask = np.zeros((n, 3), dtype=bool)
+    status = np.full(n, STATUS_OK, dtype=np.int8)
+
+    finite = np.isfinite(table).all(axis=1)
+    cubic = finite & (a != 0)
+    quadratic = finite & (a == 0) & (b != 0)
+    linear = finite & (a == 0) & (b == 0) & (c != 0)
+    with np.errstate(all='ignore'):
+        # Rows that overflow when normalized by a are rejected, as by solve_cubic
+        overflow = cubic & (d != 0) & ~np.isfinite(table[:, 1:] / a[:, None]).all(axis=1)
+    cubic &= ~overflow
+    status[~finite | overflow] = STATUS_INVALID
+    status[finite & ~overflow & ~(cubic | quadratic | linear)] = STATUS_DEGENERATE
+
+    if cubic.any():
+        # Factor out x = 0 exactly where d is zero, as solve_cubic does
+        full = cubic & (d != 0)
+        zero = cubic & (d == 0)
+        if full.any():
+            roots[full], real_mask[full] = _cubic_rows(a[full], b[full], c[full], d[full])
+        if zero.any():
+            rest, rest_real = _quadratic_rows(a[zero], b[zero], c[zero])
+            roots[zero] = np.column_stack([np.zeros(len(rest)) + 0j, rest[:, :2]])
+            real_mask[zero] = np.column_stack([np.ones(len(rest), dtype=bool), rest_real[:, :2]])
+    if quadratic.any():
+        roots[quadratic], real_mask[quadratic] = _quadratic_rows(b[quadratic], c[quadratic], d[quadratic])
+    if linear.any():
+        roots[linear, 0] = -d[linear] / c[linear]
+        real_mask[linear, 0] = True
+
+    A, Bc, Cc, Dc = (col[:, None] for col in (a, b, c, d))
+    with np.errstate(all='ignore'):
+        # Rows whose roots are all real are sorted ascending (NaN padding stays last)
+        all_real = (real_mask | np.isnan(roots.real)).all(axis=1)
+        ordered = np.sort(roots[all_real].real, axis=1)
+        roots[all_real] = np.where(np.isnan(ordered), complex(np.nan, np.nan), ordered)
+
+        r = np.abs(roots)
+        scale = ((np.abs(A) * r + np.abs(Bc)) * r + np.abs(Cc)) * r + np.abs(Dc)
+        fx = _horner(A, Bc, Cc, Dc, roots)[0]
+        error = np.abs(fx) / np.where(scale > 0, scale, 1.0)
+    bad = ((error > tol) & ~np.isnan(roots.real)).any(axis=1)
+    status[bad & (status == STATUS_OK)] = STATUS_NOT_CONVERGED
+
+    return roots, real_mask, status
+
+def _trim(coeffs):
+    """
+    Convert coefficients (highest degree first) to floats and drop leading zeros.
+    """
+    p = [float(v) for v in coeffs]
+    while p and p[0] == 0:
+        p.pop(0)
+    return p
+
+def _eval(p, x):
+    """
+    Evaluate a polynomial (highest degree first) at x with Horner's scheme.
+    """
+    fx = 0.0
+    for coeff in p:
+        fx = fx * x + coeff
+    return fx
+
+def _eval_with_derivative(p, x):
+    """
+    Evaluate a polynomial and its derivative at x in one Horner pass.
+    """
+    fx = 0.0
+    fpx = 0.0
+    for coeff in p:
+        fpx = fpx * x + fx
+        fx = fx * x + coeff
+    return fx, fpx
+
+def _eval_derivatives(p, x):
+    """
+    Evaluate a polynomial and its first and second derivatives at x in one Horner pass.
+    """
+    fx = 0.0
+    fpx = 0.0
+    fppx = 0.0
+    for coeff in p:
+        fppx = fppx * x + fpx
+        fpx = fpx * x + fx
+        fx = fx * x + coeff
+    return fx, fpx, 2 * fppx
+
+def _derivative(p):
+    """
+    Coefficients of the derivative of a polynomial.
+    """
+    degree = len(p) - 1
+    return [coeff * (degree - i) for i, coeff in enumerate(p[:-1])]
+
+def _deflate(p, root):
+    """
+    Divide a polynomial by (x - root) with synthetic division, dropping the remainder.
+    """
+    quotient = [p[0]]
+    for coeff in p[1:-1]:
+        quotient.append(coeff + quotient[-1] * root)
+    return quotient
+
+def root_bound(coeffs):
+    """
+    Upper bound on the magnitude of every root of a polynomial
+
+    Takes the smaller of the Cauchy bound 1 + max|a_i / a_n| and the Fujiwara
+    bound 2 * max|a_(n-k) / a_n|^(1/k) (with the constant term halved).
+
+    Args:
+        coeffs (list): Coefficients, highest degree first
+
+    Returns:
+        float: R such that every root z satisfies |z| <= R
+    """
+    p = _trim(coeffs)
+    if len(p) < 2:
+        return 0.0
+    lead = p[0]
+    degree = len(p) - 1
+    cauchy = 1 + max(abs(coeff / lead) for coeff in p[1:])
+    terms = [abs(p[k] / lead) ** (1 / k) for k in range(1, degree)]
+    terms.append(abs(p[-1] / (2 * lead)) ** (1 / degree))
+    fujiwara = 2 * max(terms)
+    return min(cauchy, fujiwara)
+
+def descartes_bound(coeffs):
+    """
+    Descartes' rule of signs for a polynomial
+
+    Args:
+        coeffs (list): Coefficients, highest degree first
+
+    Returns:
+        tuple: (positive, negative) upper bounds on the number of positive
+               and negative real roots, counted with multiplicity
+    """
+    p = _trim(coeffs)
+    degree = len(p) - 1
+
+    def sign_changes(values):
+        signs = [v > 0 for v in values if v != 0]
+        return sum(1 for s, t in zip(signs, signs[1:]) if s != t)
+
+    negated = [coeff if (degree - i) % 2 == 0 else -coeff for i, coeff in enumerate(p)]
+    return sign_changes(p), sign_changes(negated)
+
+def sturm_sequence(coeffs):
+    """
+    Build the Sturm sequence p, p', -rem(p, p'), ... of a polynomial
+
+    The sequence stops at the (numerical) greatest common divisor of p and p',
+    so it also counts distinct roots correctly when some roots are repeated.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first
+
+    Returns:
+        list: List of coefficient lists
+    """
+    p = _trim(coeffs)
+    if len(p) < 2:
+        return [p]
+    # Float division is tried first; a cancellation it cannot resolve is redone
+    # exactly, so every sign in the sequence is that of the input polynomial
+    return _sturm_chain(p, float) or _sturm_chain(p, Fraction)
+
+def _sturm_chain(p, number):
+    """
+    Sturm sequence of p (at least linear) with the division done in number
+    (float or Fraction), or None if a float remainder cancels too far for its
+    signs to be trusted. Running sums of the magnitudes that went into each
+    coefficient decide what counts as zero: a remainder within rounding error
+    of them is numerically zero.
+    """
+    exact = [[number(coeff) for coeff in p], [number(coeff) for coeff in _derivative(p)]]
+    sequence = [p, _derivative(p)]
+    magnitudes = [[abs(coeff) for coeff in p], [abs(coeff) for coeff in sequence[1]]]
+    while len(sequence[-1]) > 1:
+        num, den = list(exact[-2]), exact[-1]
+        size, den_size = list(magnitudes[-2]), magnitudes[-1]
+        # Polynomial long division, keeping only the remainder
+        while len(num) >= len(den):
+            factor = num[0] / den[0]
+            for i in range(len(den)):
+                num[i] -= factor * den[i]
+                size[i] += abs(float(factor)) * den_size[i]
+            num.pop(0)
+            size.pop(0)
+        if (all(abs(coeff) <= GCD_TOL * bound for coeff, bound in zip(num, size))
+                and _divides(p, sequence[-1]) and _divides(sequence[1], sequence[-1])):
+            break
+        if number is float and any(abs(coeff) <= _SIGN_TOL * bound for coeff, bound in zip(num, size)):
+            return None
+        if not any(num):
+            break
+        while num[0] == 0:
+            num.pop(0)
+            size.pop(0)
+        # Positive rescaling keeps the signs and avoids overflow
+        norm = max(abs(coeff) for coeff in num)
+        exact.append([-coeff / norm for coeff in num])
+        sequence.append([float(coeff) for coeff in exact[-1]])
+        magnitudes.append([value / float(norm) for value in size])
+    return sequence
+
+def _sign_variations(sequence, x):
+    """
+    Number of sign changes in a Sturm sequence evaluated at x.
+    """
+    signs = [v > 0 for v in (_eval(p, x) for p in sequence) if v != 0]
+    return sum(1 for s, t in zip(signs, signs[1:]) if s != t)
+
+def count_real_roots(coeffs, lo, hi, sequence=None):
+    """
+    Count the distinct real roots of a polynomial in the interval (lo, hi]
+
+    Args:
+        coeffs (list): Coefficients, highest degree first
+        lo (float): Lower end of the interval (excluded)
+        hi (float): Upper end of the interval (included)
+        sequence (list, optional): Precomputed Sturm sequence of coeffs
+
+    Returns:
+        int: Number of distinct real roots
+    """
+    if sequence is None:
+        sequence = sturm_sequence(coeffs)
+    return _sign_variations(sequence, lo) - _sign_variations(sequence, hi)
+
+def _divide(p, divisor):
+    """
+    Quotient of polynomial long division, dropping the remainder.
+    """
+    num = list(p)
+    quotient = []
+    while len(num) >= len(divisor):
+        factor = num[0] / divisor[0]
+        quotient.append(factor)
+        for i in range(len(divisor)):
+            num[i] -= factor * divisor[i]
+        num.pop(0)
+    return quotient
+
+def _divides(p, divisor):
+    """
+    Whether divisor is a factor of p up to rounding: the product of the
+    quotient and divisor must reproduce every coefficient of p within the
+    rounding error of the terms that make it up.
+    """
+    quotient = _divide(p, divisor)
+    product = [0.0] * len(p)
+    size = [0.0] * len(p)
+    for i, q in enumerate(quotient):
+        for j, coeff in enumerate(divisor):
+            product[i + j] += q * coeff
+            size[i + j] += abs(q * coeff)
+    return all(abs(coeff - value) <= GCD_TOL * (abs(coeff) + bound) for coeff, value, bound in zip(p, product, size))
+
+def _refine_root(p, lo, hi, found, tol, max_iter):
+    """
+    Newton's method safeguarded by a sign-changing bracket [lo, hi].
+    Newton steps use implicit (Maehly) deflation of the roots already found and
+    are only taken while they stay in the bracket and at least halve the previous
+    step. Otherwise an Illinois (modified regula falsi) step is taken, so the
+    iteration count stays bounded.
+    """
+    flo, fhi = _eval(p, lo), _eval(p, hi)
+    x = (lo + hi) / 2
+    dx_old = hi - lo
+    last_side = 0
+    for _ in range(max_iter):
+        fx, fpx = _eval_with_derivative(p, x)
+        if fx == 0:
+            return x
+        if (fx < 0) == (flo < 0):
+            lo, flo, side = x, fx, -1
+        else:
+            hi, fhi, side = x, fx, 1
+        if hi - lo <= tol * abs(x):
+            return x
+
+        denom = fpx - fx * sum(1 / (x - r) for r in found)
+        step = fx / denom if denom != 0 else None
+        if step is not None and lo < x - step < hi and abs(2 * step) <= abs(dx_old):
+            x -= step
+            dx_old = step
+            last_side = 0
+            if abs(step) <= tol * abs(x):
+                return x
+        else:
+            # Illinois step: halve the stale endpoint when the same side moves twice
+            if side == last_side:
+                if side < 0:
+                    fhi /= 2
+                else:
+                    flo /= 2
+            # Step from the endpoint nearer the root, so a wide bracket does not
+            # round the new point to the spacing of floats at the far end
+            if abs(fhi) < abs(flo):
+                x = hi - fhi * (hi - lo) / (fhi - flo)
+            else:
+                x = lo - flo * (hi - lo) / (fhi - flo)
+            dx_old = hi - lo
+            last_side = side
+    return x
+
+def _distinct_real_roots(p, tol, max_iter):
+    """
+    Find the distinct real roots of a polynomial without a root at zero, largest first.
+    """
+    positive, negative = descartes_bound(p)
+    bound = root_bound(p) * 1.0625
+    lo = -bound if negative else 0.0
+    hi = bound if positive else 0.0
+    sequence = sturm_sequence(p)
+
+    found = []
+    for _ in range(len(p) - 1):
+        count = count_real_roots(p, lo, hi, sequence)
+        if count == 0:
+            break
+
+        # Bisect until (a, b] holds only the largest remaining root
+        a, b = lo, hi
+        for _ in range(max_iter):
+            if count <= 1:
+                break
+            mid = (a + b) / 2
+            right = count_real_roots(p, mid, b, sequence)
+            if right >= 1:
+                a, count = mid, right
+            else:
+                b = mid
+
+        if (_eval(p, a) < 0) != (_eval(p, b) < 0):
+            root = _refine_root(p, a, b, found, tol, max_iter)
+        else:
+            # No sign change (a numerically repeated root): keep bisecting with Sturm counts
+            for _ in range(max_iter):
+                if b - a <= tol * max(abs(a), abs(b)):
+                    break
+                mid = (a + b) / 2
+                if count_real_roots(p, mid, b, sequence) >= 1:
+                    a = mid
+                else:
+                    b = mid
+            root = (a + b) / 2
+
+        found.append(root)
+        # Every remaining root lies to the left of the isolating interval
+        hi = a
+    return found
+
+@instrument(failure=lambda roots: None if roots else "no_real_roots")
+def find_real_roots(coeffs, tol=1e-14, max_iter=100):
+    """
+    Find all real roots of a polynomial
+
+    Cauchy/Fujiwara bounds and Descartes' rule of signs give the search window
+    and a Sturm sequence isolates the roots one at a time, from the largest
+    down. Each root is then refined inside its bracket by Newton's method with
+    implicit deflation of the roots already found, falling back to Illinois
+    steps when Newton stalls. Repeated roots are handled by deflating the
+    polynomial to its square-free part first, and are returned once per
+    multiplicity.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        tol (float): Relative bracket width at which a root is accepted
+        max_iter (int): Maximum iterations per isolation or refinement stage
+
+    Returns:
+        list: Real roots in ascending order
+    """
+    p = _trim(coeffs)
+    found = []
+
+    # Exact zero roots
+    while len(p) > 1 and p[-1] == 0:
+        found.append(0.0)
+        p.pop()
+    if len(p) < 2:
+        return found
+
+    gcd = sturm_sequence(p)[-1]
+    if len(gcd) > 1:
+        # Repeated roots: the square-free part p / gcd has every root exactly once,
+        # and each root of the gcd adds one to the multiplicity of its match
+        distinct = _distinct_real_roots(_divide(p, gcd), tol, max_iter)
+        for repeated in find_real_roots(gcd, tol, max_iter):
+            if distinct:
+                found.append(min(distinct, key=lambda r: abs(r - repeated)))
+        found.extend(distinct)
+    else:
+        found.extend(_distinct_real_roots(p, tol, max_iter))
+    return sorted(found)
+
+# Unit roundoff of IEEE double precision, used in the rounding terms of error bounds
+_EPSILON = 2.0 ** -53
+
+def _initial_guesses(p, count):
+    """
+    Starting points for Aberth iteration: evenly spaced on a circle whose radius is
+    the geometric mean of the root magnitudes, rotated off the real axis.
+    """
+    radius = abs(p[-1] / p[0]) ** (1 / count) if p[-1] else 0.0
+    if not radius or not math.isfinite(radius):
+        radius = 0.5 * root_bound(p) or 1.0
+    return [radius * complex(math.cos(angle), math.sin(angle))
+            for angle in (2 * math.pi * k / count + 0.4 for k in range(count))]
+
+# Step rules accepted by iterate_root
+ITERATION_METHODS = ("newton", "halley", "laguerre")
+
+@instrument(iterations=lambda result: result[1],
+            failure=lambda result: "not_converged" if result[0] is None else None)
+def iterate_root(coeffs, x0, method="newton", tol=1e-14, xtol=1e-14, max_iter=100):
+    """
+    Refine a single root from a starting point with Newton, Halley or Laguerre steps
+
+    f, f' and f'' come from one Horner pass per iteration. The iteration stops
+    when the residual is small relative to the size of the terms that produced
+    it (|f(x)| <= tol * sum |a_i| |x|^i, so the test does not depend on the scale
+    of the coefficients) or when a step changes x by at most xtol relative to |x|.
+    Newton converges quadratically, Halley and Laguerre cubically near simple
+    roots; Laguerre may leave the real axis and return a complex root.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        x0 (float): Starting point (a complex start is allowed for Laguerre)
+        method (str): "newton", "halley" or "laguerre"
+        tol (float): Relative residual at which a root is accepted
+        xtol (float): Relative step size at which a root is accepted
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        tuple: (root, iterations) where root is None when the iteration breaks
+               down (zero derivative) or does not converge within max_iter
+    """
+    if method not in ITERATION_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(ITERATION_METHODS)}")
+    p = _trim(coeffs)
+    # Normalizing by the largest coefficient keeps f'^2 and f*f'' from under- or overflowing
+    largest = max((abs(coeff) for coeff in p), default=0.0)
+    if largest:
+        p = [coeff / largest for coeff in p]
+    absolute = [abs(coeff) for coeff in p]
+    degree = len(p) - 1
+    x = x0
+    for iteration in range(max_iter):
+        fx, fpx, fppx = _eval_derivatives(p, x)
+        if abs(fx) <= tol * _eval(absolute, abs(x)):
+            return x, iteration
+        if method == "newton":
+            if fpx == 0:
+                return None, iteration
+            step = fx / fpx
+        elif method == "halley":
+            denominator = 2 * fpx * fpx - fx * fppx
+            if denominator == 0:
+                return None, iteration
+            step = 2 * fx * fpx / denominator
+        else:
+            g = fpx / fx
+            h = g * g - fppx / fx
+            radicand = (degree - 1) * (degree * h - g * g)
+            root = math.sqrt(radicand) if isinstance(radicand, float) and radicand >= 0 else cmath.sqrt(radicand)
+            denominator = g + root if abs(g + root) >= abs(g - root) else g - root
+            if denominator == 0:
+                return None, iteration
+            step = degree / denominator
+            if isinstance(step, complex) and step.imag == 0:
+                step = step.real
+        x = x - step
+        if abs(step) <= xtol * abs(x):
+            return x, iteration + 1
+    return None, max_iter
+
+def _inclusion_radius(p, roots, i):
+    """
+    Radius n * |W_i| of the Weierstrass inclusion disc around roots[i], where
+    W_i = p(z_i) / (a_n * prod(z_i - z_j)), widened by the rounding error of p(z_i).
+    """
+    z = roots[i]
+    r = abs(z)
+    fx = abs(_eval(p, z)) + 2 * len(p) * _EPSILON * _eval([abs(coeff) for coeff in p], r)
+    denominator = abs(p[0])
+    for j, other in enumerate(roots):
+        if j != i:
+            denominator *= abs(z - other)
+    return (len(p) - 1) * fx / denominator if denominator else float('inf')
+
+def _aberth(p, tol, max_iter):
+    """
+    Aberth-Ehrlich iteration for all roots of a polynomial with p[-1] != 0.
+
+    Returns:
+        tuple: (roots, error bounds, True if every root converged)
+    """
+    n = len(p) - 1
+    roots = _initial_guesses(p, n)
+    absolute = [abs(coeff) for coeff in p]
+    active = [True] * n
+    for _ in range(max_iter):
+        if not any(active):
+            break
+        # Gauss-Seidel order: every update uses the newest approximations
+        for i in range(n):
+            if not active[i]:
+                continue
+            z = roots[i]
+            fx, fpx = _eval_with_derivative(p, z)
+            if abs(fx) <= tol * _eval(absolute, abs(z)):
+                active[i] = False
+                continue
+            repulsion = 0j
+            weierstrass = p[0]
+            for j, other in enumerate(roots):
+                if j != i:
+                    repulsion += 1 / (z - other) if z != other else 0j
+                    weierstrass *= z - other
+            ratio = fx / fpx if fpx else None
+            if ratio is not None and ratio * repulsion != 1:
+                step = ratio / (1 - ratio * repulsion)
+            else:
+                # Newton breaks down: fall back to the Weierstrass (Durand-Kerner) correction
+                step = fx / weierstrass if weierstrass else complex(tol, tol)
+            roots[i] = z - step
+            if abs(step) <= _EPSILON * abs(roots[i]):
+                active[i] = False
+    bounds = [_inclusion_radius(p, roots, i) for i in range(n)]
+    return roots, bounds, not any(active)
+
+def _all_roots(p, tol, max_iter):
+    """
+    Roots of a trimmed, finite polynomial: exact zero roots are split off, the
+    linear case is solved directly and the rest goes to Aberth iteration.
+
+    Returns:
+        tuple: (sorted roots, error bounds, True if every root converged)
+    """
+    p = list(p)
+    zeros = 0
+    while len(p) > 1 and p[-1] == 0:
+        zeros += 1
+        p.pop()
+    roots, bounds = [0j] * zeros, [0.0] * zeros
+    converged = True
+    if len(p) == 2:
+        roots.append(complex(-p[1] / p[0]))
+        bounds.append(2 * _EPSILON * abs(p[1] / p[0]))
+    elif len(p) > 2:
+        found, radii, converged = _aberth(p, tol, max_iter)
+        roots.extend(found)
+        bounds.extend(radii)
+    pairs = sorted(zip(roots, bounds), key=lambda pair: (pair[0].real, pair[0].imag))
+    return [root for root, _ in pairs], [bound for _, bound in pairs], converged
+
+@instrument()
+def find_all_roots(coeffs, tol=1e-14, max_iter=200):
+    """
+    Find all real and complex roots of a polynomial of any degree
+
+    Uses the Aberth-Ehrlich simultaneous iteration, which refines every root
+    at once and converges cubically for simple roots. Each root comes with an
+    a posteriori error bound: the disc of that radius around it contains a
+    true root (when discs overlap, each connected group of k discs contains
+    exactly k roots). Exact zero roots are split off first.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        tol (float): Relative backward error at which a root is accepted
+        max_iter (int): Maximum number of sweeps over all roots
+
+    Returns:
+        tuple: (roots, bounds) where roots is a list of complex numbers sorted by
+               real then imaginary part and bounds the matching error radii
+    """
+    p = _trim(coeffs)
+    if not all(math.isfinite(coeff) for coeff in p):
+        raise ValueError("Coefficients must be finite")
+    roots, bounds, _ = _all_roots(p, tol, max_iter)
+    return roots, bounds
+
+def _find_all_roots_batch_python(rows, degree, tol, max_iter):
+    """
+    Per-row fallback for find_all_roots_batch when NumPy is not installed.
+    """
+    nan = complex(float('nan'), float('nan'))
+    all_roots, all_bounds, status = [], [], []
+    for row in rows:
+        roots, bounds, code = _batch_row(row, degree, tol, max_iter)
+        padding = degree - len(roots)
+        all_roots.append(roots + [nan] * padding)
+        all_bounds.append(bounds + [float('nan')] * padding)
+        status.append(code)
+    return all_roots, all_bounds, status
+
+def _batch_row(row, degree, tol, max_iter):
+    """
+    Solve one row of find_all_roots_batch on its own, returning (roots, bounds, status).
+    """
+    p = [float(v) for v in row]
+    if len(p) != degree + 1 or not all(math.isfinite(v) for v in p):
+        return [], [], STATUS_INVALID
+    if not any(p[:-1]):
+        return [], [], STATUS_DEGENERATE
+    roots, bounds, converged = _all_roots(_trim(p), tol, max_iter)
+    return roots, bounds, STATUS_OK if converged else STATUS_NOT_CONVERGED
+
+def find_all_roots_batch(coeffs, tol=1e-14, max_iter=200):
+    """
+    Find all roots of many polynomials of the same degree at once
+
+    Runs the Aberth-Ehrlich iteration of find_all_roots vectorized across rows
+    with NumPy (falling back to a per-row loop when NumPy is not installed).
+    Rows with a zero leading coefficient or zero constant term are solved on
+    their own and padded with NaN.
+
+    Args:
+        coeffs (array-like): N x (degree + 1) table of coefficients, highest degree first
+        tol (float): Relative backward error at which a root is accepted
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        tuple: (roots, bounds, status) where roots is an N x degree complex array
+               sorted per row by real then imaginary part (unused slots are NaN),
+               bounds the matching error radii and status an array of STATUS_*
+               codes per row
+    """
+    np = optional_import("numpy")
+    if np is None:
+        rows = [list(row) for row in coeffs]
+        degree = max((len(row) for row in rows), default=1) - 1
+        return _find_all_roots_batch_python(rows, degree, tol, max_iter)
+
+    table = np.asarray(coeffs, dtype=np.float64)
+    table = table.reshape(len(table), -1) if table.ndim != 2 else table
+    count, degree = table.shape[0], table.shape[1] - 1
+
+    roots = np.full((count, degree), complex(np.nan, np.nan))
+    bounds = np.full((count, degree), np.nan)
+    status = np.full(count, STATUS_OK, dtype=np.int8)
+    if degree < 1:
+        status[:] = STATUS_DEGENERATE
+        return roots, bounds, status
+
+    finite = np.isfinite(table).all(axis=1)
+    regular = finite & (table[:, 0] != 0) & (table[:, -1] != 0)
+    for i in np.flatnonzero(~regular):
+        found, radii, status[i] = _batch_row(table[i], degree, tol, max_iter)
+        roots[i, :len(found)] = found
+        bounds[i, :len(radii)] = radii
+    if not regular.any():
+        return roots, bounds, status
+
+    # Monic rows and starting circles from the geometric mean of the root magnitudes
+    p = table[regular] / table[regular, :1]
+    absolute = np.abs(p)
+    angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+    radius = np.abs(p[:, -1]) ** (1 / degree)
+    z = radius[:, None] * np.exp(1j * angles)[None, :]
+    active = np.ones(z.shape, dtype=bool)
+    diagonal = np.arange(degree)
+
+    with np.errstate(all='ignore'):
+        for _ in range(max_iter):
+            fx = np.ones_like(z)
+            fpx = np.zeros_like(z)
+            scale = np.ones(z.shape)
+            r = np.abs(z)
+            for k in range(1, degree + 1):
+                fpx = fpx * z + fx
+                fx = fx * z + p[:, k:k + 1]
+                scale = scale * r + absolute[:, k:k + 1]
+            active &= np.abs(fx) > tol * scale
+            if not active.any():
+                break
+
+            # Jacobi order: all roots of all rows are updated from the same approximations
+            differences = z[:, :, None] - z[:, None, :]
+            differences[:, diagonal, diagonal] = 1
+            repulsion = (1 / differences).sum(axis=2) - 1
+            weierstrass = np.prod(differences, axis=2)
+            ratio = fx / fpx
+            step = ratio / (1 - ratio * repulsion)
+            fallback = fx / weierstrass
+            step = np.where(np.isfinite(step), step, np.where(np.isfinite(fallback), fallback, tol))
+            step = np.where(active, step, 0)
+            z = z - step
+            active &= np.abs(step) > _EPSILON * np.abs(z)
+
+        # Weierstrass inclusion radii, widened by the rounding error of p(z)
+        r = np.abs(z)
+        fx = np.ones_like(z)
+        scale = np.ones(z.shape)
+        for k in range(1, degree + 1):
+            fx = fx * z + p[:, k:k + 1]
+            scale = scale * r + absolute[:, k:k + 1]
+        differences = z[:, :, None] - z[:, None, :]
+        differences[:, diagonal, diagonal] = 1
+        radii = degree * (np.abs(fx) + 2 * (degree + 1) * _EPSILON * scale) / np.abs(np.prod(differences, axis=2))
+    radii = np.where(np.isnan(radii), np.inf, radii)
+
+    order = np.lexsort((z.imag, z.real), axis=1)
+    roots[regular] = np.take_along_axis(z, order, axis=1)
+    bounds[regular] = np.take_along_axis(radii, order, axis=1)
+    status[np.flatnonzero(regular)[active.any(axis=1)]] = STATUS_NOT_CONVERGED
+    return roots, bounds, status
@@ -0,0 +1,355 @@
+import asyncio
+import json
+import math
+import sys
+
+from polynomial import calculate_fx, newton_raphson
+from roots import solve_cubic, solve_cubic_batch, STATUS_INVALID
+from symbolic import SOURCE_EXACT, SymbolicWorker, solve_bounded
+from utils import optional_import
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Requests arriving within this many seconds of each other are handled in one vectorized call
+DEFAULT_BATCH_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_EXACT_TIMEOUT = 10.0
+DEFAULT_EXACT_WORKERS = 2
+
+OPERATIONS = ("evaluate", "solve", "newton", "solve_exact")
+
+def _coefficients(request):
+    """
+    Read the [a, b, c, d] coefficients of a request as floats.
+    """
+    coeffs = request.get("coeffs")
+    if not isinstance(coeffs, list) or len(coeffs) != 4:
+        raise ValueError("'coeffs' must be a list of 4 numbers [a, b, c, d]")
+    try:
+        values = [float(v) for v in coeffs]
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid coefficients {coeffs!r}")
+    if not all(math.isfinite(v) for v in values):
+        raise ValueError(f"non-finite coefficients {coeffs!r}")
+    return values
+
+def _number(request, key):
+    """
+    Read a required number from a request.
+    """
+    value = request.get(key)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"'{key}' must be finite")
+    return number
+
+def _json_root(root):
+    """
+    JSON-compatible value for a root: a number, or [real, imag] for complex roots.
+    """
+    return [root.real, root.imag] if isinstance(root, complex) else root
+
+def _finite(result):
+    """
+    Whether a result holds only finite numbers, so it can be sent as strict JSON.
+    """
+    if isinstance(result, list):
+        return all(_finite(value) for value in result)
+    return not isinstance(result, float) or math.isfinite(result)
+
+def evaluate_rows(rows):
+    """
+    Evaluate many (a, b, c, d, x) rows with one vectorized Horner pass.
+
+    Args:
+        rows (list): (a, b, c, d, x) tuples
+
+    Returns:
+        list: f(x) for every row, identical to calculate_fx, or ValueError
+              instances for rows whose result overflows
+    """
+    np = optional_import("numpy")
+    if np is None or len(rows) == 1:
+        values = [calculate_fx(*row) for row in rows]
+    else:
+        a, b, c, d, x = np.array(rows, dtype=np.float64).T
+        with np.errstate(all='ignore'):
+            values = (((a * x + b) * x + c) * x + d).tolist()
+    return [value if math.isfinite(value) else ValueError("f(x) overflows") for value in values]
+
+def solve_rows(rows):
+    """
+    Solve many [a, b, c, d] rows with one solve_cubic_batch call.
+
+    Args:
+        rows (list): [a, b, c, d] coefficient lists
+
+    Returns:
+        list: JSON-compatible root lists (complex roots as [real, imag]), or
+              ValueError instances for rows that cannot be solved
+    """
+    if len(rows) == 1:
+        try:
+            return [[_json_root(root) for root in solve_cubic(*rows[0])]]
+        except ValueError as error:
+            return [error]
+    roots, real_mask, status = solve_cubic_batch(rows)
+    results = []
+    for row_roots, row_mask, code in zip(roots, real_mask, status):
+        if code == STATUS_INVALID:
+            results.append(ValueError("coefficients must be finite"))
+            continue
+        found = []
+        for root, real in zip(row_roots, row_mask):
+            root = complex(root)
+            if math.isnan(root.real):
+                continue
+            found.append(root.real if real else [root.real, root.imag])
+        results.append(found)
+    return results
+
+class MicroBatcher:
+    """
+    Collects concurrent requests and hands them to a batch function together.
+
+    The first item of a batch starts a timer; the batch is flushed when the
+    timer expires or when max_batch items are waiting, whichever comes first.
+    """
+
+    def __init__(self, handler, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        """
+        Args:
+            handler (function): Called with a list of items, returns a list of results
+                                (exception instances are raised to the matching caller)
+            window (float): Seconds to wait for more items after the first one
+            max_batch (int): Largest number of items per batch
+        """
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+
+    async def submit(self, item):
+        """
+        Add an item to the current batch and wait for its result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        """
+        Run the handler on every waiting item and resolve their futures.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        self.batches += 1
+        try:
+            results = self.handler([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+class CalculatorServer:
+    """
+    Long-running calculation server speaking JSON lines over TCP or a Unix socket.
+
+    Every request line is a JSON object with an "op" ("evaluate", "solve",
+    "newton" or "solve_exact"), the "coeffs" [a, b, c, d] and, depending on
+    the operation, "x" or "x0" (plus an optional "method" for newton). An "id"
+    is echoed back so clients can match responses, which are written as soon
+    as they are ready and may arrive out of order. Each response carries
+    either a "result" or an "error".
+
+    Evaluations and numeric solves are micro-batched into vectorized calls.
+    Symbolic solves run in SymbolicWorker processes that keep sympy loaded
+    between requests. A solve that misses its deadline is killed and answered
+    by the numeric solver; a "source" field ("exact" or "numeric") tells which.
+    """
+
+    def __init__(self, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 exact_timeout=DEFAULT_EXACT_TIMEOUT, exact_workers=DEFAULT_EXACT_WORKERS):
+        """
+        Args:
+            batch_window (float): Seconds to wait for more requests before running a batch
+            max_batch (int): Largest number of requests per batch
+            exact_timeout (float): Seconds a symbolic solve may take
+            exact_workers (int): Number of worker processes for symbolic solves
+        """
+        self.evaluations = MicroBatcher(evaluate_rows, batch_window, max_batch)
+        self.solves = MicroBatcher(solve_rows, batch_window, max_batch)
+        self.exact_timeout = exact_timeout
+        # Worker processes start on their first solve
+        self.workers = [SymbolicWorker() for _ in range(exact_workers)]
+        self.idle_workers = asyncio.Queue()
+        for worker in self.workers:
+            self.idle_workers.put_nowait(worker)
+
+    async def warm_up(self):
+        """
+        Start the symbolic workers and load sympy in them ahead of the first request.
+        """
+        await asyncio.gather(*(asyncio.to_thread(worker.warm_up) for worker in self.workers))
+
+    async def solve_exact(self, coeffs):
+        """
+        Solve one cubic symbolically on an idle worker, off the event loop.
+
+        Returns:
+            tuple: (solutions as strings, or JSON-compatible numeric roots after a fallback; source)
+        """
+        worker = await self.idle_workers.get()
+        try:
+            solutions, source = await asyncio.to_thread(solve_bounded, coeffs, self.exact_timeout, worker=worker)
+        finally:
+            self.idle_workers.put_nowait(worker)
+        if source == SOURCE_EXACT:
+            return [str(solution) for solution in solutions], source
+        return [_json_root(root) for root in solutions], source
+
+    async def handle(self, request):
+        """
+        Handle one decoded request.
+
+        Args:
+            request (dict): Request object
+
+        Returns:
+            dict: Response with "result" or "error" (and the request "id" if given)
+        """
+        response = {"id": request["id"]} if isinstance(request, dict) and "id" in request else {}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            op = request.get("op")
+            if op not in OPERATIONS:
+                raise ValueError(f"unknown op {op!r}, expected one of {', '.join(OPERATIONS)}")
+            coeffs = _coefficients(request)
+            if op == "evaluate":
+                result = await self.evaluations.submit((*coeffs, _number(request, "x")))
+            elif op == "solve":
+                result = await self.solves.submit(coeffs)
+            elif op == "newton":
+                result = newton_raphson(*coeffs, _number(request, "x0"), method=request.get("method", "newton"))
+            else:
+                result, response["source"] = await self.solve_exact(coeffs)
+            if not _finite(result):
+                raise ValueError("result overflows")
+            response["result"] = result
+        except (ValueError, ArithmeticError) as e:
+            response["error"] = str(e)
+        return response
+
+    async def _respond(self, line, writer):
+        """
+        Decode one request line, handle it and write the response line.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"error": f"invalid JSON: {e}"}
+        else:
+            response = await self.handle(request)
+        writer.write((json.dumps(response, allow_nan=False) + "\n").encode())
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve one client connection until it closes.
+        """
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Requests of one connection are handled concurrently so they can share batches
+                task = asyncio.ensure_future(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start listening on a TCP port, or on a Unix socket when a path is given.
+
+        Returns:
+            asyncio.Server: The listening server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """
+        Stop the symbolic worker processes.
+        """
+        for worker in self.workers:
+            worker.close()
+
+async def _serve(args):
+    """
+    Run the server from parsed command line arguments until interrupted.
+    """
+    calculator = CalculatorServer(args.batch_window, args.max_batch, args.exact_timeout, args.exact_workers)
+    server = await calculator.start(args.host, args.port, args.unix)
+    if args.warm:
+        await calculator.warm_up()
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"LTC calculation server listening on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        calculator.close()
+
+def main(argv=None):
+    """
+    Command line interface for the calculation server.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="LTC calculation server (JSON lines over TCP or a Unix socket)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+                        help="seconds to collect requests into one batch")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest batch size")
+    parser.add_argument("--exact-timeout", type=float, default=DEFAULT_EXACT_TIMEOUT,
+                        help="seconds a symbolic solve may take before the numeric solver answers")
+    parser.add_argument("--exact-workers", type=int, default=DEFAULT_EXACT_WORKERS,
+                        help="worker processes for symbolic solves")
+    parser.add_argument("--warm", action="store_true", help="load sympy in the workers at start-up")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+import cmath
+import csv
+import json
+import math
+import sys
+from collections import deque
+
+from polynomial import calculate_fx
+from roots import solve_cubic
+
+# Column order used when a CSV file has no header or a JSONL row is a list
+COLUMNS = ("a", "b", "c", "d", "x")
+OUTPUT_COLUMNS = ("line", "a", "b", "c", "d", "x", "result", "error")
+
+DEFAULT_CHUNK_SIZE = 1024
+
+def _parse_fields(fields):
+    """
+    Convert a mapping of raw column values to floats.
+
+    Returns:
+        tuple: (coefficients dict, x or None) where x is None for a root-finding row
+    """
+    values = {}
+    for name in COLUMNS[:4]:
+        raw = fields.get(name)
+        if raw is None or raw == "":
+            raise ValueError(f"missing column '{name}'")
+        try:
+            values[name] = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid number {raw!r} in column '{name}'")
+        if not math.isfinite(values[name]):
+            raise ValueError(f"non-finite number {raw!r} in column '{name}'")
+
+    x = fields.get("x")
+    if x is None or x == "" or x == "?":
+        return values, None
+    try:
+        value = float(x)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid number {x!r} in column 'x'")
+    if not math.isfinite(value):
+        raise ValueError(f"non-finite number {x!r} in column 'x'")
+    return values, value
+
+def read_rows(f, fmt="csv"):
+    """
+    Read coefficient rows from a CSV or JSONL file object one line at a time.
+
+    CSV files may start with a header naming the a, b, c, d and x columns;
+    otherwise the columns are taken in that order. JSONL rows are objects with
+    those keys or plain lists. A missing x (or "?") asks for the roots.
+
+    Args:
+        f (file): Text file object to read from
+        fmt (str): "csv" or "jsonl"
+
+    Yields:
+        tuple: (line number, fields dict) or (line number, error message)
+    """
+    if fmt == "jsonl":
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"invalid JSON: {e}"
+                continue
+            if isinstance(row, list):
+                row = dict(zip(COLUMNS, row))
+            if not isinstance(row, dict):
+                yield line_no, "row must be a JSON object or list"
+                continue
+            yield line_no, row
+        return
+
+    header = None
+    for line_no, row in enumerate(csv.reader(f), 1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        cells = [cell.strip() for cell in row]
+        if line_no == 1 and cells[0].lower() in COLUMNS:
+            header = [cell.lower() for cell in cells]
+            continue
+        yield line_no, dict(zip(header or COLUMNS, cells))
+
+def process_row(fields, solver=solve_cubic):
+    """
+    Evaluate or solve a single parsed row.
+
+    Args:
+        fields (dict): Raw column values keyed by a, b, c, d and optionally x
+        solver (function): Root solver solver(a, b, c, d) used when x is missing
+
+    Returns:
+        dict: Output record with the coefficients and either "fx" or "roots"
+
+    Raises:
+        ValueError: If a value cannot be parsed or is not finite, or the result overflows
+    """
+    values, x = _parse_fields(fields)
+    record = dict(values)
+    if x is None:
+        record["roots"] = solver(values["a"], values["b"], values["c"], values["d"])
+        if not all(cmath.isfinite(root) for root in record["roots"]):
+            raise ValueError("roots overflow")
+    else:
+        record["x"] = x
+        record["fx"] = calculate_fx(values["a"], values["b"], values["c"], values["d"], x)
+        if not math.isfinite(record["fx"]):
+            raise ValueError("f(x) overflows")
+    return record
+
+def _process_chunk(rows, solver):
+    """
+    Process a chunk of (line number, fields or error) pairs without stopping on errors.
+    """
+    records = []
+    for line_no, fields in rows:
+        if isinstance(fields, str):
+            records.append({"line": line_no, "error": fields})
+            continue
+        try:
+            records.append({"line": line_no, **process_row(fields, solver)})
+        except (ValueError, ArithmeticError) as e:
+            records.append({"line": line_no, "error": str(e)})
+    return records
+
+def _format_root(root):
+    """
+    Full-precision text for a real or complex root.
+    """
+    return repr(root).strip("()") if isinstance(root, complex) else repr(root)
+
+def _json_root(root):
+    """
+    JSON-compatible value for a root: a number, or [real, imag] for complex roots.
+    """
+    return [root.real, root.imag] if isinstance(root, complex) else root
+
+class _Writer:
+    """
+    Incremental CSV or JSONL writer for output records.
+    """
+
+    def __init__(self, f, fmt):
+        self.f = f
+        self.fmt = fmt
+        if fmt == "csv":
+            self.csv = csv.writer(f, lineterminator="\n")
+            self.csv.writerow(OUTPUT_COLUMNS)
+
+    def write(self, records):
+        for record in records:
+            if self.fmt == "jsonl":
+                if "roots" in record:
+                    record = dict(record, roots=[_json_root(r) for r in record["roots"]])
+                # Rows are checked for finiteness when processed, so NaN never reaches the output
+                self.f.write(json.dumps(record, allow_nan=False) + "\n")
+                continue
+            if "roots" in record:
+                result = ";".join(_format_root(r) for r in record["roots"])
+            else:
+                result = repr(record["fx"]) if "fx" in record else ""
+            self.csv.writerow([record["line"]] + [record.get(name, "") for name in COLUMNS] +
+                              [result, record.get("error", "")])
+        self.f.flush()
+
+def _chunked(rows, chunk_size):
+    """
+    Group an iterator into lists of at most chunk_size items.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def process_stream(infile, outfile, fmt="csv", jobs=1, chunk_size=DEFAULT_CHUNK_SIZE, solver=solve_cubic):
+    """
+    Evaluate or solve every row of a CSV/JSONL stream and write results incrementally.
+
+    Rows are read and written in chunks, so memory use does not grow with the
+    input size. With jobs > 1 the chunks are processed on a process pool with a
+    bounded number of chunks in flight, and results are written in input order.
+    Rows that fail are reported with an "error" field and do not stop the stream.
+
+    Args:
+        infile (file): Text file object to read rows from
+        outfile (file): Text file object to write results to
+        fmt (str): "csv" or "jsonl" (used for both input and output)
+        jobs (int): Number of worker processes
+        chunk_size (int): Number of rows per chunk
+        solver (function): Root solver used for rows without x (must be picklable when jobs > 1)
+
+    Returns:
+        dict: Number of rows processed and of rows with errors
+    """
+    writer = _Writer(outfile, fmt)
+    summary = {"rows": 0, "errors": 0}
+
+    def emit(records):
+        writer.write(records)
+        summary["rows"] += len(records)
+        summary["errors"] += sum(1 for record in records if "error" in record)
+
+    chunks = _chunked(read_rows(infile, fmt), chunk_size)
+    if jobs <= 1:
+        for chunk in chunks:
+            emit(_process_chunk(chunk, solver))
+        return summary
+
+    # Imported here so the single-process path does not pay for it at start-up
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_process_chunk, chunk, solver))
+            if len(pending) >= 2 * jobs:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+    return summary
+
+def add_arguments(parser, exclusive=None):
+    """
+    Add the streaming batch mode options to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+        exclusive (argparse group, optional): Mutually exclusive group holding
+            interactive-only options (such as --exact) that --batch rejects
+    """
+    (exclusive or parser).add_argument("--batch", metavar="FILE", nargs="?", const="-",
+                                       help="read coefficient rows from FILE (or stdin) instead of prompting")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="batch input/output format (default: from the file extension, else csv)")
+    parser.add_argument("--output", metavar="FILE", help="write batch results to FILE instead of stdout")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes for batch mode")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk in batch mode")
+
+def run_batch(args, solver=solve_cubic):
+    """
+    Run the streaming batch mode from parsed command line arguments.
+
+    Args:
+        args (argparse.Namespace): Arguments added by add_arguments
+        solver (function): Root solver used for rows without x
+
+    Returns:
+        int: Exit code (1 if any row failed)
+    """
+    fmt = args.format or ("jsonl" if args.batch.endswith((".jsonl", ".json")) else "csv")
+    infile = sys.stdin if args.batch == "-" else open(args.batch, newline="")
+    outfile = sys.stdout if args.output is None else open(args.output, "w", newline="")
+    try:
+        summary = process_stream(infile, outfile, fmt, args.jobs, args.chunk_size, solver)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    if summary["errors"]:
+        print(f"{summary['errors']} of {summary['rows']} rows failed", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Evaluate or solve cubic polynomials from a CSV/JSONL stream")
+    add_arguments(parser)
+    arguments = parser.parse_args()
+    if arguments.batch is None:
+        arguments.batch = "-"
+    sys.exit(run_batch(arguments))
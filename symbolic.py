@@ -0,0 +1,181 @@
+import threading
+
+from roots import find_all_roots, solve_cubic
+
+DEFAULT_TIMEOUT = 10.0
+
+# Which path produced the solutions returned by solve_bounded
+SOURCE_EXACT = "exact"
+SOURCE_NUMERIC = "numeric"
+
+def solve_polynomial_sympy(coeffs):
+    """
+    Solve the polynomial equation p(x) = 0 of any degree using sympy
+    
+    Args:
+        coeffs (iterable): Coefficients, highest degree first
+    
+    Returns:
+        list: List of solutions
+    """
+    # sympy takes hundreds of milliseconds to import, so it is only loaded
+    # when an exact symbolic solve is actually requested
+    from sympy import symbols, Eq, solve
+    
+    # Define the symbol X to be discovered by the sympy library
+    x = symbols('x')
+    
+    # Build the polynomial with Horner's scheme and solve p(x) = 0
+    expression = 0
+    for coeff in coeffs:
+        expression = expression * x + coeff
+    solutions = solve(Eq(expression, 0), x)
+    return solutions
+
+def _serve(conn):
+    """
+    Worker process loop: solve coefficient lists received on conn with sympy until it closes.
+    """
+    # sympy stays loaded in the worker, so only its first solve pays for the import
+    while True:
+        try:
+            coeffs = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            conn.send(("ok", solve_polynomial_sympy(coeffs)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+class SymbolicWorker:
+    """
+    Child process that runs sympy solves and can be killed when one takes too long.
+
+    The process stays alive between solves, so sympy is imported only once. A
+    solve that misses its deadline kills the process; the next solve starts a
+    fresh one.
+    """
+
+    def __init__(self):
+        self.process = None
+        self.conn = None
+        self.solves = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """
+        Start the worker process if it is not running.
+        """
+        if self.process is not None and self.process.is_alive():
+            return
+        # Imported here so importing this module stays cheap
+        import multiprocessing
+        parent, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def warm_up(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Start the process and load sympy in it ahead of the first real solve.
+        """
+        self.solve([1, 0], timeout)
+
+    def solve(self, coeffs, timeout=DEFAULT_TIMEOUT):
+        """
+        Solve p(x) = 0 with sympy in the worker process.
+
+        Args:
+            coeffs (list): Coefficients, highest degree first
+            timeout (float): Seconds to wait for the solution
+
+        Returns:
+            list: sympy solutions
+
+        Raises:
+            TimeoutError: If the deadline expired (the worker process is killed)
+            ValueError: If sympy failed to solve the equation
+        """
+        with self._lock:
+            self._start()
+            self.solves += 1
+            try:
+                self.conn.send([float(v) for v in coeffs])
+                ready = self.conn.poll(timeout)
+                status, payload = self.conn.recv() if ready else (None, None)
+            except (EOFError, OSError):
+                self._kill()
+                raise ValueError("symbolic worker exited unexpectedly")
+            if not ready:
+                self.timeouts += 1
+                self._kill()
+                raise TimeoutError(f"symbolic solve timed out after {timeout} s")
+            if status == "error":
+                raise ValueError(payload)
+            return payload
+
+    def _kill(self):
+        """
+        Stop the worker process immediately.
+        """
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        with self._lock:
+            self._kill()
+
+def numeric_solve(coeffs):
+    """
+    Fast numeric fallback: closed-form for cubics and below, Aberth iteration otherwise.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first
+
+    Returns:
+        list: Real and complex roots
+    """
+    coeffs = [float(v) for v in coeffs]
+    if len(coeffs) <= 4:
+        return solve_cubic(*([0.0] * (4 - len(coeffs)) + coeffs))
+    return find_all_roots(coeffs)[0]
+
+_default_worker = None
+
+def solve_bounded(coeffs, timeout=DEFAULT_TIMEOUT, fallback=numeric_solve, worker=None):
+    """
+    Solve p(x) = 0 symbolically within a deadline, falling back to a numeric solver.
+
+    The sympy solve runs in a SymbolicWorker process. If it has not finished
+    when the deadline expires, the process is killed and the numeric fallback
+    answers instead. Errors raised by sympy also fall back.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        timeout (float): Seconds the symbolic solve may take
+        fallback (function): Numeric solver fallback(coeffs) returning a list of roots
+        worker (SymbolicWorker, optional): Worker to use (default: one shared worker)
+
+    Returns:
+        tuple: (solutions, source) where source is SOURCE_EXACT for sympy
+               solutions and SOURCE_NUMERIC for fallback roots
+    """
+    global _default_worker
+    if worker is None:
+        if _default_worker is None:
+            _default_worker = SymbolicWorker()
+        worker = _default_worker
+    try:
+        return worker.solve(coeffs, timeout), SOURCE_EXACT
+    except (TimeoutError, ValueError):
+        return fallback(coeffs), SOURCE_NUMERIC
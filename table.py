@@ -0,0 +1,139 @@
+import sys
+
+from polynomial import Polynomial
+from utils import format_number
+
+DEFAULT_SAMPLES = 21
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_MAX_DEPTH = 10
+
+def _uniform_grid(x_min, x_max, samples):
+    """
+    Evenly spaced points from x_min to x_max inclusive.
+    """
+    if samples < 2:
+        raise ValueError("A table needs at least 2 samples")
+    if not x_min < x_max:
+        raise ValueError("x_min must be smaller than x_max")
+    step = (x_max - x_min) / (samples - 1)
+    return [x_min + i * step for i in range(samples - 1)] + [x_max]
+
+def _refine(f, x0, f0, x1, f1, tol, depth):
+    """
+    Yield the points strictly inside (x0, x1) that adaptive sampling adds, in ascending order.
+
+    An interval is split at its midpoint while linear interpolation misses the
+    midpoint value by more than tol, or while f changes sign across it.
+    """
+    # Explicit stack of intervals and pending points instead of recursion; pushing
+    # the right half first makes the points come out in ascending order
+    stack = [(x0, f0, x1, f1, depth)]
+    while stack:
+        item = stack.pop()
+        if len(item) == 2:
+            yield item
+            continue
+        x0, f0, x1, f1, depth = item
+        xm = (x0 + x1) / 2
+        if depth == 0 or not x0 < xm < x1:
+            continue
+        fm = f(xm)
+        curved = abs(fm - (f0 + f1) / 2) > tol
+        crossing = f0 != 0 and f1 != 0 and (f0 < 0) != (f1 < 0)
+        if curved or crossing:
+            stack.append((xm, fm, x1, f1, depth - 1))
+            stack.append((xm, fm))
+            stack.append((x0, f0, xm, fm, depth - 1))
+
+def tabulate(coeffs, x_min, x_max, samples=DEFAULT_SAMPLES, adaptive=False,
+             tol=DEFAULT_TOLERANCE, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Tabulate a polynomial over [x_min, x_max] as a stream of (x, f(x)) rows.
+
+    Uniform mode evaluates f at `samples` evenly spaced points. Adaptive mode
+    starts from the same grid and halves an interval only where the table
+    would be inaccurate: where linear interpolation between its ends misses
+    the midpoint by more than tol times the spread of f over the grid (high
+    curvature), or where f changes sign (so every root gets a narrow bracket).
+    Each grid interval is halved at most max_depth times.
+
+    Args:
+        coeffs (list): Coefficients, highest degree first (e.g. [a, b, c, d])
+        x_min (float): Start of the interval
+        x_max (float): End of the interval
+        samples (int): Number of uniform grid points (at least 2)
+        adaptive (bool): Refine the grid where curvature or sign changes require it
+        tol (float): Largest interpolation error relative to the spread of f
+        max_depth (int): Maximum number of halvings per grid interval
+
+    Yields:
+        tuple: (x, f(x)) rows in ascending order of x
+    """
+    f = Polynomial(coeffs)
+    grid = _uniform_grid(x_min, x_max, samples)
+    values = [f(x) for x in grid]
+    if not adaptive:
+        yield from zip(grid, values)
+        return
+
+    spread = max(values) - min(values)
+    absolute_tol = tol * spread if spread else tol
+    yield grid[0], values[0]
+    for i in range(len(grid) - 1):
+        yield from _refine(f, grid[i], values[i], grid[i + 1], values[i + 1], absolute_tol, max_depth)
+        yield grid[i + 1], values[i + 1]
+
+def sign_changes(rows):
+    """
+    Find the brackets of a table where f changes sign or is exactly zero.
+
+    Args:
+        rows (iterable): (x, f(x)) rows in ascending order, e.g. from tabulate
+
+    Yields:
+        tuple: (x_lo, x_hi) with a root of f in [x_lo, x_hi]
+    """
+    previous = None
+    for x, fx in rows:
+        if fx == 0:
+            yield x, x
+        elif previous is not None and previous[1] != 0 and (previous[1] < 0) != (fx < 0):
+            yield previous[0], x
+        previous = (x, fx)
+
+def write_table(f, rows, dp=4):
+    """
+    Write table rows as aligned "x  f(x)" lines as they are produced.
+
+    Args:
+        f (file): Text file object to write to
+        rows (iterable): (x, f(x)) rows
+        dp (int): Number of decimal places
+
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    for x, fx in rows:
+        f.write(f"{format_number(x, dp):>14}  {format_number(fx, dp):>14}\n")
+        count += 1
+    return count
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Tabulate a polynomial over an interval")
+    parser.add_argument("coeffs", type=float, nargs="+", help="coefficients, highest degree first")
+    parser.add_argument("--from", dest="x_min", type=float, required=True, help="start of the interval")
+    parser.add_argument("--to", dest="x_max", type=float, required=True, help="end of the interval")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="number of uniform grid points")
+    parser.add_argument("--adaptive", action="store_true", help="refine where curvature or sign changes are large")
+    parser.add_argument("--tol", type=float, default=DEFAULT_TOLERANCE,
+                        help="adaptive interpolation error relative to the spread of f")
+    parser.add_argument("--brackets", action="store_true", help="print sign-change brackets instead of the table")
+    args = parser.parse_args()
+    rows = tabulate(args.coeffs, args.x_min, args.x_max, args.samples, args.adaptive, args.tol)
+    if args.brackets:
+        for lo, hi in sign_changes(rows):
+            print(f"[{format_number(lo, 8)}, {format_number(hi, 8)}]")
+    else:
+        write_table(sys.stdout, rows)
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from benchmark import CORPORA, make_corpus, measure, measure_evaluators, run, compare, main
+from roots import find_real_roots
+
+class TestBenchmark(unittest.TestCase):
+    """Tests for the benchmark suite in benchmark.py"""
+
+    def test_make_corpus(self):
+        """Test that corpora are reproducible and have the expected shape"""
+        for kind in CORPORA:
+            corpus = make_corpus(kind, 50, seed=1)
+            self.assertEqual(corpus, make_corpus(kind, 50, seed=1))
+            self.assertNotEqual(corpus, make_corpus(kind, 50, seed=2))
+            self.assertTrue(all(len(case) == 5 for case in corpus))
+
+        # Repeated-root cases really have repeated roots
+        a, b, c, d, _ = make_corpus("repeated_roots", 1)[0]
+        roots = find_real_roots([a, b, c, d])
+        self.assertEqual(len(roots), 3)
+        self.assertLess(min(abs(roots[0] - roots[1]), abs(roots[1] - roots[2])), 1e-5)
+
+        with self.assertRaises(ValueError):
+            make_corpus("unknown")
+
+    def test_measure_and_run(self):
+        """Test that measurements report throughput and latency percentiles"""
+        result = measure(lambda a, b, c, d, x: a * x, make_corpus("well_conditioned", 20), repeat=1)
+        self.assertEqual(result["calls"], 20)
+        self.assertGreater(result["throughput"], 0)
+        self.assertLessEqual(result["p50_us"], result["p99_us"])
+
+        report = run(["calculate_fx", "format_number"], ("extreme_magnitudes",), size=10, repeat=1)
+        self.assertEqual(sorted(report["results"]),
+                         ["calculate_fx/extreme_magnitudes", "format_number/extreme_magnitudes"])
+
+    def test_compare(self):
+        """Test that regressions beyond the threshold are flagged"""
+        baseline = {"results": {"f/k": {"p50_us": 1.0, "p99_us": 2.0}, "g/k": {"p50_us": 1.0, "p99_us": 1.0}}}
+        current = {"results": {"f/k": {"p50_us": 1.05, "p99_us": 3.0}}}
+        self.assertEqual(compare(baseline, current, threshold=0.1), [("f/k", "p99_us", 2.0, 3.0)])
+        self.assertEqual(compare(baseline, current, threshold=1.0), [])
+
+    def test_measure_evaluators(self):
+        """Test that the evaluator comparison reports per-call costs"""
+        result = measure_evaluators(size=3, points=50)
+        for key in ("calculate_fx_ns", "polynomial_ns", "compiled_ns", "compiled_derivative_ns", "compile_us"):
+            self.assertGreater(result[key], 0)
+        self.assertAlmostEqual(result["speedup"], result["calculate_fx_ns"] / result["compiled_ns"])
+
+    def test_command_line(self):
+        """Test saving a baseline and comparing against it"""
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = os.path.join(tmp, "baseline.json")
+            slower = os.path.join(tmp, "slower.json")
+            with patch('sys.stdout'):
+                self.assertEqual(main(["run", "--only", "calculate_fx", "--size", "10", "--output", baseline]), 0)
+
+                with open(baseline) as f:
+                    report = json.load(f)
+                for result in report["results"].values():
+                    result["p50_us"] *= 10
+                with open(slower, "w") as f:
+                    json.dump(report, f)
+
+                self.assertEqual(main(["compare", baseline, slower]), 1)
+                self.assertEqual(main(["compare", slower, baseline]), 0)
+
+                # A zero baseline time is reported without dividing by it
+                for result in report["results"].values():
+                    result["p50_us"] = 0.0
+                with open(baseline, "w") as f:
+                    json.dump(report, f)
+                self.assertEqual(main(["compare", baseline, slower]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
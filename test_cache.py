@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from cache import SolveCache
+from roots import solve_cubic
+
+class TestSolveCache(unittest.TestCase):
+    """Tests for the SolveCache class in cache.py"""
+
+    def setUp(self):
+        self.calls = []
+
+        def solver(a, b, c, d):
+            self.calls.append((a, b, c, d))
+            return solve_cubic(a, b, c, d)
+
+        self.solver = solver
+
+    def test_hits_and_misses(self):
+        """Test that repeated and scaled polynomials are served from the cache"""
+        cache = SolveCache(self.solver)
+        self.assertEqual(cache.solve(1, -6, 11, -6), solve_cubic(1, -6, 11, -6))
+        self.assertEqual(cache.solve(1, -6, 11, -6), solve_cubic(1, -6, 11, -6))
+
+        # Scaling the coefficients does not change the roots
+        cache.solve(2, -12, 22, -12)
+        self.assertEqual(len(self.calls), 1)
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_tolerance(self):
+        """Test that coefficients within the tolerance share an entry"""
+        cache = SolveCache(self.solver, tolerance=1e-6)
+        cache.solve(1, 2, 3, 4)
+        cache.solve(1, 2, 3, 4 + 1e-9)
+        self.assertEqual(len(self.calls), 1)
+        cache.solve(1, 2, 3, 4.1)
+        self.assertEqual(len(self.calls), 2)
+
+        # Exact keys only match identical normalized coefficients
+        exact = SolveCache(self.solver, tolerance=0)
+        exact.solve(1, 2, 3, 4)
+        exact.solve(1, 2, 3, 4 + 1e-9)
+        self.assertEqual(exact.stats()["misses"], 2)
+
+    def test_small_coefficients(self):
+        """Test that the tolerance is relative, so small coefficients get their own entries"""
+        cache = SolveCache(self.solver)
+        self.assertAlmostEqual(cache.solve(1, 0, 0, -1e-13)[0], 1e-13 ** (1 / 3), places=15)
+        self.assertAlmostEqual(cache.solve(1, 0, 0, -4e-13)[0], 4e-13 ** (1 / 3), places=15)
+        self.assertEqual(len(self.calls), 2)
+
+        # Nearby values within the relative tolerance still share an entry
+        cache.solve(1, 0, 0, -4e-13 * (1 + 1e-15))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalid_coefficients(self):
+        """Test that unkeyable input gets the same error as the uncached solver"""
+        cache = SolveCache(self.solver)
+        for coeffs in ((float('inf'), 1, 1, 1), (1, float('nan'), 1, 1), (1e-300, 1, 1, 1e300)):
+            self.assertIsNone(cache.key(*coeffs))
+            with self.assertRaises(ValueError) as expected:
+                solve_cubic(*coeffs)
+            with self.assertRaises(ValueError) as raised:
+                cache.solve(*coeffs)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = SolveCache(self.solver, max_entries=2)
+        cache.solve(1, 0, 0, -1)
+        cache.solve(1, 0, 0, -8)
+        cache.solve(1, 0, 0, -1)   # Refresh the first entry
+        cache.solve(1, 0, 0, -27)  # Evicts x^3 - 8
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+        cache.solve(1, 0, 0, -1)
+        self.assertEqual(cache.hits, 2)
+        cache.solve(1, 0, 0, -8)
+        self.assertEqual(cache.misses, 4)
+
+    def test_returned_roots_are_copies(self):
+        """Test that callers cannot corrupt cached entries"""
+        cache = SolveCache(self.solver)
+        cache.solve(1, -6, 11, -6).append(99)
+        self.assertEqual(len(cache.solve(1, -6, 11, -6)), 3)
+
+    def test_persistence(self):
+        """Test saving the cache to a file and loading it back"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.json")
+            cache = SolveCache(self.solver, path=path)
+            cache.solve(1, 0, 0, -1)  # One real root and a complex pair
+            cache.solve(1, -6, 11, -6)
+            cache.save()
+
+            warm = SolveCache(self.solver, path=path)
+            self.assertEqual(len(warm), 2)
+            self.assertEqual(warm.solve(1, 0, 0, -1), solve_cubic(1, 0, 0, -1))
+            self.assertEqual(warm.hits, 1)
+            self.assertEqual(len(self.calls), 2)
+
+            # A file written with another tolerance is ignored
+            other = SolveCache(self.solver, tolerance=1e-3, path=path)
+            self.assertEqual(len(other), 0)
+
+        with self.assertRaises(ValueError):
+            SolveCache(self.solver).save()
+
+if __name__ == '__main__':
+    unittest.main()
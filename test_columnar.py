@@ -0,0 +1,131 @@
+import io
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import columnar
+from columnar import (ColumnFile, INPUT_COLUMNS, SOLVE_COLUMNS, columns_to_csv, csv_to_columns,
+                      evaluate_file, read_columns, solve_file, write_columns)
+from polynomial import calculate_fx
+from roots import STATUS_OK
+
+class TestColumnar(unittest.TestCase):
+    """Tests for the memory-mapped column files in columnar.py"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inputs = {
+            "a": [1, 2, 0, 1.5],
+            "b": [-6, 0, 1, -2],
+            "c": [11, -3, -4, 0.25],
+            "d": [-6, 1, 4, 7],
+            "x": [0.5, -1.25, 3, math.nan],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_round_trip(self):
+        """Test that columns are written and mapped back unchanged"""
+        write_columns(self.path("in.ltc"), self.inputs)
+        with ColumnFile(self.path("in.ltc")) as f:
+            self.assertEqual(f.names, INPUT_COLUMNS)
+            self.assertEqual(f.rows, 4)
+            column = f.column("c")
+            self.assertIsInstance(column, memoryview)
+            self.assertEqual(list(column), self.inputs["c"])
+            with self.assertRaises(KeyError):
+                f.column("y")
+        # Views are released when the file is closed
+        with self.assertRaises(ValueError):
+            column[0]
+        
+        with self.assertRaises(ValueError):
+            write_columns(self.path("bad.ltc"), {"a": [1], "b": [1, 2]})
+        with open(self.path("bad.ltc"), "wb") as f:
+            f.write(b"not a column file at all")
+        with self.assertRaises(ValueError):
+            ColumnFile(self.path("bad.ltc"))
+        # Shorter than the header
+        with open(self.path("bad.ltc"), "wb") as f:
+            f.write(b"LTC")
+        with self.assertRaises(ValueError):
+            ColumnFile(self.path("bad.ltc"))
+
+    def test_byteswapped(self):
+        """Test that big-endian hosts write through byte-swapped copies"""
+        with patch.object(columnar, '_NATIVE', False):
+            write_columns(self.path("in.ltc"), self.inputs)
+            with ColumnFile(self.path("in.ltc")) as f:
+                self.assertNotIsInstance(f.column("a"), memoryview)
+            columns = read_columns(self.path("in.ltc"))
+        self.assertEqual(columns["c"], self.inputs["c"])
+        self.assertTrue(math.isnan(columns["x"][3]))
+
+    def test_evaluate(self):
+        """Test that file evaluation matches calculate_fx, with and without NumPy"""
+        write_columns(self.path("in.ltc"), self.inputs)
+        rows = list(zip(*(self.inputs[name] for name in INPUT_COLUMNS)))
+        expected = [calculate_fx(*row) for row in rows]
+        
+        self.assertEqual(evaluate_file(self.path("in.ltc"), self.path("fx.ltc"), chunk_rows=3), 4)
+        with patch.object(columnar, 'optional_import', lambda name: None):
+            evaluate_file(self.path("in.ltc"), self.path("fx_pure.ltc"))
+        for name in ("fx.ltc", "fx_pure.ltc"):
+            fx = read_columns(self.path(name))["fx"]
+            self.assertEqual(fx[:3], expected[:3])
+            self.assertTrue(math.isnan(fx[3]))
+
+    def test_solve(self):
+        """Test that file solving writes every root as real and imaginary columns"""
+        write_columns(self.path("in.ltc"), self.inputs)
+        for numpy in (True, False):
+            output = self.path(f"roots_{numpy}.ltc")
+            if numpy:
+                solve_file(self.path("in.ltc"), output, chunk_rows=2)
+            else:
+                with patch.object(columnar, 'optional_import', lambda name: None):
+                    solve_file(self.path("in.ltc"), output)
+            result = read_columns(output)
+            self.assertEqual(tuple(result), SOLVE_COLUMNS)
+            self.assertEqual(result["status"], [STATUS_OK] * 4)
+            
+            # x^3 - 6x^2 + 11x - 6 = (x - 1)(x - 2)(x - 3)
+            real = sorted(result[f"re{k}"][0] for k in (1, 2, 3))
+            for root, exact in zip(real, (1, 2, 3)):
+                self.assertAlmostEqual(root, exact, places=9)
+            # Every stored root satisfies its equation; the quadratic row has an unused slot
+            for i, coeffs in enumerate(zip(*(self.inputs[name] for name in INPUT_COLUMNS[:4]))):
+                roots = [complex(result[f"re{k}"][i], result[f"im{k}"][i]) for k in (1, 2, 3)]
+                roots = [root for root in roots if not math.isnan(root.real)]
+                self.assertEqual(len(roots), 3 if coeffs[0] else 2)
+                for root in roots:
+                    value = ((coeffs[0] * root + coeffs[1]) * root + coeffs[2]) * root + coeffs[3]
+                    self.assertLess(abs(value), 1e-9)
+
+    def test_csv(self):
+        """Test conversion between CSV and column files"""
+        with open(self.path("in.csv"), "w") as f:
+            f.write("a,b,c,d,x\n1,-6,11,-6,2\n2,0,-3,1,?\n")
+        self.assertEqual(csv_to_columns(self.path("in.csv"), self.path("in.ltc")), 2)
+        data = read_columns(self.path("in.ltc"))
+        self.assertEqual(data["a"], [1, 2])
+        self.assertEqual(data["x"][0], 2)
+        self.assertTrue(math.isnan(data["x"][1]))
+        
+        out = io.StringIO()
+        self.assertEqual(columns_to_csv(self.path("in.ltc"), out), 2)
+        self.assertEqual(out.getvalue().splitlines()[:2], ["a,b,c,d,x", "1.0,-6.0,11.0,-6.0,2.0"])
+        
+        with open(self.path("bad.csv"), "w") as f:
+            f.write("a,b,c,d,x\n1,2,oops,4,5\n")
+        with self.assertRaises(ValueError):
+            csv_to_columns(self.path("bad.csv"), self.path("bad.ltc"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from continuation import track_roots, sweep_coefficient
+from roots import find_all_roots
+
+class TestContinuation(unittest.TestCase):
+    """Tests for root tracking across coefficient sweeps in continuation.py"""
+
+    def test_sweep(self):
+        """Test that tracked roots match cold solves at a fraction of the iterations"""
+        # x^3 - 3x + d has three real roots for |d| < 2 and a double root at d = +-2
+        values = [-1.9 + i * 0.01 for i in range(381)]
+        steps = list(sweep_coefficient([1, 0, -3, 0], 3, values))
+        self.assertEqual(len(steps), len(values))
+        for d, step in zip(values, steps):
+            expected = find_all_roots([1, 0, -3, d])[0]
+            for root in step.roots:
+                self.assertLess(min(abs(root - other) for other in expected), 1e-6)
+        
+        warm = [step.iterations for step in steps[1:] if not step.restarted]
+        self.assertLessEqual(sum(warm) / len(warm), 2)
+        
+        # Every root keeps its identity: the largest real root is always the same index
+        largest = max(range(3), key=lambda i: steps[0].roots[i].real)
+        for step in steps:
+            self.assertEqual(max(range(3), key=lambda i: step.roots[i].real), largest)
+
+    def test_events(self):
+        """Test that collisions and real/complex transitions are reported"""
+        values = [i * 0.01 for i in range(251)]
+        steps = list(sweep_coefficient([1, 0, -3, 0], 3, values))
+        events = [(round(d, 2), kind) for d, step in zip(values, steps) for kind, _ in step.events]
+        self.assertIn((2.0, "collision"), events)
+        kinds = [kind for _, kind in events]
+        self.assertEqual(kinds.count("complex"), 2)
+        # Past d = 2 only one real root is left, with a conjugate pair beside it
+        last = steps[-1].roots
+        self.assertEqual(sum(1 for root in last if root.imag == 0), 1)
+        pair = [root for root in last if root.imag != 0]
+        self.assertAlmostEqual(pair[0], pair[1].conjugate(), places=12)
+
+    def test_errors(self):
+        """Test that invalid trajectories are rejected"""
+        with self.assertRaises(ValueError):
+            list(track_roots([[1, 0, -1], [1, 0, 0, -1]]))
+        with self.assertRaises(ValueError):
+            list(track_roots([[0, 1, -1]]))
+        with self.assertRaises(ValueError):
+            list(track_roots([[1, float('nan')]]))
+
+if __name__ == '__main__':
+    unittest.main()
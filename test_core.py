@@ -0,0 +1,107 @@
+import unittest
+import core
+from benchmark import measure_memory, measure_startup
+from roots import find_real_roots
+from utils import format_number
+
+# Memory budgets in bytes per core function: the most one call may allocate
+# at once, and the highest traced memory over 1000 calls (which grows if
+# calls keep memory alive). Evaluation and Newton steps allocate nothing that
+# outlives the float free list; a closure alone would cost over 100 bytes.
+BUDGETS = {
+    "evaluate": (core.evaluate, (2.0, -1.0, 5.0, 3.0, 1.5), 64, 256),
+    "slope": (core.slope, (2.0, -1.0, 5.0, 3.0, 1.5), 64, 256),
+    "newton": (core.newton, (2.0, -1.0, 5.0, 3.0, 0.0), 64, 256),
+    "real_root": (core.real_root, (2.0, -1.0, 5.0, 3.0), 128, 512),
+    "real_roots": (core.real_roots, (1.0, 0.0, -3.0, 0.5), 256, 1024),
+    "format_value": (core.format_value, (3.14159,), 256, 1024),
+}
+
+class TestCore(unittest.TestCase):
+    """Tests for the lean builtins-only core in core.py"""
+
+    def test_evaluate(self):
+        """Test evaluation and the derivative"""
+        self.assertEqual(core.evaluate(1, 2, 3, 4, 2), 26)
+        self.assertEqual(core.slope(1, 2, 3, 4, 2), 23)
+
+    def test_newton(self):
+        """Test Newton's method from a starting point"""
+        root = core.newton(1, 0, -2, 0, 1.0)
+        self.assertAlmostEqual(root, 2 ** 0.5, places=12)
+        # x^3 - 3x has a zero derivative at x = 1
+        self.assertIsNone(core.newton(1, 0, -3, 1, 1.0))
+
+    def test_real_roots(self):
+        """Test that the real roots match the Sturm-based finder"""
+        cases = [(1, -6, 11, -6), (1, 0, -3, 0.5), (2, -1, 5, 3), (1, 0, 1, 0), (1, -4, 5, -2),
+                 (1, -3, 3, -1), (0, 1, 0, -4), (0, 1, 0, 4), (0, 0, 2, 1), (0, 0, 0, 1), (-3, 1e3, 2, -7)]
+        for coeffs in cases:
+            expected = find_real_roots(list(coeffs))
+            roots = core.real_roots(*coeffs)
+            # Repeated roots are listed once by find_real_roots
+            self.assertEqual(sorted(set(round(root, 4) for root in roots)),
+                             sorted(set(round(root, 4) for root in expected)), coeffs)
+            self.assertEqual(roots, sorted(roots))
+            root = core.real_root(*coeffs)
+            if expected:
+                self.assertLess(min(abs(root - x) for x in expected), 1e-4, coeffs)
+            else:
+                self.assertIsNone(root)
+        # The double root of (x - 1)^2 (x - 2) is returned twice, the triple root of (x - 1)^3 three times
+        self.assertEqual(len(core.real_roots(1, -4, 5, -2)), 3)
+        self.assertEqual(core.real_roots(1, -3, 3, -1), [1.0, 1.0, 1.0])
+
+    def test_narrow_complex_pair(self):
+        """Test that a narrow complex pair is not reported as a double root"""
+        # (x - 5)((x - 100)^2 + 1e-8): roots 5 and 100 +- 1e-4i
+        self.assertEqual(core.real_roots(1, -205, 11000 + 1e-8, -5 * (1e4 + 1e-8)), [5.0])
+        # (x - 100)^2 + 1e-8 as a quadratic
+        self.assertEqual(core.real_roots(0, 1, -200, 1e4 + 1e-8), [])
+        self.assertIsNone(core.real_root(0, 1, -200, 1e4 + 1e-8))
+
+    def test_real_roots_badly_scaled(self):
+        """Test that small roots survive deflation by a huge first root"""
+        cases = [(8.216886251924977e-06, 90.54454986254837, -17.51832656637353, 0.0006126264897048195),
+                 (-0.00025210326392647415, 723.5930822211054, 0.0005287683274789124, 0.00371898565337117),
+                 (-1.7656640527228915e-05, -14211.316116667347, 238.52065144785215, -1.704508442591745e-06),
+                 (1.090980975063594e-05, 804.6670163444802, 0.00787189288554507, 1.0872221558794946)]
+        for coeffs in cases:
+            expected = find_real_roots(list(coeffs))
+            roots = core.real_roots(*coeffs)
+            self.assertEqual(len(roots), len(expected), coeffs)
+            for root, x in zip(roots, expected):
+                self.assertAlmostEqual(root / x, 1, places=9)
+        self.assertEqual(len(core.real_roots(*cases[1])), 1)
+
+    def test_format_value(self):
+        """Test that numbers are formatted like utils.format_number"""
+        for value in (1.0, 2.5, -0.00001, 3.14159265, 1e-12, 123.45000001, -7.1, None):
+            self.assertEqual(core.format_value(value), format_number(value))
+        self.assertEqual(core.format_value(2 / 3, 12), format_number(2 / 3, 12))
+
+    def test_no_imports(self):
+        """Test that importing the core loads no module besides itself"""
+        baseline = measure_startup("sys")["modules"]
+        self.assertEqual(measure_startup("core")["modules"] - baseline, {"core"})
+
+    def test_memory_budgets(self):
+        """Test that every core function stays within its tracemalloc budgets"""
+        for name, (func, args, call_budget, peak_budget) in BUDGETS.items():
+            usage = measure_memory(func, args, calls=1000)
+            self.assertLessEqual(usage["call_bytes"], call_budget, name)
+            self.assertLessEqual(usage["peak_bytes"], peak_budget, name)
+            self.assertLessEqual(usage["retained_bytes"], peak_budget, name)
+
+    def test_memory_harness(self):
+        """Test that the harness catches per-call closures and growing memory"""
+        def with_closure(x):
+            return (lambda y: y * x)(x)
+        self.assertGreater(measure_memory(with_closure, (2.0,))["call_bytes"], 64)
+        kept = []
+        usage = measure_memory(kept.append, (1.5,), calls=1000)
+        self.assertGreater(usage["peak_bytes"], 1024)
+        self.assertGreater(usage["retained_bytes"], 1024)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+from unittest.mock import patch
+import fitting
+from fitting import PolynomialFit, fit_polynomial
+
+class TestFitting(unittest.TestCase):
+    """Tests for the least-squares polynomial fitting in fitting.py"""
+
+    def assertCoefficientsAlmostEqual(self, polynomial, expected, places=8):
+        """Check the coefficients of a fitted polynomial"""
+        self.assertEqual(len(polynomial.coeffs), len(expected), f"{polynomial} != {expected}")
+        for got, want in zip(polynomial.coeffs, expected):
+            self.assertAlmostEqual(got, want, places=places)
+
+    def test_exact_fit(self):
+        """Test that noiseless samples of a cubic are recovered exactly"""
+        xs = [x / 4 for x in range(-20, 21)]
+        ys = [2 * x**3 - x**2 + 3 * x - 5 for x in xs]
+        self.assertCoefficientsAlmostEqual(fit_polynomial(xs, ys, 3), [2, -1, 3, -5])
+        
+        fit = PolynomialFit(3)
+        for x, y in zip(xs, ys):
+            fit.add(x, y)
+        self.assertCoefficientsAlmostEqual(fit.polynomial(), [2, -1, 3, -5])
+        self.assertAlmostEqual(fit.residual(), 0)
+        self.assertEqual(fit.count, len(xs))
+
+    def test_remove_matches_refit(self):
+        """Test that removing samples gives the same fit as refitting the rest"""
+        rng = random.Random(3)
+        xs = [rng.uniform(0, 10) for _ in range(200)]
+        ys = [x**3 - 4 * x + rng.gauss(0, 1) for x in xs]
+        
+        fit = PolynomialFit(3, center=5, scale=5)
+        fit.update(xs, ys)
+        for x, y in zip(xs[:80], ys[:80]):
+            fit.remove(x, y)
+        
+        refit = PolynomialFit(3, center=5, scale=5)
+        refit.update(xs[80:], ys[80:])
+        self.assertCoefficientsAlmostEqual(fit.polynomial(), list(refit.polynomial().coeffs))
+        self.assertAlmostEqual(fit.residual(), refit.residual(), places=6)
+        
+        with self.assertRaises(ValueError):
+            PolynomialFit(1).remove(1.0, 2.0)
+
+    def test_forgetting(self):
+        """Test that a windowed fit follows a change in the stream"""
+        fit = PolynomialFit(1, window=20)
+        for i in range(1000):
+            x = i / 100
+            fit.add(x, x if i < 500 else 3 * x - 10)
+        self.assertCoefficientsAlmostEqual(fit.polynomial(), [3, -10], places=6)
+        
+        # Adding one by one and as a block weight the samples the same way
+        block = PolynomialFit(1, window=20)
+        block.update([i / 100 for i in range(1000)], [i / 100 if i < 500 else 3 * i / 100 - 10 for i in range(1000)])
+        self.assertCoefficientsAlmostEqual(block.polynomial(), list(fit.polynomial().coeffs), places=6)
+
+    def test_update_without_numpy(self):
+        """Test the per-sample fallback of update"""
+        xs = [0, 1, 2, 3, 4]
+        ys = [1, 3, 5, 7, 9]
+        with patch.object(fitting, 'optional_import', lambda name: None):
+            self.assertCoefficientsAlmostEqual(fit_polynomial(xs, ys, 1), [2, 1])
+            fit = PolynomialFit(1)
+            fit.update(xs, ys, [1, 1, 1, 1, 0])
+            self.assertCoefficientsAlmostEqual(fit.polynomial(), [2, 1])
+
+    def test_underdetermined(self):
+        """Test that too few samples for the degree are reported"""
+        fit = PolynomialFit(3)
+        fit.update([1, 2], [1, 2])
+        with self.assertRaises(ValueError):
+            fit.polynomial()
+        with self.assertRaises(ValueError):
+            PolynomialFit(3, forgetting=0)
+
+if __name__ == '__main__':
+    unittest.main()
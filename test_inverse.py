@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+import inverse
+from inverse import InverseEvaluator
+
+class TestInverse(unittest.TestCase):
+    """Tests for the fixed-polynomial inverse evaluator in inverse.py"""
+
+    def test_segments(self):
+        """Test that each monotone segment that reaches y contributes one solution"""
+        # x^3 - 3x has critical points at -1 and 1 with f(-1) = 2, f(1) = -2
+        ev = InverseEvaluator([1, 0, -3, 0])
+        self.assertEqual(ev.critical_points, [-1.0, 1.0])
+        self.assertEqual(len(ev.segments), 3)
+        solutions = ev.solve(0)
+        self.assertEqual(len(solutions), 3)
+        for x, expected in zip(solutions, (-3 ** 0.5, 0.0, 3 ** 0.5)):
+            self.assertAlmostEqual(x, expected, places=12)
+        self.assertEqual(len(ev.solve(5)), 1)
+
+        # Critical values are hit exactly instead of converging slowly
+        self.assertEqual(ev.solve(2.0), [-1.0, 2.0])
+        self.assertEqual(ev.solve(-2.0), [-2.0, 1.0])
+
+    def test_solutions(self):
+        """Test that every solution satisfies f(x) = y, with and without tables"""
+        ys = [i * 0.37 - 20 for i in range(109)]
+        for coeffs in ([1, 0, -3, 0], [2, -1, 5, 3], [-1, 6, -11, 6]):
+            for table_size in (0, 64):
+                ev = InverseEvaluator(coeffs, table_size=table_size)
+                for y, solutions in zip(ys, ev.solve_batch(ys)):
+                    self.assertTrue(solutions)
+                    self.assertEqual(solutions, sorted(solutions))
+                    for x in solutions:
+                        self.assertAlmostEqual(ev.f(x), y, delta=1e-12 * max(1, abs(y), abs(x) ** 3))
+
+    def test_pure_python(self):
+        """Test that the batch results without NumPy match the vectorized ones"""
+        ys = [i * 0.5 - 10 for i in range(41)]
+        expected = InverseEvaluator([1, 0, -3, 0], table_size=32).solve_batch(ys)
+        with patch.object(inverse, 'optional_import', lambda name: None):
+            result = InverseEvaluator([1, 0, -3, 0], table_size=32).solve_batch(ys)
+        self.assertEqual(len(result), len(expected))
+        for xs, expected_xs in zip(result, expected):
+            self.assertEqual(len(xs), len(expected_xs))
+            for x, expected_x in zip(xs, expected_xs):
+                self.assertAlmostEqual(x, expected_x, places=12)
+
+    def test_tables(self):
+        """Test that interpolation tables cut the iterations to a few per solution"""
+        ys = [i * 0.01 - 1.5 for i in range(300)]
+        ev = InverseEvaluator([2, -1, 5, 3], table_size=64)
+        solutions = sum(len(xs) for xs in ev.solve_batch(ys))
+        self.assertEqual(ev.queries, len(ys))
+        self.assertLessEqual(ev.iterations / solutions, 4)
+
+    def test_invalid(self):
+        """Test that constant polynomials and degenerate tables are rejected"""
+        with self.assertRaises(ValueError):
+            InverseEvaluator([0, 0, 0, 5])
+        with self.assertRaises(ValueError):
+            InverseEvaluator([1, 0, 0, float('nan')])
+        with self.assertRaises(ValueError):
+            InverseEvaluator([1, 0, -3, 0], table_size=1)
+
+if __name__ == '__main__':
+    unittest.main()
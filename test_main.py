@@ -76,5 +76,73 @@ class TestMain(unittest.TestCase):
             # Restore stdout
             sys.stdout = sys.__stdout__
 
+    @patch('builtins.input')
+    def test_finding_complex_roots(self, mock_input):
+        """Test that the numeric solver reports complex roots without verifying them"""
+        # x^3 - 1 has a real root at 1 and a complex conjugate pair
+        mock_input.side_effect = ['1', '0', '0', '-1', '?']
+        
+        # Capture stdout
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        
+        try:
+            import main
+            
+            with patch('utils.clear_console'):
+                main.main()
+            
+            output = captured_output.getvalue()
+            
+            self.assertIn("x1 = 1", output)
+            self.assertIn("x2 = -0.5 + 0.866i", output)
+            self.assertIn("x3 = -0.5 - 0.866i", output)
+            self.assertIn("f(x1) = f(1) = 0", output)
+            self.assertIn("Some solutions are complex", output)
+        finally:
+            # Restore stdout
+            sys.stdout = sys.__stdout__
+
+    @patch('builtins.input')
+    def test_exact_timeout_fallback(self, mock_input):
+        """Test that an exact solve exceeding its time limit shows numeric solutions"""
+        mock_input.side_effect = ['1', '-6', '11', '-6', '?']
+        
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        
+        try:
+            import main
+            
+            with patch('utils.clear_console'):
+                main.main(exact=True, timeout=0.001)
+            
+            output = captured_output.getvalue()
+            
+            self.assertIn("did not finish within 0.001 s", output)
+            self.assertIn("x1 = 1", output)
+            self.assertIn("f(x3) = f(3) = 0", output)
+        finally:
+            sys.stdout = sys.__stdout__
+
+    def test_startup_budget(self):
+        """Test that the evaluation-only path stays within its start-up budget"""
+        from benchmark import measure_startup
+        
+        # Import main and evaluate f(x) once, as a short-lived invocation would
+        startup = measure_startup("main", "import io, contextlib\n"
+                                          "with contextlib.redirect_stdout(io.StringIO()):\n"
+                                          "    main.calculate_value(1, 2, 3, 4, 2)")
+        
+        # Heavy optional dependencies are only loaded when actually needed
+        self.assertNotIn("sympy", startup["modules"])
+        self.assertNotIn("numpy", startup["modules"])
+        
+        # Budgets leave plenty of headroom over the measured cost (about 50 ms
+        # and 12 MiB), but fail if sympy (~600 ms, ~65 MiB) sneaks back in
+        self.assertLess(startup["import_us"], 250000)
+        if startup["rss_kb"] is not None:
+            self.assertLess(startup["rss_kb"], 40 * 1024)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+import metrics
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the opt-in instrumentation in metrics.py"""
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_wrap_records_calls(self):
+        """Test that wrapped functions record calls, iterations and failures"""
+        def solve(x):
+            if x < 0:
+                raise ValueError("negative")
+            return (x or None, 3)
+        
+        wrapped = metrics.wrap(solve, "solve", iterations=lambda r: r[1],
+                               failure=lambda r: "no_root" if r[0] is None else None)
+        self.assertEqual(wrapped(2), (2, 3))
+        self.assertEqual(wrapped(0), (None, 3))
+        with self.assertRaises(ValueError):
+            wrapped(-1)
+        self.assertIs(wrapped.__wrapped__, solve)
+        self.assertEqual(wrapped.__name__, "solve")
+        
+        entry = metrics.snapshot()["solve"]
+        self.assertEqual(entry["calls"], 3)
+        self.assertEqual(sum(entry["latency_buckets"]), 3)
+        self.assertEqual(entry["iterations"], 6)
+        self.assertEqual(entry["max_iterations"], 3)
+        self.assertEqual(entry["failures"], {"no_root": 1, "ValueError": 1})
+        
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_instrument_disabled(self):
+        """Test that instrument() leaves functions untouched when disabled"""
+        def f(x):
+            return x
+        with patch.object(metrics, 'ENABLED', False):
+            self.assertIs(metrics.instrument()(f), f)
+        with patch.object(metrics, 'ENABLED', True):
+            self.assertIsNot(metrics.instrument()(f), f)
+
+    def test_exports(self):
+        """Test the JSON and Prometheus exports"""
+        metrics.record("calculate_fx", 2e-6)
+        metrics.record("calculate_fx", 0.2)
+        metrics.record("iterate_root", 1e-5, iterations=4, failure="not_converged")
+        
+        data = json.loads(metrics.to_json())
+        self.assertEqual(data["latency_buckets_seconds"][-1], "+Inf")
+        self.assertEqual(data["functions"]["calculate_fx"]["calls"], 2)
+        
+        text = metrics.to_prometheus()
+        self.assertIn('ltc_calls_total{function="calculate_fx"} 2', text)
+        self.assertIn('ltc_iterations_total{function="iterate_root"} 4', text)
+        self.assertIn('ltc_failures_total{function="iterate_root",reason="not_converged"} 1', text)
+        self.assertIn('ltc_latency_seconds_bucket{function="calculate_fx",le="5e-06"} 1', text)
+        self.assertIn('ltc_latency_seconds_bucket{function="calculate_fx",le="+Inf"} 2', text)
+        self.assertIn('ltc_latency_seconds_count{function="calculate_fx"} 2', text)
+
+    def test_environment_opt_in(self):
+        """Test that LTC_METRICS instruments the calculator and exports at exit"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            env = dict(os.environ, LTC_METRICS="1", LTC_METRICS_FILE=path)
+            code = ("import polynomial\n"
+                    "polynomial.newton_raphson(1, -6, 11, -6, 0.3)\n"
+                    "polynomial.newton_raphson(1, 0, 0, 1, 0)\n"
+                    "polynomial.calculate_fx(1, 2, 3, 4, 5)\n")
+            subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
+            with open(path) as f:
+                functions = json.load(f)["functions"]
+        self.assertEqual(functions["calculate_fx"]["calls"], 1)
+        self.assertEqual(functions["newton_raphson"]["failures"], {"not_converged": 1})
+        self.assertEqual(functions["iterate_root"]["calls"], 2)
+        self.assertGreater(functions["iterate_root"]["iterations"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
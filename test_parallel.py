@@ -0,0 +1,89 @@
+import random
+import unittest
+from array import array
+from unittest.mock import patch
+import parallel
+import polynomial
+import roots
+from parallel import evaluate_parallel, solve_cubic_parallel
+from polynomial import calculate_fx
+from roots import solve_cubic, STATUS_OK
+
+class TestParallel(unittest.TestCase):
+    """Tests for the process-pool drivers in parallel.py"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.xs = [rng.uniform(-5, 5) for _ in range(1000)]
+        self.table = [[rng.uniform(-10, 10) for _ in range(4)] for _ in range(300)]
+
+    def test_evaluate_parallel(self):
+        """Test that chunked evaluation keeps the input order"""
+        result = evaluate_parallel(3.5, 2.1, -0.5, 0.02, self.xs, workers=2, chunk_size=128)
+        self.assertEqual(len(result), len(self.xs))
+        for x, got in zip(self.xs, result):
+            self.assertAlmostEqual(got, calculate_fx(3.5, 2.1, -0.5, 0.02, x), places=9)
+
+        # Inputs that fit in one chunk are evaluated in-process
+        result = evaluate_parallel(1, 0, 0, 0, [1, 2, 3], workers=2)
+        self.assertEqual(list(result), [1, 8, 27])
+
+    def test_solve_cubic_parallel(self):
+        """Test that chunked solving matches solve_cubic row by row"""
+        found, real_mask, status = solve_cubic_parallel(self.table, workers=2, chunk_size=64)
+        self.assertEqual(len(found), len(self.table))
+        for row, coeffs in enumerate(self.table):
+            expected = solve_cubic(*coeffs)
+            for got, want in zip(found[row], expected):
+                self.assertAlmostEqual(abs(complex(got) - complex(want)), 0, places=8)
+            self.assertEqual(list(real_mask[row]), [not isinstance(r, complex) for r in expected])
+            self.assertEqual(status[row], STATUS_OK)
+
+    def test_without_numpy(self):
+        """Test the shared-memory layout used when NumPy is not installed"""
+        def run_in_process(func, chunks, workers, *args):
+            # Same chunks as the pool, run here so the patches below certainly apply
+            for start, stop in chunks:
+                func(*args, start, stop)
+
+        for runner in (parallel._run_chunks, run_in_process):
+            # The workers call into polynomial and roots, so those must not see NumPy either
+            with patch.object(parallel, 'optional_import', lambda name: None), \
+                 patch.object(polynomial, 'optional_import', lambda name: None), \
+                 patch.object(roots, 'optional_import', lambda name: None), \
+                 patch.object(parallel, '_run_chunks', runner):
+                result = evaluate_parallel(2, 3, 4, 5, self.xs, workers=2, chunk_size=256)
+                found, real_mask, status = solve_cubic_parallel(self.table[:50], workers=2, chunk_size=16)
+
+            self.assertIsInstance(result, array)
+            for x, got in zip(self.xs, result):
+                self.assertAlmostEqual(got, calculate_fx(2, 3, 4, 5, x), places=9)
+            for row, coeffs in enumerate(self.table[:50]):
+                expected = solve_cubic(*coeffs)
+                for got, want in zip(found[row], expected):
+                    self.assertAlmostEqual(abs(got - complex(want)), 0, places=8)
+                self.assertEqual(real_mask[row], [not isinstance(r, complex) for r in expected])
+            self.assertEqual(status, [STATUS_OK] * 50)
+
+    def test_worker_errors(self):
+        """Test that a failing worker reports its own error, not a BufferError from closing shared memory"""
+        def run_in_process(func, chunks, workers, *args):
+            for start, stop in chunks:
+                func(*args, start, stop)
+
+        def failing(*args, **kwargs):
+            # Keep views into the shared blocks alive in this frame, as a real failure would
+            held = [memoryview(arg) if not isinstance(arg, (int, float, list)) else arg for arg in args]
+            held.extend(kwargs.values())
+            raise ArithmeticError("worker failed")
+
+        with patch.object(parallel, '_run_chunks', run_in_process):
+            with patch.object(parallel, 'solve_cubic_batch', failing):
+                with self.assertRaisesRegex(ArithmeticError, "worker failed"):
+                    solve_cubic_parallel(self.table, workers=2, chunk_size=64)
+            with patch.object(parallel, 'calculate_fx_batch', failing):
+                with self.assertRaisesRegex(ArithmeticError, "worker failed"):
+                    evaluate_parallel(1, 0, 0, 0, self.xs, workers=2, chunk_size=128)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
+import io
+import random
 import unittest
-from polynomial import calculate_fx, newton_raphson
+from array import array
+from unittest.mock import patch
+import polynomial
+from polynomial import Polynomial, calculate_fx, calculate_fx_batch, compile_fx, newton_raphson, find_root
 
 class TestPolynomial(unittest.TestCase):
     """Tests for the polynomial functions in polynomial.py"""
@@ -20,6 +25,10 @@ class TestPolynomial(unittest.TestCase):
         
         # Test case 5: Zero coefficients and x
         self.assertEqual(calculate_fx(0, 0, 0, 5, 0), 5)  # Just the constant term
+        
+        # Test case 6: Exact integers and complex values are not forced through float64
+        self.assertEqual(calculate_fx(10 ** 20, 0, 0, 1, 10 ** 5), 10 ** 35 + 1)
+        self.assertEqual(calculate_fx(1j, 0, 0, 0, 2), 8j)
 
     def test_newton_raphson(self):
         """Test that newton_raphson correctly finds roots"""
@@ -57,12 +66,153 @@ class TestPolynomial(unittest.TestCase):
         root = newton_raphson(0, 0, 0, 1, 0)  # f(x) = 1, f'(x) = 0
         self.assertIsNone(root)
         
-        # Test case 5: Tolerance test
+        # Test case 5: Halley and Laguerre steps
+        for method in ("halley", "laguerre"):
+            self.assertAlmostEqual(newton_raphson(1, -6, 11, -6, 0.3, method=method), 1, places=12)
+        
+        # Test case 6: Tolerance test
         # Create a function where the root is very near zero but not exactly
         root = newton_raphson(1, 0, 0, 1e-10, 0, tol=1e-9)
         if root is not None:  # If a root is found
             fx = calculate_fx(1, 0, 0, 1e-10, root)
             self.assertLess(abs(fx), 1e-8)  # Should be very close to zero
 
+    def test_calculate_fx_batch(self):
+        """Test that calculate_fx_batch matches calculate_fx for every input"""
+        xs = [-2.5, -1, 0, 0.5, 2, 10]
+        expected = [calculate_fx(3.5, 2.1, -0.5, 0.02, x) for x in xs]
+        
+        # Test case 1: List input
+        result = calculate_fx_batch(3.5, 2.1, -0.5, 0.02, xs)
+        for got, want in zip(result, expected):
+            self.assertAlmostEqual(got, want, places=9)
+        
+        # Test case 2: Generator input
+        result = calculate_fx_batch(3.5, 2.1, -0.5, 0.02, (x for x in xs))
+        self.assertEqual(len(result), len(xs))
+        
+        # Test case 3: Writing into a preallocated buffer returns that buffer
+        out = array('d', [0.0] * len(xs))
+        result = calculate_fx_batch(3.5, 2.1, -0.5, 0.02, array('d', xs), out=out)
+        self.assertIs(result, out)
+        for got, want in zip(out, expected):
+            self.assertAlmostEqual(got, want, places=9)
+        
+        # Test case 4: Evaluating in place over the input buffer
+        buf = array('d', xs)
+        calculate_fx_batch(3.5, 2.1, -0.5, 0.02, buf, out=buf)
+        for got, want in zip(buf, expected):
+            self.assertAlmostEqual(got, want, places=9)
+        
+        # Test case 5: Mismatched output length
+        with self.assertRaises(ValueError):
+            calculate_fx_batch(1, 0, 0, 0, xs, out=array('d', [0.0]))
+
+        # Test case 6: A list passed as out is filled too, like the pure-Python fallback does
+        out = [0.0] * len(xs)
+        self.assertIs(calculate_fx_batch(3.5, 2.1, -0.5, 0.02, xs, out=out), out)
+        for got, want in zip(out, expected):
+            self.assertIsInstance(got, float)
+            self.assertAlmostEqual(got, want, places=9)
+
+    def test_calculate_fx_batch_without_numpy(self):
+        """Test the pure-Python fallback of calculate_fx_batch"""
+        xs = [-2, -1, 0, 1, 2]
+        with patch.object(polynomial, 'optional_import', lambda name: None):
+            result = calculate_fx_batch(2, 3, 4, 5, xs)
+            self.assertIsInstance(result, array)
+            self.assertEqual(list(result), [calculate_fx(2, 3, 4, 5, x) for x in xs])
+            
+            out = [0.0] * len(xs)
+            self.assertIs(calculate_fx_batch(1, 0, 0, 0, iter(xs), out=out), out)
+            self.assertEqual(out, [-8, -1, 0, 1, 8])
+            
+            with self.assertRaises(ValueError):
+                calculate_fx_batch(1, 0, 0, 0, xs, out=[0.0])
+
+    def test_polynomial_class(self):
+        """Test evaluation, arithmetic and composition of Polynomial"""
+        p = Polynomial([0, 0, 1, -3, 2])  # x^2 - 3x + 2, leading zeros dropped
+        self.assertEqual(p.degree, 2)
+        self.assertEqual(list(p.coeffs), [1, -3, 2])
+        self.assertEqual(p(3), 2)
+        self.assertEqual(str(p), polynomial.polynomial_to_string([1, -3, 2]))
+        self.assertEqual(p.derivative(), Polynomial([2, -3]))
+        self.assertEqual(Polynomial([5]).derivative(), Polynomial([0]))
+        
+        q = Polynomial([1, 1])  # x + 1
+        self.assertEqual(p + q, Polynomial([1, -2, 3]))
+        self.assertEqual(p - q, Polynomial([1, -4, 1]))
+        self.assertEqual(1 - q, Polynomial([-1, 0]))
+        self.assertEqual(p * q, Polynomial([1, -2, -1, 2]))
+        self.assertEqual(2 * q, Polynomial([2, 2]))
+        self.assertEqual(p.compose(q), Polynomial([1, -1, 0]))  # (x+1)^2 - 3(x+1) + 2
+        self.assertEqual(p.real_roots(), [1.0, 2.0])
+        self.assertEqual([round(r.real, 12) for r in p.roots()[0]], [1.0, 2.0])
+        
+        xs = [-2.0, 0.5, 4.0]
+        self.assertEqual(list(p.evaluate_batch(xs)), [p(x) for x in xs])
+        with patch.object(polynomial, 'optional_import', lambda name: None):
+            self.assertEqual(list(p.evaluate_batch(xs)), [p(x) for x in xs])
+    
+    def test_cubic_helpers_match_polynomial(self):
+        """Test that the inline cubic fast paths agree with Polynomial on random inputs"""
+        rng = random.Random(7)
+        for _ in range(200):
+            coeffs = [rng.choice((0, 1)) * rng.uniform(-10, 10)] + [rng.uniform(-1e3, 1e3) for _ in range(3)]
+            p = Polynomial(coeffs)
+            f = compile_fx(*coeffs)
+            xs = [rng.uniform(-50, 50) for _ in range(8)]
+            for x in xs:
+                self.assertEqual(calculate_fx(*coeffs, x), p(x))
+                self.assertEqual(f(x), p(x))
+            self.assertEqual(list(calculate_fx_batch(*coeffs, xs)), list(p.evaluate_batch(xs)))
+            with patch.object(polynomial, 'optional_import', lambda name: None):
+                self.assertEqual(list(calculate_fx_batch(*coeffs, xs)), list(p.evaluate_batch(xs)))
+    
+    def test_polynomial_karatsuba(self):
+        """Test that Karatsuba multiplication matches the schoolbook product"""
+        rng = random.Random(11)
+        for n, m in ((40, 40), (100, 37), (65, 90)):
+            p = Polynomial([rng.randint(-9, 9) for _ in range(n)] + [1])
+            q = Polynomial([rng.randint(-9, 9) for _ in range(m)] + [1])
+            expected = polynomial._schoolbook_multiply(p.coeffs.tolist(), q.coeffs.tolist())
+            self.assertEqual(p * q, Polynomial(expected))
+
+    def test_compile(self):
+        """Test that compiled evaluators match the interpreted polynomial"""
+        f = compile_fx(2, -3, 4, 5)
+        fused = compile_fx(2, -3, 4, 5, derivative=True)
+        for x in (-2.5, 0.0, 1.0, 3.75):
+            self.assertEqual(f(x), calculate_fx(2, -3, 4, 5, x))
+            self.assertEqual(fused(x), (f(x), 6 * x**2 - 6 * x + 4))
+        self.assertEqual(list(f.batch([0, 1])), [5, 8])
+        
+        # Higher and lower degrees, zero and non-finite coefficients
+        p = Polynomial([1, 0, -2, 0, 0, 7, -1])
+        self.assertEqual(p.compile()(1.5), p(1.5))
+        self.assertEqual(p.compile(derivative=True)(1.5), (p(1.5), p.derivative()(1.5)))
+        self.assertEqual(Polynomial([4]).compile(derivative=True)(2), (4, 0))
+        self.assertEqual(Polynomial([float('inf'), 1]).compile()(1), float('inf'))
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_find_root(self, mock_stdout):
+        """Test that find_root finds every real root without a fixed starting point"""
+        # Test case 1: x^3 - 1 has f'(0) = 0, which used to defeat the x0 = 0 seed
+        self.assertAlmostEqual(find_root(1, 0, 0, -1), 1.0, places=12)
+        self.assertIn("The value of X that makes f(x) = 0 is: 1", mock_stdout.getvalue())
+        
+        # Test case 2: Three real roots, the smallest is returned
+        self.assertAlmostEqual(find_root(1, -6, 11, -6), 1.0, places=12)
+        self.assertIn("are: 1, 2, 3", mock_stdout.getvalue())
+        
+        # Test case 3: A narrow complex pair 1 +- 1e-5i is not reported as a double root
+        self.assertAlmostEqual(find_root(1, -7, 11 + 1e-10, -5 * (1 + 1e-10)), 5.0, places=12)
+        self.assertIn("The value of X that makes f(x) = 0 is: 5", mock_stdout.getvalue())
+        
+        # Test case 4: Quadratic without real roots
+        self.assertIsNone(find_root(0, 1, 0, 1))
+        self.assertIn("no real roots", mock_stdout.getvalue())
+
 if __name__ == '__main__':
     unittest.main()
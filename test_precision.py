@@ -0,0 +1,123 @@
+import math
+import unittest
+from fractions import Fraction
+from unittest.mock import patch
+import precision
+from precision import (AdaptiveSolver, TIER_EXACT, TIER_FLOAT, TIER_MPMATH, UNVERIFIED,
+                       compensated_horner, solve_adaptive)
+
+class TestPrecision(unittest.TestCase):
+    """Tests for the tiered adaptive-precision solver in precision.py"""
+
+    def assertCertified(self, coeffs, roots, errors):
+        """Every true root lies within the reported error of a returned root"""
+        self.assertEqual(len(roots), len(coeffs) - 1)
+        for root, error in zip(roots, errors):
+            self.assertLessEqual(error, 1e-10 * max(abs(root), 1))
+
+    def test_compensated_horner(self):
+        """Test that compensated Horner is accurate where plain Horner is not, and its bound holds"""
+        # (x - 1)^3 expanded, next to its triple root
+        coeffs = [1.0, -3.0, 3.0, -1.0]
+        for x in (1 + 2**-20, 1 - 3 * 2**-30, 0.999, 2.5):
+            value, bound = compensated_horner(coeffs, x)
+            exact = (Fraction(x) - 1) ** 3
+            self.assertLessEqual(abs(Fraction(value) - exact), Fraction(bound))
+        value, _ = compensated_horner(coeffs, 1 + 2**-20)
+        self.assertEqual(value, 2.0 ** -60)
+
+    def test_float_tier(self):
+        """Test that well-conditioned polynomials are certified without escalating"""
+        solver = AdaptiveSolver()
+        for coeffs in ([1, -6, 11, -6], [1, 0, 0, -2], [2, 0, 1, 0], [1, 2, 3, 4, 5, 6]):
+            roots, errors, tier = solver.solve(coeffs)
+            self.assertEqual(tier, TIER_FLOAT)
+            self.assertCertified(coeffs, roots, errors)
+        roots, _, _ = solver.solve([1, -6, 11, -6])
+        for root, exact in zip(roots, (1, 2, 3)):
+            self.assertAlmostEqual(root, exact, places=12)
+        self.assertEqual(solver.counts[TIER_FLOAT], 5)
+        self.assertEqual(solver.stats()["escalated"], 0)
+        
+        with self.assertRaises(ValueError):
+            solver.solve([1, float('inf'), 0, 0])
+
+    def test_escalation(self):
+        """Test that only rows failing the float64 check are escalated"""
+        solver = AdaptiveSolver()
+        # (x - 1)^2 (x - 2): the float64 double root fails the check, exact residuals prove it
+        roots, errors, tier = solver.solve([1, -4, 5, -2])
+        self.assertEqual(tier, TIER_EXACT)
+        self.assertEqual(roots, [1.0, 1.0, 2.0])
+        self.assertEqual(errors, [0.0, 0.0, 0.0])
+        
+        # (3x - 1)^2: 1/3 is not a float, so only extra precision can certify the cluster
+        roots, errors, tier = solver.solve([9, -6, 1])
+        self.assertEqual(tier, TIER_MPMATH)
+        self.assertCertified([9, -6, 1], roots, errors)
+        for root in roots:
+            self.assertAlmostEqual(root, 1 / 3, places=14)
+        
+        stats = solver.stats()
+        self.assertEqual((stats[TIER_FLOAT], stats[TIER_EXACT], stats[TIER_MPMATH]), (0, 1, 1))
+        self.assertEqual(stats["escalation_rate"], 1.0)
+
+    def test_mpmath_negative_and_complex(self):
+        """Test that the mpmath tier certifies clusters with negative and complex roots"""
+        self.assertEqual(precision._fraction(precision.optional_import("mpmath").mpf(-3.5)), Fraction(-7, 2))
+
+        # (3x + 1)^2
+        roots, errors, tier = AdaptiveSolver().solve([9, 6, 1])
+        self.assertEqual(tier, TIER_MPMATH)
+        self.assertCertified([9, 6, 1], roots, errors)
+        for root in roots:
+            self.assertAlmostEqual(root, -1 / 3, places=14)
+
+        # (9x^2 + 6x + 2)^2: a double complex pair at (-1 +- i) / 3
+        coeffs = [81, 108, 72, 24, 4]
+        roots, errors, tier = AdaptiveSolver().solve(coeffs)
+        self.assertEqual(tier, TIER_MPMATH)
+        self.assertCertified(coeffs, roots, errors)
+        for root in roots:
+            self.assertAlmostEqual(root.real, -1 / 3, places=14)
+            self.assertAlmostEqual(abs(root.imag), 1 / 3, places=14)
+
+    def test_without_mpmath(self):
+        """Test that rows the exact tier cannot certify are reported as unverified without mpmath"""
+        with patch.object(precision, 'optional_import', lambda name: None):
+            solver = AdaptiveSolver()
+        self.assertIsNone(solver.mpmath)
+        self.assertEqual(solver.solve([1, 2, 1])[2], TIER_EXACT)
+        roots, errors, tier = solver.solve([9, -6, 1])
+        self.assertEqual(tier, UNVERIFIED)
+        self.assertEqual(len(roots), 2)
+        self.assertTrue(all(math.isinf(error) for error in errors))
+        self.assertEqual(solver.counts[UNVERIFIED], 1)
+
+    def test_batch(self):
+        """Test that batch solving matches single solves row by row"""
+        rows = [[1, -6, 11, -6], [1, -4, 5, -2], [9, -6, 1, 0], [1, 2, 3, 4, 5], [0, 0, 0, 5], [0, 0, 2, -1]]
+        solver = AdaptiveSolver()
+        roots, errors, tiers = solver.solve_batch(rows)
+        self.assertEqual(tiers, [TIER_FLOAT, TIER_EXACT, TIER_MPMATH, TIER_FLOAT, TIER_FLOAT, TIER_FLOAT])
+        self.assertEqual(roots[4], [])
+        self.assertEqual(roots[5], [0.5])
+        self.assertEqual(roots[2][0], 0.0)
+        for row, found in zip(rows, roots):
+            single = AdaptiveSolver().solve(row)[0]
+            self.assertEqual(len(found), len(single))
+            for a, b in zip(found, single):
+                self.assertAlmostEqual(complex(a), complex(b), places=9)
+        self.assertEqual(solver.stats()["rows"], len(rows))
+        
+        with self.assertRaises(ValueError):
+            solver.solve_batch([[1, 2, 3, 4], [1, float('nan'), 0, 0]])
+
+    def test_solve_adaptive(self):
+        """Test the shared-solver convenience function"""
+        roots, errors, tier = solve_adaptive([1, 0, -2])
+        self.assertEqual(tier, TIER_FLOAT)
+        self.assertAlmostEqual(roots[1], math.sqrt(2), places=14)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import json
+import sys
+import unittest
+import main
+import polynomial
+from report import ReportRenderer, QUIET, RESULT, STEPS
+
+class CountingWriter(io.StringIO):
+    """StringIO that counts write calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+class TestReport(unittest.TestCase):
+    """Tests for the buffered report renderer in report.py"""
+
+    def test_steps(self):
+        """Test that the step-by-step report keeps the calculator layout and is written at once"""
+        out = CountingWriter()
+        sys.stdout = out
+        try:
+            result = main.calculate_value(1, 2, 3, 4, 2)
+        finally:
+            sys.stdout = sys.__stdout__
+        self.assertEqual(result, 26)
+        self.assertEqual(out.writes, 1)
+        self.assertEqual(out.getvalue().splitlines(), [
+            "The formula is: f(x) = 1x^3 + 2x^2 + 3x + 4",
+            "Calculating step by step:",
+            "1 * (2^3) = 8",
+            "+ 2 * (2^2) = 8",
+            "+ 3 * 2 = 6",
+            "+ 4 = 4",
+            "The value of f(x) is: 26",
+        ])
+        
+        out = io.StringIO()
+        with polynomial.default_renderer(out) as renderer:
+            polynomial.calculate_and_display_result(1, 2, 3, 4, 2, renderer)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1], "**************************")
+        self.assertEqual(lines[-2:], [" ", "The value of f(x) is: 26"])
+
+    def test_buffering(self):
+        """Test that many evaluations are collected into few writes"""
+        out = CountingWriter()
+        with ReportRenderer(out, RESULT, buffer_size=100) as renderer:
+            for x in range(250):
+                main.calculate_value(1, 0, 0, 0, x, renderer)
+            self.assertEqual(out.writes, 2)
+        self.assertEqual(out.writes, 3)
+        self.assertEqual(renderer.count, 250)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 250)
+        self.assertEqual(lines[3], "f(3) = 27")
+
+    def test_quiet(self):
+        """Test that quiet mode only computes"""
+        out = CountingWriter()
+        with ReportRenderer(out, "quiet") as renderer:
+            self.assertEqual(polynomial.calculate_and_display_result(2, 0, 0, 1, 3, renderer), 55)
+        self.assertEqual(renderer.verbosity, QUIET)
+        self.assertEqual(out.writes, 0)
+        self.assertEqual(renderer.count, 1)
+
+    def test_jsonl(self):
+        """Test machine-readable output"""
+        out = io.StringIO()
+        with ReportRenderer(out, STEPS, "jsonl") as renderer:
+            main.calculate_value(1, 2, 3, 4, 0.5, renderer)
+        with ReportRenderer(out, RESULT, "jsonl") as renderer:
+            main.calculate_value(1, 2, 3, 4, 1 / 3, renderer)
+        first, second = (json.loads(line) for line in out.getvalue().splitlines())
+        self.assertEqual(first["fx"], 6.125)
+        self.assertEqual(first["terms"], [0.125, 0.5, 1.5, 4])
+        self.assertNotIn("terms", second)
+        # Full precision, no rounding to display decimals
+        self.assertEqual(second["x"], 1 / 3)
+        
+        with self.assertRaises(ValueError):
+            ReportRenderer(out, "loud")
+        with self.assertRaises(ValueError):
+            ReportRenderer(out, fmt="xml")
+
+if __name__ == '__main__':
+    unittest.main()
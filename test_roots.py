@@ -0,0 +1,381 @@
+import math
+import random
+import unittest
+from unittest.mock import patch
+import roots
+from polynomial import calculate_fx
+from roots import (
+    solve_linear,
+    solve_quadratic,
+    solve_cubic,
+    solve_cubic_batch,
+    root_bound,
+    descartes_bound,
+    count_real_roots,
+    find_real_roots,
+    find_all_roots,
+    find_all_roots_batch,
+    iterate_root,
+    STATUS_OK,
+    STATUS_NOT_CONVERGED,
+    STATUS_DEGENERATE,
+    STATUS_INVALID
+)
+
+class TestRoots(unittest.TestCase):
+    """Tests for the numeric root solvers in roots.py"""
+
+    def assertRootsAlmostEqual(self, roots, expected, places=9):
+        """Check that two root lists match element by element"""
+        self.assertEqual(len(roots), len(expected), f"{roots} != {expected}")
+        for got, want in zip(roots, expected):
+            self.assertAlmostEqual(abs(complex(got) - complex(want)), 0, places=places, msg=f"{roots} != {expected}")
+
+    def test_solve_cubic_three_real_roots(self):
+        """Test cubics with three distinct real roots"""
+        # (x-1)(x-2)(x-3) = x^3 - 6x^2 + 11x - 6
+        self.assertRootsAlmostEqual(solve_cubic(1, -6, 11, -6), [1, 2, 3])
+
+        # 2(x+4)(x-0.5)(x-10) = 2x^3 - 13x^2 - 74x + 40
+        roots = solve_cubic(2, -13, -74, 40)
+        self.assertRootsAlmostEqual(roots, [-4, 0.5, 10])
+        for root in roots:
+            self.assertIsInstance(root, float)
+
+    def test_solve_cubic_complex_roots(self):
+        """Test cubics with one real root and a complex conjugate pair"""
+        # x^3 - 1 has roots 1 and -0.5 +/- 0.866i
+        roots = solve_cubic(1, 0, 0, -1)
+        self.assertRootsAlmostEqual(roots, [1, complex(-0.5, 3 ** 0.5 / 2), complex(-0.5, -3 ** 0.5 / 2)])
+        self.assertIsInstance(roots[0], float)
+        self.assertIsInstance(roots[1], complex)
+
+        # Every root should make f(x) vanish
+        for root in solve_cubic(2, 3, 4, 5):
+            fx = ((2 * root + 3) * root + 4) * root + 5
+            self.assertLess(abs(fx), 1e-12)
+
+    def test_solve_cubic_repeated_roots(self):
+        """Test cubics with double and triple roots"""
+        # (x-2)^3 = x^3 - 6x^2 + 12x - 8
+        self.assertEqual(solve_cubic(1, -6, 12, -8), [2, 2, 2])
+
+        # (x-1)^2(x+2) = x^3 - 3x + 2
+        self.assertRootsAlmostEqual(solve_cubic(1, 0, -3, 2), [-2, 1, 1])
+
+        # x^3 has a triple root at zero
+        self.assertEqual(solve_cubic(1, 0, 0, 0), [0, 0, 0])
+
+    def test_solve_cubic_degenerate(self):
+        """Test that a zero leading coefficient falls back to lower degrees"""
+        # Quadratic x^2 - 3x + 2
+        self.assertRootsAlmostEqual(solve_cubic(0, 1, -3, 2), [1, 2])
+
+        # Quadratic x^2 + 1 with complex roots
+        self.assertRootsAlmostEqual(solve_cubic(0, 1, 0, 1), [1j, -1j])
+
+        # Linear 2x + 4
+        self.assertEqual(solve_cubic(0, 0, 2, 4), [-2])
+
+        # Constant polynomial has no isolated roots
+        self.assertEqual(solve_cubic(0, 0, 0, 5), [])
+
+    def test_solve_cubic_large_magnitudes(self):
+        """Test that roots of widely scaled cubics stay accurate"""
+        # (x - 1e6)(x - 1)(x + 1e-3), scaled by 1e-5
+        a, b, c, d = 1e-5, -1e-5 * (1e6 + 1 - 1e-3), 1e-5 * (1e6 - 1e3 - 1e-3), 1e-5 * 1e3
+        roots = solve_cubic(a, b, c, d)
+        self.assertEqual(len(roots), 3)
+        self.assertAlmostEqual(roots[0] / -1e-3, 1, places=6)
+        self.assertAlmostEqual(roots[1], 1, places=6)
+        self.assertAlmostEqual(roots[2] / 1e6, 1, places=9)
+
+    def test_solve_cubic_close_and_small_roots(self):
+        """Test that close roots, narrow complex pairs and small roots are not merged"""
+        # Three real roots within 0.13 of each other
+        roots = solve_cubic(1, 11.37051329814426, 43.09213923578069, 54.43188178251509)
+        self.assertRootsAlmostEqual(roots, [-3.841123359917276, -3.8105703692480972, -3.7188195689788865])
+
+        # A narrow complex pair next to a large real root
+        roots = solve_cubic(6.33, 394913.6, -0.0023, 0.0163)
+        self.assertIsInstance(roots[1], complex)
+        self.assertAlmostEqual(roots[0] / -62387.614533971064, 1, places=12)
+        self.assertAlmostEqual(roots[1].imag / 2.0316212982959884e-4, 1, places=9)
+
+        # Two small roots next to a large one
+        roots = solve_cubic(-146.5, 597230, -3.3e-8, -2.1e-7)
+        for got, want in zip(roots, [-5.929783258096185e-07, 5.929783811509657e-07, 4076.6552901023892]):
+            self.assertAlmostEqual(got / want, 1, places=9)
+
+        # Random cubics with coefficients spread over 14 orders of magnitude
+        rng = random.Random(7)
+        for _ in range(500):
+            a, b, c, d = (rng.choice((-1, 1)) * 10 ** rng.uniform(-8, 6) for _ in range(4))
+            for root in solve_cubic(a, b, c, d):
+                r = abs(root)
+                scale = ((abs(a) * r + abs(b)) * r + abs(c)) * r + abs(d)
+                self.assertLess(abs(((a * root + b) * root + c) * root + d), 1e-14 * scale)
+
+    def test_solve_cubic_invalid(self):
+        """Test that non-finite and overflowing coefficients are rejected"""
+        for coeffs in [(math.inf, 1, 1, 1), (1, math.nan, 1, 1), (1e-320, 1, 1, 1)]:
+            with self.assertRaises(ValueError):
+                solve_cubic(*coeffs)
+
+        # Huge but finite coefficients: (x + 1)(x^2 + 1e-308) scaled by 1e308
+        roots = solve_cubic(1e308, 1e308, 1, 1)
+        self.assertRootsAlmostEqual(roots, [-1, 1e-154j, -1e-154j])
+
+    def test_solve_quadratic_and_linear(self):
+        """Test the lower degree solvers"""
+        # Cancellation-prone quadratic: roots 1e8 and 1e-8
+        roots = solve_quadratic(1, -(1e8 + 1e-8), 1)
+        self.assertAlmostEqual(roots[0] / 1e-8, 1, places=12)
+        self.assertAlmostEqual(roots[1] / 1e8, 1, places=12)
+
+        # Double root
+        self.assertEqual(solve_quadratic(1, -4, 4), [2, 2])
+
+        # Linear
+        self.assertEqual(solve_linear(4, -2), [0.5])
+        self.assertEqual(solve_linear(0, 1), [])
+
+    def test_solve_cubic_matches_calculate_fx(self):
+        """Test that real roots satisfy calculate_fx"""
+        for coeffs in [(3.5, 2.1, -0.5, 0.02), (1, -3, 3, -1), (-2, 0, 5, 1)]:
+            for root in solve_cubic(*coeffs):
+                if isinstance(root, float):
+                    self.assertLess(abs(calculate_fx(*coeffs, root)), 1e-9)
+
+    @unittest.skipIf(roots.optional_import('numpy') is None, "NumPy is not installed")
+    def test_solve_cubic_batch(self):
+        """Test that the vectorized batch solver matches solve_cubic row by row"""
+        rng = random.Random(1234)
+        table = [[rng.uniform(-10, 10) for _ in range(4)] for _ in range(500)]
+        table += [
+            [1, -6, 12, -8],   # Triple root
+            [1, 0, -3, 2],     # Double root
+            [0, 1, 0, 1],      # Quadratic with complex roots
+            [0, 0, 2, 4],      # Linear
+            [0, 0, 0, 1],      # Constant
+            [math.nan, 1, 1, 1],
+        ]
+        found, real_mask, status = solve_cubic_batch(table)
+        self.assertEqual(found.shape, (len(table), 3))
+        self.assertEqual(real_mask.shape, (len(table), 3))
+        
+        for row, coeffs in enumerate(table[:-2]):
+            expected = solve_cubic(*coeffs)
+            self.assertRootsAlmostEqual(list(found[row][:len(expected)]), expected, places=8)
+            self.assertEqual(list(real_mask[row][:len(expected)]), [not isinstance(r, complex) for r in expected])
+            self.assertEqual(status[row], STATUS_OK)
+        
+        # Unused slots are NaN padding
+        self.assertTrue(math.isnan(found[-4][2].real))
+        self.assertTrue(all(math.isnan(r.real) for r in found[-2]))
+        self.assertEqual(status[-2], STATUS_DEGENERATE)
+        self.assertEqual(status[-1], STATUS_INVALID)
+
+    @unittest.skipIf(roots.optional_import('numpy') is None, "NumPy is not installed")
+    def test_solve_cubic_batch_matches_fallback(self):
+        """Test that the vectorized and pure-Python batch paths give the same results"""
+        rng = random.Random(99)
+        table = [[rng.choice((-1, 1)) * 10 ** rng.uniform(-8, 6) for _ in range(4)] for _ in range(300)]
+        table += [
+            [1, 11.37051329814426, 43.09213923578069, 54.43188178251509],
+            [6.33, 394913.6, -0.0023, 0.0163],
+            [-146.5, 597230, -3.3e-8, -2.1e-7],
+            [2, 3, 4, 0],          # Zero constant term: x = 0 is factored out exactly
+            [1, 0, 1, 0],
+            [1, -5, 8, -4],        # (x - 1)(x - 2)^2
+            [1e-320, 1, 1, 1],     # Overflows when normalized
+        ]
+        found, real_mask, status = solve_cubic_batch(table)
+        with patch.object(roots, 'optional_import', lambda name: None):
+            expected_found, expected_mask, expected_status = solve_cubic_batch(table)
+
+        self.assertEqual(status.tolist(), expected_status)
+        self.assertEqual(real_mask.tolist(), expected_mask)
+        for row, expected in zip(found.tolist(), expected_found):
+            for got, want in zip(row, expected):
+                if math.isnan(want.real):
+                    self.assertTrue(math.isnan(got.real))
+                else:
+                    self.assertLessEqual(abs(got - want), 1e-9 * max(1.0, abs(want)))
+        self.assertEqual(found[-4][0], 0)
+        self.assertEqual(status[-1], STATUS_INVALID)
+
+    def test_solve_cubic_batch_without_numpy(self):
+        """Test the pure-Python fallback of solve_cubic_batch"""
+        with patch.object(roots, 'optional_import', lambda name: None):
+            found, real_mask, status = solve_cubic_batch([(1, -6, 11, -6), (1, 0, 0, -1), (0, 0, 0, 0)])
+        
+        self.assertRootsAlmostEqual(found[0], [1, 2, 3])
+        self.assertEqual(real_mask[0], [True, True, True])
+        self.assertEqual(real_mask[1], [True, False, False])
+        self.assertEqual(status, [STATUS_OK, STATUS_OK, STATUS_DEGENERATE])
+        self.assertTrue(all(math.isnan(r.real) for r in found[2]))
+        # Same element types as the NumPy arrays
+        self.assertTrue(all(isinstance(r, complex) for row in found for r in row))
+        self.assertTrue(all(isinstance(code, int) for code in status))
+
+    def test_root_bound(self):
+        """Test that root_bound encloses every root"""
+        # (x-1)(x-2)(x-3): roots up to 3
+        self.assertGreaterEqual(root_bound([1, -6, 11, -6]), 3)
+        
+        # x - 5 has the bound exactly at its root
+        self.assertGreaterEqual(root_bound([1, -5]), 5)
+        
+        # Scaling the polynomial does not change the bound
+        self.assertAlmostEqual(root_bound([2, -12, 22, -12]), root_bound([1, -6, 11, -6]))
+
+    def test_descartes_bound(self):
+        """Test Descartes' rule of signs"""
+        # (x-1)(x-2)(x-3) has three positive roots and no negative ones
+        self.assertEqual(descartes_bound([1, -6, 11, -6]), (3, 0))
+        
+        # x^3 + x + 1 has no positive roots
+        self.assertEqual(descartes_bound([1, 0, 1, 1])[0], 0)
+
+    def test_count_real_roots(self):
+        """Test Sturm counting of distinct real roots"""
+        self.assertEqual(count_real_roots([1, -6, 11, -6], 0, 10), 3)
+        self.assertEqual(count_real_roots([1, -6, 11, -6], 1.5, 2.5), 1)
+        self.assertEqual(count_real_roots([1, 0, 1, 1], -10, 10), 1)
+        
+        # Repeated roots are counted once: (x-2)^3
+        self.assertEqual(count_real_roots([1, -6, 12, -8], 0, 10), 1)
+
+    def test_find_real_roots(self):
+        """Test that find_real_roots returns every real root with multiplicity"""
+        self.assertRootsAlmostEqual(find_real_roots([1, -6, 11, -6]), [1, 2, 3], places=12)
+        
+        # x^3 - 1: f'(0) = 0 so a Newton iteration seeded at 0 fails immediately
+        self.assertRootsAlmostEqual(find_real_roots([1, 0, 0, -1]), [1], places=12)
+        
+        # Repeated roots
+        self.assertRootsAlmostEqual(find_real_roots([1, -6, 12, -8]), [2, 2, 2])
+        self.assertRootsAlmostEqual(find_real_roots([1, 0, -2, 0, 1]), [-1, -1, 1, 1])
+        
+        # (x - 5)(x^2 - 2x + 1 + 1e-10): a narrow complex pair 1 +- 1e-5i, not a double root
+        coeffs = [1, -7, 11 + 1e-10, -5 * (1 + 1e-10)]
+        self.assertRootsAlmostEqual(find_real_roots(coeffs), [5], places=12)
+        self.assertEqual(len(find_real_roots(coeffs)), len([r for r in solve_cubic(*coeffs) if not isinstance(r, complex)]))
+        
+        # Roots at zero and lower degrees
+        self.assertEqual(find_real_roots([1, 0, 0, 0]), [0, 0, 0])
+        self.assertEqual(find_real_roots([0, 2, 4]), [-2])
+        self.assertEqual(find_real_roots([1, 0, 1]), [])
+        
+        # Agrees with the closed-form solver on random cubics
+        rng = random.Random(42)
+        for _ in range(200):
+            coeffs = [rng.uniform(-10, 10) for _ in range(4)]
+            expected = [r for r in solve_cubic(*coeffs) if not isinstance(r, complex)]
+            self.assertRootsAlmostEqual(find_real_roots(coeffs), expected, places=8)
+
+    def test_find_real_roots_badly_scaled(self):
+        """Test that badly scaled cubics get no phantom repeated roots and lose no real ones"""
+        roots = find_real_roots([-0.000493504927787586, 35977.53780730344, 0.03096195408723371, -2.8668941506244126e-05])
+        self.assertEqual(len(roots), 3)
+        for got, want in zip(roots, [-2.8662225050022455e-05, 2.7801633804099153e-05, 72902084.21746355]):
+            self.assertAlmostEqual(got / want, 1, places=9)
+
+        # One real root and a complex pair near 8.7e-10, not a double root there
+        roots = find_real_roots([-4.46e-05, 62678.7, -0.000109, 0.00577])
+        self.assertEqual(len(roots), 1)
+        self.assertAlmostEqual(roots[0] / 1405352017.9372196, 1, places=12)
+
+        # Agrees with the closed-form solver on coefficients spread over 14 orders of magnitude
+        rng = random.Random(5)
+        for _ in range(300):
+            coeffs = [rng.choice((-1, 1)) * 10 ** rng.uniform(-8, 6) for _ in range(4)]
+            expected = [r for r in solve_cubic(*coeffs) if not isinstance(r, complex)]
+            roots = find_real_roots(coeffs)
+            self.assertEqual(len(roots), len(expected), coeffs)
+            for got, want in zip(roots, expected):
+                self.assertAlmostEqual(got / want, 1, places=9)
+
+    def test_iterate_root(self):
+        """Test Newton, Halley and Laguerre iterations with relative stopping criteria"""
+        iterations = {}
+        for method in ("newton", "halley", "laguerre"):
+            root, iterations[method] = iterate_root([1, -6, 11, -6], 0.3, method)
+            self.assertAlmostEqual(root, 1, places=12)
+            
+            # The stopping test does not depend on the scale of the coefficients
+            for scale in (1e-200, 1e150):
+                root, count = iterate_root([scale, 0, scale, scale], 0, method)
+                self.assertAlmostEqual(root, -0.6823278038280193, places=12)
+                self.assertLess(count, 10)
+        
+        # Third-order methods need fewer iterations than Newton
+        self.assertLess(iterations["halley"], iterations["newton"])
+        self.assertLess(iterations["laguerre"], iterations["newton"])
+        
+        # Laguerre can leave the real axis to reach complex roots; Newton cannot
+        self.assertEqual(iterate_root([1, 0, 1], 0.5, "laguerre")[0], 1j)
+        self.assertEqual(iterate_root([1, 0, 1], 0.5, "newton", max_iter=20), (None, 20))
+        
+        # A zero derivative stops the iteration
+        self.assertEqual(iterate_root([1, 0, 0, 1], 0), (None, 0))
+        with self.assertRaises(ValueError):
+            iterate_root([1, 0], 1, "secant")
+
+    def assertRootsEnclosed(self, roots, bounds, expected):
+        """Check that every expected root lies in the error disc of a computed one"""
+        self.assertEqual(len(roots), len(expected))
+        for want in expected:
+            self.assertTrue(any(abs(complex(want) - got) <= bound for got, bound in zip(roots, bounds)),
+                            f"{want} not enclosed by {roots} with bounds {bounds}")
+
+    def test_find_all_roots(self):
+        """Test that find_all_roots returns every complex root with valid error bounds"""
+        roots_found, bounds = find_all_roots([1, -6, 11, -6])
+        self.assertRootsAlmostEqual(roots_found, [1, 2, 3], places=12)
+        self.assertRootsEnclosed(roots_found, bounds, [1, 2, 3])
+        self.assertLess(max(bounds), 1e-10)
+        
+        # Fifth roots of unity
+        expected = [complex(math.cos(2 * math.pi * k / 5), math.sin(2 * math.pi * k / 5)) for k in range(5)]
+        self.assertRootsEnclosed(*find_all_roots([1, 0, 0, 0, 0, -1]), expected)
+        
+        # Wilkinson-style degree 12 polynomial with roots 1..12
+        coeffs = [1.0]
+        for k in range(1, 13):
+            coeffs = [c - k * prev for c, prev in zip(coeffs + [0.0], [0.0] + coeffs)]
+        self.assertRootsEnclosed(*find_all_roots(coeffs), range(1, 13))
+        
+        # Zero roots, lower degrees and constants
+        self.assertEqual(find_all_roots([2, 4, 0, 0])[0], [-2, 0, 0])
+        self.assertEqual(find_all_roots([5]), ([], []))
+        with self.assertRaises(ValueError):
+            find_all_roots([1, float('nan'), 1])
+
+    def test_find_all_roots_batch(self):
+        """Test that batched Aberth iteration matches the single-polynomial solver"""
+        rng = random.Random(7)
+        rows = [[rng.uniform(-5, 5) for _ in range(9)] for _ in range(50)]
+        rows.append([0, 0, 0, 0, 0, 1, -3, 2, 0])                  # Lower degree with a zero root
+        rows.append([1, 0, 0, 0, float('inf'), 0, 0, 0, 0])       # Invalid
+        rows.append([0, 0, 0, 0, 0, 0, 0, 0, 3])                   # Constant
+        
+        def check(table):
+            roots_found, bounds, status = find_all_roots_batch(table)
+            for row, found, radii, code in zip(rows[:50], roots_found, bounds, status):
+                self.assertEqual(code, STATUS_OK)
+                self.assertRootsEnclosed(list(found), list(radii), find_all_roots(row)[0])
+            self.assertRootsAlmostEqual(list(roots_found[50])[:3], [0, 1, 2])
+            self.assertTrue(all(math.isnan(r.real) for r in list(roots_found[50])[3:]))
+            self.assertEqual([int(code) for code in status[50:]], [STATUS_OK, STATUS_INVALID, STATUS_DEGENERATE])
+        
+        check(rows)
+        with patch.object(roots, 'optional_import', lambda name: None):
+            check(rows)
+        
+        # An iteration budget of one cannot converge
+        self.assertIn(STATUS_NOT_CONVERGED, list(find_all_roots_batch(rows[:5], max_iter=1)[2]))
+
+if __name__ == '__main__':
+    unittest.main()
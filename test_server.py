@@ -0,0 +1,126 @@
+import asyncio
+import json
+import unittest
+from server import CalculatorServer, MicroBatcher, evaluate_rows, solve_rows
+from polynomial import calculate_fx
+
+class TestServer(unittest.TestCase):
+    """Tests for the calculation server in server.py"""
+
+    def test_evaluate_and_solve_rows(self):
+        """Test that the vectorized batch functions match the scalar ones"""
+        rows = [(1, 2, 3, 4, 2), (-1.5, 0, 2, 1e-3, 0.25), (1e100, 0, 0, 1, 1e-10)]
+        self.assertEqual(evaluate_rows(rows), [calculate_fx(*row) for row in rows])
+        
+        results = solve_rows([[1, -6, 11, -6], [1, 0, 0, -1], [0, 0, 0, 1], [float('nan'), 1, 1, 1]])
+        self.assertEqual([round(r, 9) for r in results[0]], [1, 2, 3])
+        self.assertEqual(len(results[1]), 3)
+        self.assertIsInstance(results[1][1], list)
+        self.assertEqual(results[2], [])
+        self.assertIsInstance(results[3], ValueError)
+
+    def test_overflow(self):
+        """Test that overflowing rows and non-finite input become errors, not invalid JSON"""
+        results = evaluate_rows([(1e308, 1e308, 1, 1, 1e10), (1, 1, 1, 1, 1)])
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], 4.0)
+        self.assertIsInstance(evaluate_rows([(1e308, 1e308, 1, 1, 1e10)])[0], ValueError)
+
+        async def scenario():
+            calculator = CalculatorServer(batch_window=0.005)
+            try:
+                return await asyncio.gather(
+                    calculator.handle({"op": "evaluate", "coeffs": [1e308, 1e308, 1, 1], "x": 1e10}),
+                    calculator.handle({"op": "evaluate", "coeffs": [1, 1, 1, 1], "x": 1}),
+                    calculator.handle({"op": "solve", "coeffs": ["nan", 1, 1, 1]}),
+                    calculator.handle({"op": "evaluate", "coeffs": [1, 1, 1, 1], "x": "inf"}),
+                )
+            finally:
+                calculator.close()
+
+        responses = asyncio.run(scenario())
+        self.assertIn("overflows", responses[0]["error"])
+        self.assertEqual(responses[1], {"result": 4.0})
+        self.assertIn("non-finite", responses[2]["error"])
+        self.assertIn("finite", responses[3]["error"])
+        for response in responses:
+            json.dumps(response, allow_nan=False)
+
+    def test_micro_batching(self):
+        """Test that concurrent submissions are handled in shared batches"""
+        async def scenario():
+            batcher = MicroBatcher(lambda items: [item * 2 for item in items], window=0.01, max_batch=4)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+            return results, batcher.batches
+        
+        results, batches = asyncio.run(scenario())
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual(batches, 3)
+
+    def test_handle(self):
+        """Test every operation and the error responses"""
+        async def scenario():
+            calculator = CalculatorServer(batch_window=0.005, exact_timeout=60)
+            try:
+                return await asyncio.gather(
+                    calculator.handle({"id": 1, "op": "evaluate", "coeffs": [1, 2, 3, 4], "x": 2}),
+                    calculator.handle({"id": 2, "op": "solve", "coeffs": [1, -6, 11, -6]}),
+                    calculator.handle({"id": 3, "op": "newton", "coeffs": [1, -6, 11, -6], "x0": 0.3}),
+                    calculator.handle({"id": 4, "op": "solve_exact", "coeffs": [1, 0, -2, 0]}),
+                    calculator.handle({"id": 5, "op": "evaluate", "coeffs": [1, 2, 3], "x": 2}),
+                    calculator.handle({"op": "cube"}),
+                    calculator.handle([1, 2]),
+                )
+            finally:
+                calculator.close()
+        
+        responses = asyncio.run(scenario())
+        self.assertEqual(responses[0], {"id": 1, "result": 26})
+        self.assertEqual([round(r, 9) for r in responses[1]["result"]], [1, 2, 3])
+        self.assertAlmostEqual(responses[2]["result"], 1, places=9)
+        self.assertEqual(sorted(round(float(r), 9) for r in responses[3]["result"]), [-1.414213562, 0, 1.414213562])
+        self.assertEqual(responses[3]["source"], "exact")
+        self.assertIn("4 numbers", responses[4]["error"])
+        self.assertIn("unknown op", responses[5]["error"])
+        self.assertIn("JSON object", responses[6]["error"])
+
+    def test_exact_timeout(self):
+        """Test that a symbolic solve exceeding its timeout falls back to numeric roots"""
+        async def scenario():
+            calculator = CalculatorServer(exact_timeout=0.001, exact_workers=1)
+            try:
+                return await calculator.handle({"op": "solve_exact", "coeffs": [1, -6, 11, -6]})
+            finally:
+                calculator.close()
+        
+        response = asyncio.run(scenario())
+        self.assertEqual(response["source"], "numeric")
+        self.assertEqual([round(r, 9) for r in response["result"]], [1, 2, 3])
+
+    def test_tcp_connection(self):
+        """Test requests and responses over a TCP connection"""
+        async def scenario():
+            calculator = CalculatorServer(batch_window=0.005)
+            server = await calculator.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                lines = [{"id": i, "op": "evaluate", "coeffs": [1, 0, 0, 0], "x": i} for i in range(20)]
+                writer.write("".join(json.dumps(line) + "\n" for line in lines).encode() + b"not json\n")
+                writer.write_eof()
+                responses = [json.loads(line) async for line in reader]
+                writer.close()
+                return responses, calculator.evaluations.batches
+            finally:
+                server.close()
+                await server.wait_closed()
+                calculator.close()
+        
+        responses, batches = asyncio.run(scenario())
+        results = {r["id"]: r["result"] for r in responses if "id" in r}
+        self.assertEqual(results, {i: i ** 3 for i in range(20)})
+        self.assertEqual(sum(1 for r in responses if "invalid JSON" in r.get("error", "")), 1)
+        self.assertLess(batches, 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import argparse
+import csv
+import io
+import json
+import unittest
+from contextlib import redirect_stderr
+from stream import add_arguments, read_rows, process_row, process_stream
+
+class TestStream(unittest.TestCase):
+    """Tests for the streaming batch mode in stream.py"""
+
+    def test_read_rows_csv(self):
+        """Test reading CSV rows with and without a header"""
+        rows = list(read_rows(io.StringIO("x,d,c,b,a\n2,4,3,2,1\n\n")))
+        self.assertEqual(rows, [(2, {"x": "2", "d": "4", "c": "3", "b": "2", "a": "1"})])
+
+        rows = list(read_rows(io.StringIO("1,2,3,4\n1,2,3,4,?\n")))
+        self.assertEqual(rows[0], (1, {"a": "1", "b": "2", "c": "3", "d": "4"}))
+        self.assertEqual(rows[1][1]["x"], "?")
+
+    def test_read_rows_jsonl(self):
+        """Test reading JSONL objects, lists and invalid lines"""
+        data = '{"a": 1, "b": 2, "c": 3, "d": 4}\n[1, 0, 0, -1, 2]\n\nnot json\n5\n'
+        rows = list(read_rows(io.StringIO(data), "jsonl"))
+        self.assertEqual(rows[0], (1, {"a": 1, "b": 2, "c": 3, "d": 4}))
+        self.assertEqual(rows[1], (2, {"a": 1, "b": 0, "c": 0, "d": -1, "x": 2}))
+        self.assertEqual(rows[2][0], 4)
+        self.assertIn("invalid JSON", rows[2][1])
+        self.assertEqual(rows[3], (5, "row must be a JSON object or list"))
+
+    def test_process_row(self):
+        """Test evaluating and solving single rows"""
+        record = process_row({"a": "1", "b": "2", "c": "3", "d": "4", "x": "2"})
+        self.assertEqual(record["fx"], 26)
+
+        record = process_row({"a": 1, "b": -6, "c": 11, "d": -6})
+        self.assertEqual(len(record["roots"]), 3)
+        self.assertNotIn("x", record)
+
+        with self.assertRaises(ValueError):
+            process_row({"a": "1", "b": "oops", "c": "3", "d": "4"})
+        with self.assertRaises(ValueError):
+            process_row({"a": "1", "b": "2", "c": "3"})
+
+        # Non-finite values and overflowing results are errors, not NaN results
+        for fields in ({"a": "inf", "b": 1, "c": 1, "d": 1}, {"a": 1, "b": 1, "c": 1, "d": 1, "x": "nan"},
+                       {"a": 1e308, "b": 1e308, "c": 1, "d": 1, "x": 1e10}):
+            with self.assertRaises(ValueError):
+                process_row(fields)
+
+    def test_process_stream_csv(self):
+        """Test that a CSV stream reports per-row errors without stopping"""
+        infile = io.StringIO("a,b,c,d,x\n1,2,3,4,2\n1,x,3,4,1\n1,0,0,-1,?\n")
+        outfile = io.StringIO()
+        summary = process_stream(infile, outfile, "csv")
+        self.assertEqual(summary, {"rows": 3, "errors": 1})
+
+        rows = list(csv.DictReader(io.StringIO(outfile.getvalue())))
+        self.assertEqual(rows[0]["line"], "2")
+        self.assertEqual(float(rows[0]["result"]), 26)
+        self.assertIn("column 'b'", rows[1]["error"])
+        roots = rows[2]["result"].split(";")
+        self.assertEqual(float(roots[0]), 1)
+        self.assertEqual(complex(roots[1]), complex(-0.5, 3 ** 0.5 / 2))
+
+    def test_process_stream_jsonl_parallel(self):
+        """Test that results keep the input order with several jobs and small chunks"""
+        lines = [json.dumps({"a": 1, "b": 0, "c": 0, "d": 0, "x": x}) for x in range(50)]
+        infile = io.StringIO("\n".join(lines) + "\n")
+        outfile = io.StringIO()
+        summary = process_stream(infile, outfile, "jsonl", jobs=2, chunk_size=7)
+        self.assertEqual(summary, {"rows": 50, "errors": 0})
+
+        records = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertEqual([r["line"] for r in records], list(range(1, 51)))
+        self.assertEqual([r["fx"] for r in records], [x ** 3 for x in range(50)])
+
+    def test_process_stream_jsonl_non_finite(self):
+        """Test that non-finite rows become errors and the output stays valid JSON"""
+        infile = io.StringIO('{"a": 1, "b": 2, "c": 3, "d": NaN, "x": 1}\n[1, 0, 0, -1]\n')
+        outfile = io.StringIO()
+        summary = process_stream(infile, outfile, "jsonl")
+        self.assertEqual(summary, {"rows": 2, "errors": 1})
+        lines = outfile.getvalue().splitlines()
+        self.assertNotIn("NaN", outfile.getvalue())
+        self.assertIn("non-finite", json.loads(lines[0])["error"])
+        self.assertEqual(json.loads(lines[1])["roots"][0], 1)
+
+    def test_add_arguments_exclusive(self):
+        """Test that --batch rejects options placed in the exclusive group"""
+        parser = argparse.ArgumentParser()
+        modes = parser.add_mutually_exclusive_group()
+        modes.add_argument("--exact", action="store_true")
+        add_arguments(parser, modes)
+        self.assertEqual(parser.parse_args(["--batch"]).batch, "-")
+        with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+            parser.parse_args(["--exact", "--batch", "rows.csv"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from symbolic import SymbolicWorker, solve_bounded, numeric_solve, SOURCE_EXACT, SOURCE_NUMERIC
+
+class TestSymbolic(unittest.TestCase):
+    """Tests for the bounded-time symbolic solves in symbolic.py"""
+
+    def setUp(self):
+        self.worker = SymbolicWorker()
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_exact_solve(self):
+        """Test that solves finishing in time come from sympy in a reused process"""
+        solutions, source = solve_bounded([1, 0, -4], 60, worker=self.worker)
+        self.assertEqual(source, SOURCE_EXACT)
+        self.assertEqual(sorted(float(s) for s in solutions), [-2, 2])
+        pid = self.worker.process.pid
+        
+        solutions, source = solve_bounded([1, -6, 11, -6], 60, worker=self.worker)
+        self.assertEqual(source, SOURCE_EXACT)
+        self.assertEqual(sorted(float(s) for s in solutions), [1, 2, 3])
+        self.assertEqual(self.worker.process.pid, pid)
+
+    def test_timeout_falls_back(self):
+        """Test that an expired deadline kills the worker and returns numeric roots"""
+        solutions, source = solve_bounded([1, -6, 11, -6], 0.001, worker=self.worker)
+        self.assertEqual(source, SOURCE_NUMERIC)
+        self.assertEqual([round(r, 9) for r in solutions], [1, 2, 3])
+        self.assertEqual(self.worker.timeouts, 1)
+        self.assertIsNone(self.worker.process)
+        
+        with self.assertRaises(TimeoutError):
+            self.worker.solve([1, 2, 3], 0.001)
+        
+        # A custom fallback is used as given
+        self.assertEqual(solve_bounded([1, 0], 0.001, fallback=lambda coeffs: ["n/a"], worker=self.worker),
+                         (["n/a"], SOURCE_NUMERIC))
+
+    def test_numeric_solve(self):
+        """Test the numeric fallback for low and high degrees"""
+        self.assertEqual(numeric_solve([2, -4]), [2])
+        self.assertEqual([round(r, 9) for r in numeric_solve([1, -6, 11, -6])], [1, 2, 3])
+        roots = numeric_solve([1, 0, 0, 0, 0, -1])
+        self.assertEqual(len(roots), 5)
+        self.assertTrue(any(abs(r - 1) < 1e-12 for r in roots))
+
+if __name__ == '__main__':
+    unittest.main()
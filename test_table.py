@@ -0,0 +1,70 @@
+import io
+import unittest
+from unittest.mock import patch
+import polynomial
+from table import tabulate, sign_changes, write_table
+
+class TestTable(unittest.TestCase):
+    """Tests for the tabulation mode in table.py"""
+
+    def test_uniform(self):
+        """Test that uniform tables evaluate f on an evenly spaced grid"""
+        rows = list(tabulate([1, -6, 11, -6], 0, 4, samples=5))
+        self.assertEqual(rows, [(0, -6), (1, 0), (2, 0), (3, 0), (4, 6)])
+        
+        with self.assertRaises(ValueError):
+            list(tabulate([1, 0], 1, 0))
+        with self.assertRaises(ValueError):
+            list(tabulate([1, 0], 0, 1, samples=1))
+
+    def test_adaptive(self):
+        """Test that adaptive tables refine only where they need to"""
+        # A straight line needs no extra points
+        self.assertEqual(len(list(tabulate([2, 1], 0, 5, samples=3, adaptive=True))), 3)
+        
+        rows = list(tabulate([1, 0, 0, 0], -1, 1, samples=5, adaptive=True, tol=1e-4))
+        xs = [x for x, _ in rows]
+        self.assertEqual(xs, sorted(xs))
+        self.assertGreater(len(rows), 5)
+        self.assertTrue(all(fx == x**3 for x, fx in rows))
+        
+        # Linear interpolation between rows stays within the tolerance
+        spread = 2
+        for (x0, f0), (x1, f1) in zip(rows, rows[1:]):
+            xm = (x0 + x1) / 2
+            self.assertLessEqual(abs(xm**3 - (f0 + f1) / 2), 1e-4 * spread * 1.0001)
+        
+        # Far fewer evaluations than a uniform grid of the same finest spacing
+        finest = min(x1 - x0 for (x0, _), (x1, _) in zip(rows, rows[1:]))
+        self.assertLess(len(rows), 2 / finest + 1)
+
+    def test_sign_changes(self):
+        """Test that adaptive sampling narrows the sign-change brackets"""
+        brackets = list(sign_changes(tabulate([1, 0, -2], -3, 3, samples=7, adaptive=True)))
+        self.assertEqual(len(brackets), 2)
+        for (lo, hi), root in zip(brackets, (-2 ** 0.5, 2 ** 0.5)):
+            self.assertLessEqual(lo, root)
+            self.assertGreaterEqual(hi, root)
+            self.assertLess(hi - lo, 1e-2)
+        
+        # Exact zeros on the grid are reported as zero-width brackets
+        self.assertEqual(list(sign_changes([(0, -1), (1, 0), (2, 1)])), [(1, 1)])
+
+    def test_write_table(self):
+        """Test writing rows as aligned text"""
+        out = io.StringIO()
+        self.assertEqual(write_table(out, tabulate([1, 0], 0, 1, samples=3)), 3)
+        self.assertEqual(out.getvalue().split(), ["0", "0", "0.5", "0.5", "1", "1"])
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('builtins.input')
+    def test_polynomial_main_table(self, mock_input, mock_stdout):
+        """Test the table option of the interactive calculator"""
+        mock_input.side_effect = ['1', '0', '0', '0', 't', '-1', '-2', '1']
+        polynomial.main()
+        output = mock_stdout.getvalue()
+        self.assertIn("Please enter a number larger than the start", output)
+        self.assertIn("-0.125", output)
+
+if __name__ == '__main__':
+    unittest.main()
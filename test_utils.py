@@ -1,4 +1,5 @@
 import unittest
+import random
 import sys
 import os
 import io
@@ -6,6 +7,9 @@ from unittest.mock import patch
 from utils import (
     clear_console, 
     format_number, 
+    format_numbers,
+    write_numbers,
+    format_root,
     is_near_zero, 
     polynomial_to_string, 
     validate_input, 
@@ -47,6 +51,39 @@ class TestUtils(unittest.TestCase):
         # Test with None
         self.assertEqual(format_number(None), "None")
 
+    def test_format_numbers(self):
+        """Test that format_numbers matches format_number value by value"""
+        rng = random.Random(3)
+        values = [rng.uniform(-1000, 1000) for _ in range(500)]
+        values += [0.0, -0.0, 5.0, -2.0, 2.5, 1e-11, 1 - 1e-11, 123456789.123, None, 7]
+        for places in (0, 2, 4, 6):
+            self.assertEqual(format_numbers(values, places), [format_number(v, places) for v in values])
+        
+        # Any iterable is accepted
+        self.assertEqual(format_numbers(v for v in [1.5, 2.0]), ["1.5", "2"])
+        self.assertEqual(format_numbers([]), [])
+
+    def test_write_numbers(self):
+        """Test streaming formatted numbers to a file object"""
+        out = io.StringIO()
+        self.assertEqual(write_numbers(out, [3.14159, 2.0, None], 2), 3)
+        self.assertEqual(out.getvalue(), "3.14\n2\nNone\n")
+        
+        out = io.StringIO()
+        write_numbers(out, iter([0.5, -1.25]), sep=",")
+        self.assertEqual(out.getvalue(), "0.5,-1.25,")
+
+    def test_format_root(self):
+        """Test the format_root function"""
+        # Test with real roots
+        self.assertEqual(format_root(2.0), "2")
+        self.assertEqual(format_root(-1.25), "-1.25")
+        
+        # Test with complex roots
+        self.assertEqual(format_root(complex(-0.5, 0.8660254)), "-0.5 + 0.866i")
+        self.assertEqual(format_root(complex(1, -2)), "1 - 2i")
+        self.assertEqual(format_root(complex(0, 1.23456), 2), "0 + 1.23i")
+
     def test_is_near_zero(self):
         """Test the is_near_zero function"""
         # Test with zero
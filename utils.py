@@ -1,8 +1,14 @@
+import importlib
 import os
 import platform
 import sys
 import math
 
+from metrics import instrument
+
+# Modules already looked up by optional_import (None when not installed)
+_optional_modules = {}
+
 def clear_console():
     """
     Clear the console screen based on the operating system.
@@ -12,6 +18,55 @@ def clear_console():
     else:
         os.system("clear")
 
+def optional_import(name):
+    """
+    Import an optional dependency on first use.
+    Heavy packages such as numpy are only loaded when a function actually needs
+    them, which keeps start-up fast for the interactive calculator.
+    
+    Args:
+        name (str): Module name
+        
+    Returns:
+        module or None: The module, or None if it is not installed
+    """
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+# Format specs keyed by decimal_places, built once by _format_spec
+_format_specs = {}
+
+def _format_spec(decimal_places):
+    """
+    Get the cached fixed-point format spec for a number of decimal places.
+    """
+    spec = _format_specs.get(decimal_places)
+    if spec is None:
+        spec = _format_specs[decimal_places] = f".{decimal_places}f"
+    return spec
+
+def _iter_formatted(numbers, decimal_places):
+    """
+    Yield format_number(number, decimal_places) for every number in one pass.
+    """
+    spec = _format_spec(decimal_places)
+    strip = decimal_places > 0
+    for number in numbers:
+        if number is None:
+            yield "None"
+            continue
+        rounded = round(number)
+        if abs(number - rounded) < 1e-10:
+            yield str(int(rounded))
+            continue
+        formatted = format(number, spec)
+        yield formatted.rstrip('0').rstrip('.') if strip else formatted
+
+@instrument()
 def format_number(number, decimal_places=4):
     """
     Format a number to a specific number of decimal places.
@@ -28,17 +83,82 @@ def format_number(number, decimal_places=4):
         return "None"
     
     # Check if number is very close to an integer
-    if abs(number - round(number)) < 1e-10:
-        return str(int(round(number)))
+    rounded = round(number)
+    if abs(number - rounded) < 1e-10:
+        return str(int(rounded))
         
     # Format the number with specified decimal places
-    formatted = f"{number:.{decimal_places}f}"
+    formatted = format(number, _format_spec(decimal_places))
     
     # Remove trailing zeros and decimal point if possible
     formatted = formatted.rstrip('0').rstrip('.') if '.' in formatted else formatted
     
     return formatted
 
+def format_numbers(numbers, decimal_places=4):
+    """
+    Format many numbers at once with the same output as format_number.
+    
+    Args:
+        numbers (iterable): Numbers to format (lists, arrays and NumPy arrays are accepted)
+        decimal_places (int): Number of decimal places to display
+        
+    Returns:
+        list: Formatted number strings
+    """
+    if hasattr(numbers, 'tolist'):
+        numbers = numbers.tolist()
+    return list(_iter_formatted(numbers, decimal_places))
+
+def write_numbers(f, numbers, decimal_places=4, sep="\n"):
+    """
+    Format numbers like format_number and stream them straight to a file object.
+    Each number is followed by sep; no joined output string is built.
+    
+    Args:
+        f (file): Text file object to write to
+        numbers (iterable): Numbers to format
+        decimal_places (int): Number of decimal places to display
+        sep (str): Separator written after every number
+        
+    Returns:
+        int: Number of values written
+    """
+    if hasattr(numbers, 'tolist'):
+        numbers = numbers.tolist()
+    count = 0
+    
+    def pieces():
+        nonlocal count
+        for formatted in _iter_formatted(numbers, decimal_places):
+            count += 1
+            yield formatted
+            yield sep
+    
+    f.writelines(pieces())
+    return count
+
+@instrument()
+def format_root(value, decimal_places=4):
+    """
+    Format a real or complex root for display.
+    Complex values are shown as "re + imi" using format_number for each part.
+    
+    Args:
+        value (float or complex): The root to format
+        decimal_places (int): Number of decimal places to display
+        
+    Returns:
+        str: Formatted root string
+    """
+    if not isinstance(value, complex):
+        return format_number(value, decimal_places)
+    
+    real = format_number(value.real, decimal_places)
+    imag = format_number(abs(value.imag), decimal_places)
+    sign = "-" if value.imag < 0 else "+"
+    return f"{real} {sign} {imag}i"
+
 def is_near_zero(value, tolerance=1e-10):
     """
     Check if a value is very close to zero.